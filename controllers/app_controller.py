@@ -40,6 +40,7 @@ from utils.constants import (
     MTGO_DECKLISTS_ENABLED,
     ensure_base_dirs,
 )
+from utils.metagame_stats import count_card_inclusions, load_aggregated_decks
 
 NOTES_STORE = CACHE_DIR / "deck_notes.json"
 OUTBOARD_STORE = CACHE_DIR / "deck_outboard.json"
@@ -142,7 +143,15 @@ class AppController:
         on_status("Loading card database...")
 
         def worker():
-            return self.card_repo.ensure_card_data_loaded()
+            manager = self.card_repo.ensure_card_data_loaded()
+            try:
+                # Rank name completions by how often cards show up in recent decklists
+                self.search_service.set_card_popularity(
+                    count_card_inclusions(load_aggregated_decks())
+                )
+            except Exception as exc:
+                logger.debug(f"Card popularity unavailable: {exc}")
+            return manager
 
         def success_handler(manager: CardDataManager):
             self.card_repo.set_card_manager(manager)
@@ -17,7 +17,7 @@ from utils.constants import (
     METAGAME_CACHE_TTL_SECONDS,
     ONE_DAY_SECONDS,
 )
-from utils.deck_text_cache import get_deck_cache
+from utils.deck_text_cache import DeckCardAggregates, get_deck_cache
 
 
 def _load_cached_archetypes(mtg_format: str, max_age: int = METAGAME_CACHE_TTL_SECONDS):
@@ -343,7 +343,11 @@ def fetch_deck_text(deck_num: str, source_filter: str | None = None) -> str:
 
     # Download from MTGGoldfish
     logger.info(f"Downloading deck {deck_num} from MTGGoldfish")
-    page = requests.get(f"https://www.mtggoldfish.com/deck/{deck_num}", impersonate="chrome")
+    page = requests.get(
+        f"https://www.mtggoldfish.com/deck/{deck_num}",
+        impersonate="chrome",
+        timeout=30,
+    )
     match = re.search(r'initializeDeckComponents\([^,]+,\s*[^,]+,\s*"([^"]+)"', page.text)
     if not match:
         logger.error(f"Could not find deck data for deck {deck_num}")
@@ -358,6 +362,75 @@ def fetch_deck_text(deck_num: str, source_filter: str | None = None) -> str:
     return deck_text
 
 
+def fetch_cached_deck_texts(
+    deck_nums: list[str], source_filter: str | None = None
+) -> dict[str, str]:
+    """
+    Return the cached texts of several decks in one batched cache query.
+
+    Args:
+        deck_nums: MTGGoldfish deck numbers
+        source_filter: Optional source filter ('mtggoldfish', 'mtgo', or None for both)
+
+    Returns:
+        Mapping of deck number to deck text for the decks already cached
+    """
+    _ensure_cache_migration()
+    cache_source = None if source_filter == "both" else source_filter
+    return get_deck_cache().get_many(deck_nums, source=cache_source)
+
+
+def fetch_cached_card_aggregates(
+    deck_nums: list[str], source_filter: str | None = None
+) -> DeckCardAggregates:
+    """
+    Aggregate the card quantities of the already-cached decks among ``deck_nums``.
+
+    Args:
+        deck_nums: MTGGoldfish deck numbers
+        source_filter: Optional source filter ('mtggoldfish', 'mtgo', or None for both)
+
+    Returns:
+        The cached decks covered and their per-card copy distributions
+    """
+    _ensure_cache_migration()
+    cache_source = None if source_filter == "both" else source_filter
+    return get_deck_cache().card_aggregates(deck_nums, source=cache_source)
+
+
+def record_archetype_decks(archetype_key: str, decks: list[tuple[str, str]]) -> set[str]:
+    """
+    Add cached decks to the stored card statistics of an archetype.
+
+    Args:
+        archetype_key: Key from ``utils.deck_text_cache.archetype_key``
+        decks: ``(deck_number, day)`` pairs with days as ``YYYY-MM-DD``
+
+    Returns:
+        Deck numbers among ``decks`` that the archetype's statistics include
+    """
+    _ensure_cache_migration()
+    return get_deck_cache().add_archetype_decks(archetype_key, decks)
+
+
+def fetch_archetype_aggregates(
+    archetype_keys: list[str], since: str | None = None, until: str | None = None
+) -> DeckCardAggregates:
+    """
+    Merge the stored card statistics of archetypes over a date window.
+
+    Args:
+        archetype_keys: Keys from ``utils.deck_text_cache.archetype_key``
+        since: First day included (``YYYY-MM-DD``), None for no lower bound
+        until: Last day included (``YYYY-MM-DD``), None for no upper bound
+
+    Returns:
+        The decks in the window and their per-card copy distributions
+    """
+    _ensure_cache_migration()
+    return get_deck_cache().archetype_aggregates(archetype_keys, since=since, until=until)
+
+
 def download_deck(deck_num: str, source_filter: str | None = None):
     """
     Downloads a deck list and writes it to CURR_DECK_FILE while maintaining cache compatibility.
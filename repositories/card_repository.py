@@ -22,6 +22,7 @@ from utils.card_images import (
     ensure_printing_index_cache,
     get_card_image,
 )
+from utils.name_completer import NameCompleter
 
 
 class CardRepository:
@@ -104,6 +105,14 @@ class CardRepository:
             logger.error(f"Failed to search cards: {exc}")
             return []
 
+    def get_name_completer(self) -> NameCompleter | None:
+        """Return the card name completer, or None while card data is not loaded."""
+        try:
+            return self.card_data_manager.name_completer()
+        except RuntimeError as exc:
+            logger.warning(f"Card data not loaded: {exc}")
+            return None
+
     def is_card_data_loaded(self) -> bool:
         """Check if card data has been loaded."""
         return self.card_data_manager._cards is not None
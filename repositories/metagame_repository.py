@@ -9,16 +9,21 @@ This module handles all metagame-related data fetching including:
 
 import json
 import time
-from datetime import datetime
+from collections.abc import Callable
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any, Final
 
 from loguru import logger
 
 from navigators.mtggoldfish import (
+    fetch_archetype_aggregates,
+    fetch_cached_card_aggregates,
+    fetch_cached_deck_texts,
     fetch_deck_text,
     get_archetype_decks,
     get_archetypes,
+    record_archetype_decks,
 )
 from utils.constants import (
     ARCHETYPE_DECKS_CACHE_FILE,
@@ -26,8 +31,11 @@ from utils.constants import (
     METAGAME_CACHE_TTL_SECONDS,
     MTGO_DECKLISTS_ENABLED,
 )
+from utils.deck_text_cache import DeckCardAggregates, archetype_key
 
 _USE_DEFAULT_MAX_AGE: Final = object()
+# Formats whose MTGO decks are merged into an archetype's deck list.
+MTGO_DECK_FORMATS = ("modern", "standard", "pioneer", "legacy")
 
 
 def _parse_deck_date(date_str: str) -> tuple[int, int, int]:
@@ -51,6 +59,19 @@ def _parse_deck_date(date_str: str) -> tuple[int, int, int]:
     return (0, 0, 0)
 
 
+def deck_day(date_str: str) -> str | None:
+    """
+    Return the ``YYYY-MM-DD`` day of a deck date, or None if it cannot be parsed.
+
+    Accepts the formats of :func:`_parse_deck_date`, optionally followed by a time of
+    day (MTGO publish dates are ISO timestamps).
+    """
+    year, month, day = _parse_deck_date((date_str or "")[:10])
+    if not year:
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
 class MetagameRepository:
     """Repository for metagame data access operations."""
 
@@ -60,6 +81,9 @@ class MetagameRepository:
         *,
         archetype_list_cache_file: Path = ARCHETYPE_LIST_CACHE_FILE,
         archetype_decks_cache_file: Path = ARCHETYPE_DECKS_CACHE_FILE,
+        archetype_deck_recorder: Callable[[str, list[tuple[str, str]]], set[str]] = (
+            record_archetype_decks
+        ),
     ):
         """
         Initialize the metagame repository.
@@ -68,10 +92,13 @@ class MetagameRepository:
             cache_ttl: Time-to-live for cached data in seconds (default: 1 hour)
             archetype_list_cache_file: Path to archetype list cache (overridable for testing)
             archetype_decks_cache_file: Path to archetype deck cache (overridable for testing)
+            archetype_deck_recorder: Stores decks in the per-archetype card statistics of
+                the deck cache (overridable for testing)
         """
         self.cache_ttl = cache_ttl
         self.archetype_list_cache_file = Path(archetype_list_cache_file)
         self.archetype_decks_cache_file = Path(archetype_decks_cache_file)
+        self.archetype_deck_recorder = archetype_deck_recorder
 
     # ============= Archetype Operations =============
 
@@ -148,6 +175,10 @@ class MetagameRepository:
             decks = get_archetype_decks(archetype_href)
             # Cache the results
             self._save_cached_decks(archetype_href, decks)
+            try:
+                self.record_archetype_decks(archetype, decks)
+            except Exception as exc:
+                logger.warning(f"Failed to update archetype statistics for {archetype_name}: {exc}")
             mtggoldfish_decks = self._filter_decks_by_source(decks, source_filter)
             mtgo_decks = self._get_mtgo_decks_from_db(archetype_name, source_filter)
             return self._merge_and_sort_decks(mtggoldfish_decks, mtgo_decks)
@@ -192,6 +223,116 @@ class MetagameRepository:
             logger.error(f"Failed to download deck {deck_name}: {exc}")
             raise
 
+    def get_cached_deck_contents(
+        self, decks: list[dict[str, Any]], source_filter: str | None = None
+    ) -> dict[str, str]:
+        """
+        Look up the already-cached deck lists of several decks at once.
+
+        Args:
+            decks: Deck dictionaries with 'number' keys
+            source_filter: Optional source filter ('mtggoldfish', 'mtgo', or 'both')
+
+        Returns:
+            Mapping of deck number to deck list text for the cached decks
+        """
+        numbers = [str(deck["number"]) for deck in decks if deck.get("number")]
+        if not numbers:
+            return {}
+        return fetch_cached_deck_texts(numbers, source_filter=source_filter)
+
+    def get_cached_card_aggregates(
+        self, decks: list[dict[str, Any]], source_filter: str | None = None
+    ) -> DeckCardAggregates:
+        """
+        Aggregate the card quantities of the already-cached decks among ``decks``.
+
+        Args:
+            decks: Deck dictionaries with 'number' keys
+            source_filter: Optional source filter ('mtggoldfish', 'mtgo', or 'both')
+
+        Returns:
+            The cached decks covered and their per-card copy distributions
+        """
+        numbers = [str(deck["number"]) for deck in decks if deck.get("number")]
+        if not numbers:
+            return DeckCardAggregates([], [])
+        return fetch_cached_card_aggregates(numbers, source_filter=source_filter)
+
+    def record_archetype_decks(
+        self, archetype: dict[str, Any], decks: list[dict[str, Any]]
+    ) -> set[str]:
+        """
+        Add the cached decks among ``decks`` to the stored statistics of ``archetype``.
+
+        MTGGoldfish decks are stored under the archetype's href, MTGO decks under their
+        format and archetype name, matching where :meth:`get_decks_for_archetype` finds
+        them. Decks without a number or a parseable date are skipped.
+
+        Args:
+            archetype: Archetype dictionary with 'href' or 'url' key
+            decks: Deck dictionaries with 'number' and 'date' keys
+
+        Returns:
+            Deck numbers among ``decks`` that the stored statistics include
+        """
+        by_key: dict[str, list[tuple[str, str]]] = {}
+        for deck in decks:
+            day = deck_day(deck.get("date", ""))
+            if not deck.get("number") or day is None:
+                continue
+            key = self._deck_archetype_key(archetype, deck)
+            by_key.setdefault(key, []).append((str(deck["number"]), day))
+        included: set[str] = set()
+        for key, members in by_key.items():
+            included |= self.archetype_deck_recorder(key, members)
+        return included
+
+    def get_archetype_aggregates(
+        self,
+        archetype: dict[str, Any],
+        since: date | None = None,
+        until: date | None = None,
+        source_filter: str | None = None,
+    ) -> DeckCardAggregates:
+        """
+        Merge the stored per-day card statistics of ``archetype`` over a date window.
+
+        Args:
+            archetype: Archetype dictionary with 'href' or 'url' and 'name' keys
+            since: First day included (None = no lower bound)
+            until: Last day included (None = no upper bound)
+            source_filter: Optional source filter ('mtggoldfish', 'mtgo', or 'both')
+
+        Returns:
+            The stored decks in the window and their per-card copy distributions
+        """
+        keys = self._archetype_keys(archetype, source_filter)
+        return fetch_archetype_aggregates(
+            keys,
+            since=since.isoformat() if since else None,
+            until=until.isoformat() if until else None,
+        )
+
+    def _archetype_keys(self, archetype: dict[str, Any], source_filter: str | None) -> list[str]:
+        """Statistics keys covering the decks :meth:`get_decks_for_archetype` returns."""
+        keys = []
+        if source_filter != "mtgo":
+            keys.append(
+                archetype_key("mtggoldfish", archetype.get("href") or archetype.get("url", ""))
+            )
+        if MTGO_DECKLISTS_ENABLED and source_filter != "mtggoldfish":
+            name = archetype.get("name", "Unknown")
+            keys.extend(archetype_key("mtgo", name, fmt) for fmt in MTGO_DECK_FORMATS)
+        return keys
+
+    def _deck_archetype_key(self, archetype: dict[str, Any], deck: dict[str, Any]) -> str:
+        """Statistics key of one deck of ``archetype``."""
+        if deck.get("source") == "mtgo":
+            name = deck.get("archetype") or archetype.get("name", "Unknown")
+            return archetype_key("mtgo", name, deck.get("format", ""))
+        return archetype_key("mtggoldfish", archetype.get("href") or archetype.get("url", ""))
+
     # ============= Cache Management =============
 
     def _load_cached_archetypes(
@@ -372,7 +513,7 @@ class MetagameRepository:
             from services.mtgo_background_service import load_mtgo_deck_metadata
 
             mtgo_decks = []
-            for fmt in ("modern", "standard", "pioneer", "legacy"):
+            for fmt in MTGO_DECK_FORMATS:
                 decks = load_mtgo_deck_metadata(archetype_name, fmt)
                 mtgo_decks.extend(decks)
 
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Benchmark SearchService.search_with_builder_filters against the legacy per-card loop."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from services.search_service import SearchService
+from utils.card_data import CardDataManager
+from utils.constants import CARD_DATA_DIR
+from utils.mana_icon_factory import normalize_mana_query
+from utils.search_filters import matches_color_filter, matches_mana_cost, matches_mana_value
+
+SCENARIOS: dict[str, dict[str, Any]] = {
+    "format only": {"formats": ["modern"]},
+    "type + colors": {"type": "creature", "selected_colors": ["G"], "color_mode": "At least"},
+    "mana cost": {"mana": "1G", "formats": ["modern"]},
+    "mana value": {"mv_value": "3", "mv_comparator": "≤", "formats": ["legacy"]},
+    "oracle text": {"text": "target", "formats": ["modern"]},
+    "full filter": {
+        "name": "a",
+        "type": "creature",
+        "text": "flying",
+        "mana": "1",
+        "mv_value": "2",
+        "mv_comparator": "≥",
+        "formats": ["modern", "legacy"],
+        "selected_colors": ["W", "U"],
+        "color_mode": "At least",
+    },
+}
+
+# Successive keystrokes in the name box, each narrowing the previous query.
+TYPING_SEQUENCE = ("l", "li", "lig", "ligh", "light")
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.3f} ms"
+    return f"{seconds:.2f} s"
+
+
+def _legacy_filter(filters: dict[str, Any], manager: CardDataManager) -> list[dict[str, Any]]:
+    """The per-card loop search_with_builder_filters used before the filter engine."""
+    mana_query = normalize_mana_query(filters.get("mana", ""))
+    mana_mode = "exact" if filters.get("mana_exact") else "contains"
+    mv_cmp = filters.get("mv_comparator", "Any")
+    mv_value = float(filters["mv_value"]) if filters.get("mv_value") else None
+    selected_formats = filters.get("formats", [])
+    color_mode = filters.get("color_mode", "Any")
+    selected_colors = filters.get("selected_colors", [])
+    query = filters.get("name") or filters.get("text") or ""
+    filtered = []
+    for card in manager.search_cards(query=query, format_filter=None):
+        if filters.get("name") and filters["name"].lower() not in card.get("name_lower", ""):
+            continue
+        if filters.get("type") and filters["type"].lower() not in (
+            (card.get("type_line") or "").lower()
+        ):
+            continue
+        if mana_query and not matches_mana_cost(
+            (card.get("mana_cost") or "").upper(), mana_query, mana_mode
+        ):
+            continue
+        if filters.get("text") and filters["text"].lower() not in (
+            (card.get("oracle_text") or "").lower()
+        ):
+            continue
+        legalities = card.get("legalities", {}) or {}
+        if not all(legalities.get(fmt) == "Legal" for fmt in selected_formats):
+            continue
+        if mv_value is not None and mv_cmp != "Any":
+            if not matches_mana_value(card.get("mana_value"), mv_value, mv_cmp):
+                continue
+        if selected_colors and color_mode != "Any":
+            if not matches_color_filter(
+                card.get("color_identity") or [], selected_colors, color_mode
+            ):
+                continue
+        filtered.append(card)
+    return filtered
+
+
+def _time(func, iterations: int) -> float:
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare bitmask builder filters with the legacy per-card loop."
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=CARD_DATA_DIR,
+        help="Directory containing the card data index (default: data/).",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=10,
+        help="How many times to run each scenario (default: 10).",
+    )
+    args = parser.parse_args()
+
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    manager = CardDataManager(args.data_dir)
+    try:
+        manager._load_index()
+    except RuntimeError as exc:
+        logger.error(f"{exc} (expected under {args.data_dir})")
+        return 1
+
+    service = SearchService(card_repository=object())  # type: ignore[arg-type]
+    start = time.perf_counter()
+    for filters in SCENARIOS.values():
+        service.search_with_builder_filters(filters, manager)
+    logger.info(f"Warmed up filter engine in {_format_duration(time.perf_counter() - start)}")
+
+    for label, filters in SCENARIOS.items():
+        bitmask = _time(
+            lambda f=filters: (
+                service.clear_refinement_cache(),
+                service.search_with_builder_filters(f, manager),
+            ),
+            args.iterations,
+        )
+        legacy = _time(lambda f=filters: _legacy_filter(f, manager), args.iterations)
+        results = service.search_with_builder_filters(filters, manager)
+        expected = _legacy_filter(filters, manager)
+        if [card["name"] for card in results] != [card["name"] for card in expected]:
+            logger.error(f"{label}: bitmask results differ from the legacy loop")
+            return 1
+        logger.info(
+            "{label}: {matches} matches, bitmask={bitmask}, loop={legacy}, speedup={speedup:.1f}x",
+            label=label,
+            matches=len(results),
+            bitmask=_format_duration(bitmask),
+            legacy=_format_duration(legacy),
+            speedup=legacy / bitmask if bitmask else float("inf"),
+        )
+
+    def type_sequence(refine: bool) -> None:
+        service.clear_refinement_cache()
+        for prefix in TYPING_SEQUENCE:
+            if not refine:
+                service.clear_refinement_cache()
+            service.search_with_builder_filters({"name": prefix, "formats": ["modern"]}, manager)
+
+    refined = _time(lambda: type_sequence(True), args.iterations)
+    uncached = _time(lambda: type_sequence(False), args.iterations)
+    logger.info(
+        "typing {sequence}: refinement cache={refined}, no cache={uncached}",
+        sequence=" -> ".join(TYPING_SEQUENCE),
+        refined=_format_duration(refined),
+        uncached=_format_duration(uncached),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
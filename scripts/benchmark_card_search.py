@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark CardDataManager.search_cards against the legacy linear scan."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from utils.card_data import CardDataManager
+from utils.constants import CARD_DATA_DIR
+
+DEFAULT_QUERIES = ("bolt", "lig", "light", "draw a card", "flying", "creature", "xyzzy")
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.3f} ms"
+    return f"{seconds:.2f} s"
+
+
+def _legacy_scan(cards: list[dict[str, Any]], query: str) -> list[dict[str, Any]]:
+    """The per-card lowercase-and-compare scan search_cards used before the index."""
+    query = query.strip().lower()
+    results = []
+    for card in cards:
+        haystacks = (
+            card["name_lower"],
+            (card.get("type_line") or "").lower(),
+            (card.get("oracle_text") or "").lower(),
+        )
+        if query and not any(query in h for h in haystacks if h):
+            continue
+        results.append(card)
+    return results
+
+
+def _time(func, iterations: int) -> float:
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare indexed card searches with the legacy full scan."
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=CARD_DATA_DIR,
+        help="Directory containing the card data index (default: data/).",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=20,
+        help="How many times to run each query (default: 20).",
+    )
+    parser.add_argument(
+        "queries",
+        nargs="*",
+        default=list(DEFAULT_QUERIES),
+        help="Queries to benchmark (default: a mix of short, long and missing terms).",
+    )
+    args = parser.parse_args()
+
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+
+    manager = CardDataManager(args.data_dir)
+    start = time.perf_counter()
+    try:
+        manager._load_index()
+    except RuntimeError as exc:
+        logger.error(f"{exc} (expected under {args.data_dir})")
+        return 1
+    logger.info(
+        f"Loaded card data and built search index in {_format_duration(time.perf_counter() - start)}"
+    )
+
+    cards = list(manager._cards or [])
+    for query in args.queries:
+        indexed = _time(lambda q=query: manager.search_cards(q), args.iterations)
+        legacy = _time(lambda q=query: _legacy_scan(cards, q), args.iterations)
+        matches = len(manager.search_cards(query))
+        logger.info(
+            "{query!r}: {matches} matches, index={indexed}, scan={legacy}, speedup={speedup:.1f}x",
+            query=query,
+            matches=matches,
+            indexed=_format_duration(indexed),
+            legacy=_format_duration(legacy),
+            speedup=legacy / indexed if indexed else float("inf"),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
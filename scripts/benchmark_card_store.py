@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare memory use, GC pause time and startup cost of the card index representations.
+
+Measures the legacy list of card dictionaries, an in-memory ``CardStore`` and the
+memory-mapped binary index that ``CardDataManager`` opens at startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from utils.card_index_file import open_card_index
+from utils.card_store import CardStore
+from utils.constants import CARD_DATA_DIR
+
+
+def _format_bytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def _measure(label: str, build, iterations: int) -> Any:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pauses = []
+    for _ in range(iterations):
+        pause_start = time.perf_counter()
+        gc.collect()
+        pauses.append(time.perf_counter() - pause_start)
+    logger.info(
+        "{label}: built in {elapsed:.2f} s, resident={current}, peak={peak}, "
+        "tracked objects={tracked}, full GC pause={pause:.1f} ms",
+        label=label,
+        elapsed=elapsed,
+        current=_format_bytes(current),
+        peak=_format_bytes(peak),
+        tracked=len(gc.get_objects()),
+        pause=statistics.median(pauses) * 1000,
+    )
+    return value
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure resident memory and GC pauses for the card index representations."
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=CARD_DATA_DIR,
+        help="Directory containing atomic_cards_index.bin (default: data/).",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="How many full collections to time (default: 5).",
+    )
+    args = parser.parse_args()
+
+    index_path = args.data_dir / "atomic_cards_index.bin"
+    if not index_path.exists():
+        logger.error(f"Card index not found at {index_path}")
+        return 1
+
+    mapped_store, _ = _measure(
+        "Mapped index (startup)", lambda: open_card_index(index_path), args.iterations
+    )
+    cards = _measure("List of dicts", lambda: list(mapped_store), args.iterations)
+    store = _measure(
+        "CardStore", lambda loaded=cards: CardStore.from_cards(loaded), args.iterations
+    )
+    del cards
+    gc.collect()
+    _measure("CardStore only", lambda: store, args.iterations)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
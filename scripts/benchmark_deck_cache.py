@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Benchmark compressed deck text storage: database size, batched reads and full scans.
+
+Builds the same synthetic ``deck_cache.db`` twice in a temporary directory, once with
+plain text rows and once converted by ``DeckTextCache.compress_storage``, and compares
+file sizes (after ``VACUUM``), ``get_many`` lookups and a scan over every stored row.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from utils.deck_text_cache import DeckTextCache
+
+# Synthetic card pool; real metagames draw most of their 75 from a few hundred cards.
+CARD_POOL_SIZE = 600
+ARCHETYPES = 40
+
+
+def _format_size(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MiB"
+
+
+def _synthetic_decks(count: int, seed: int = 0) -> dict[str, str]:
+    """Decks built from per-archetype cores with a few random flex slots."""
+    rng = random.Random(seed)
+    pool = [f"Synthetic Card Name {index}" for index in range(CARD_POOL_SIZE)]
+    cores = [
+        [f"{rng.choice((1, 2, 3, 4))} {name}" for name in rng.sample(pool, 22)]
+        for _ in range(ARCHETYPES)
+    ]
+    decks: dict[str, str] = {}
+    for number in range(count):
+        core = cores[rng.randrange(ARCHETYPES)]
+        flex = [f"{rng.choice((1, 2))} {name}" for name in rng.sample(pool, 5)]
+        lines = [*core[:13], *flex[:3], "sideboard", *core[13:], *flex[3:]]
+        decks[str(6_000_000 + number)] = "\n".join(lines) + "\n"
+    return decks
+
+
+def _db_size(cache: DeckTextCache) -> int:
+    cache.flush()
+    cache.vacuum()
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return cache.db_path.stat().st_size
+
+
+def _time(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    logger.info(f"  {label}: {elapsed * 1000:.1f} ms")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare plain and compressed deck caches.")
+    parser.add_argument(
+        "--decks",
+        type=int,
+        default=50_000,
+        help="Synthetic decks to store (default: 50000).",
+    )
+    parser.add_argument(
+        "--lookups",
+        type=int,
+        default=500,
+        help="Decks fetched by the batched lookup (default: 500).",
+    )
+    args = parser.parse_args()
+    if args.decks < 1 or args.lookups < 1:
+        parser.error("--decks and --lookups must be positive")
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    decks = _synthetic_decks(args.decks)
+    lookup = random.Random(1).sample(sorted(decks), min(args.lookups, len(decks)))
+    sizes: dict[str, int] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("plain", "compressed"):
+            cache = DeckTextCache(Path(tmp) / f"{mode}.db")
+            cache.set_many(decks)
+            if mode == "compressed":
+                start = time.perf_counter()
+                cache.compress_storage()
+                logger.info(f"Compressed {len(decks)} decks in {time.perf_counter() - start:.2f} s")
+            sizes[mode] = _db_size(cache)
+            (stored,) = (
+                cache.connection()
+                .execute(
+                    "SELECT SUM(LENGTH(deck_text) + IFNULL(LENGTH(deck_blob), 0)) FROM deck_cache"
+                )
+                .fetchone()
+            )
+            logger.info(
+                f"{mode}: file {_format_size(sizes[mode])}, "
+                f"deck payload {stored / len(decks):.0f} bytes/deck"
+            )
+            _time(f"get_many({len(lookup)})", lambda cache=cache: cache.get_many(lookup))
+            _time(
+                "scan of every stored row",
+                lambda cache=cache: cache.connection()
+                .execute("SELECT deck_number, deck_text, deck_blob FROM deck_cache")
+                .fetchall(),
+            )
+            if mode == "compressed":
+                assert cache.get_many(lookup) == {number: decks[number] for number in lookup}
+            cache.close()
+
+    logger.info(f"Size ratio: {sizes['plain'] / sizes['compressed']:.1f}x smaller")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
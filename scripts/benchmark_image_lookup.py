@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Benchmark the card inspector hover path: image lookups by card and face name.
+
+Builds a synthetic ``images.db`` in a temporary directory and compares
+``CardImageCache.get_image_path`` (indexed name keys and face aliases) with the
+``LOWER(name)`` queries it replaced, which scanned the whole table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from utils.card_images import CardImageCache
+
+# One in this many synthetic cards is double-faced ("Front // Back").
+DOUBLE_FACED_EVERY = 20
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1_000_000:.1f} µs"
+    return f"{seconds:.2f} s"
+
+
+def _populate(cache: CardImageCache, rows: int, image_path: Path) -> list[tuple[str, str]]:
+    """Insert ``rows`` synthetic printings; returns (hover name, stored name) pairs."""
+    names: list[tuple[str, str]] = []
+    with cache.batched_writes():
+        for index in range(rows):
+            if index % DOUBLE_FACED_EVERY == 0:
+                front, back = f"Front Face {index}", f"Back Face {index}"
+                name = f"{front} // {back}"
+                names.append((back, name))
+            else:
+                name = f"Synthetic Card {index}"
+                names.append((name.upper(), name))
+            cache.add_image(
+                uuid=f"uuid-{index}",
+                name=name,
+                set_code="SYN",
+                collector_number=str(index),
+                image_size="normal",
+                file_path=image_path,
+                face_index=-1 if "//" in name else 0,
+            )
+    return names
+
+
+def _legacy_lookup(cache: CardImageCache, card_name: str, size: str = "normal") -> Path | None:
+    """The LOWER(name) / LIKE queries get_image_path ran before name keys existed."""
+    conn = cache.connection()
+    row = conn.execute(
+        "SELECT file_path FROM card_images WHERE LOWER(name) = LOWER(?) AND image_size = ? "
+        "ORDER BY face_index LIMIT 1",
+        (card_name, size),
+    ).fetchone()
+    if row:
+        return Path(row[0])
+    alias = card_name.strip().lower()
+    for pattern in (f"{alias} // %", f"% // {alias}"):
+        row = conn.execute(
+            "SELECT file_path FROM card_images WHERE LOWER(name) LIKE ? AND image_size = ? "
+            "ORDER BY face_index LIMIT 1",
+            (pattern, size),
+        ).fetchone()
+        if row:
+            return Path(row[0])
+    return None
+
+
+def _time_lookups(lookup, names: list[str]) -> float:
+    durations = []
+    for name in names:
+        start = time.perf_counter()
+        if lookup(name) is None:
+            raise RuntimeError(f"No image found for {name!r}")
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time image lookups for inspector hovers.")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100_000,
+        help="Synthetic printings to store (default: 100000).",
+    )
+    parser.add_argument(
+        "--hovers",
+        type=int,
+        default=50,
+        help="Lookups to time per scenario (default: 50).",
+    )
+    args = parser.parse_args()
+
+    if args.rows < DOUBLE_FACED_EVERY or args.hovers < 1:
+        parser.error("--rows must be at least 20 and --hovers at least 1")
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        cache = CardImageCache(cache_dir=cache_dir, db_path=cache_dir / "images.db")
+        image_path = cache.cache_dir / "normal" / "image.jpg"
+        image_path.write_bytes(b"jpg")
+
+        start = time.perf_counter()
+        names = _populate(cache, args.rows, image_path)
+        logger.info(f"Stored {args.rows} rows in {time.perf_counter() - start:.2f} s")
+
+        rng = random.Random(0)
+        single = [hover for hover, stored in names if "//" not in stored]
+        faces = [hover for hover, stored in names if "//" in stored]
+        scenarios = {
+            "card name": rng.sample(single, min(args.hovers, len(single))),
+            "face alias": rng.sample(faces, min(args.hovers, len(faces))),
+        }
+        for label, hovers in scenarios.items():
+            indexed = _time_lookups(cache.get_image_path, hovers)
+            legacy = _time_lookups(lambda name: _legacy_lookup(cache, name), hovers)
+            logger.info(
+                "{label}: indexed={indexed}, LOWER() scan={legacy}, speedup={speedup:.0f}x",
+                label=label,
+                indexed=_format_duration(indexed),
+                legacy=_format_duration(legacy),
+                speedup=legacy / indexed if indexed else float("inf"),
+            )
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,31 @@
 #!/usr/bin/env python3
-"""Benchmark the card metadata caches to understand their load times."""
+"""Benchmark the card metadata caches to understand their load times and peak memory.
+
+The printings index is a memory-mapped binary file, so it is measured as the cost of
+opening it and looking a card up. The bulk data cache is measured both loaded whole with ``json.load`` (how it used to be
+consumed) and streamed card by card with ``iter_json_array``. An MTGJSON
+``AtomicCards.json.zip`` can be compared the same way with ``--atomic-cards``.
+"""
 
 from __future__ import annotations
 
 import argparse
+import io
 import json
 import statistics
 import sys
 import time
+import tracemalloc
+import zipfile
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 from loguru import logger
 
 from utils.card_images import BULK_DATA_CACHE, PRINTING_INDEX_CACHE
+from utils.json_stream import iter_json_array, iter_json_object
+from utils.printing_index import PrintingIndex
 
 
 def _format_duration(seconds: float) -> str:
@@ -21,7 +34,58 @@ def _format_duration(seconds: float) -> str:
     return f"{seconds:.2f} s"
 
 
-def _benchmark(path: Path, iterations: int, label: str) -> None:
+def _load_whole(path: Path) -> Any:
+    with path.open("rb") as fh:
+        return json.load(fh)
+
+
+def _stream(path: Path) -> int:
+    count = 0
+    for _card in iter_json_array(path):
+        count += 1
+    return count
+
+
+def _open_printings(path: Path) -> int:
+    index = PrintingIndex(path)
+    try:
+        return len(index.get("lightning bolt", []))
+    finally:
+        index.close()
+
+
+def _load_atomic_whole(path: Path) -> Any:
+    with zipfile.ZipFile(path) as zf, zf.open("AtomicCards.json") as member:
+        return json.load(member)
+
+
+def _stream_atomic(path: Path) -> int:
+    count = 0
+    with zipfile.ZipFile(path) as zf, zf.open("AtomicCards.json") as member:
+        source = io.TextIOWrapper(member, encoding="utf-8")
+        for _name, _variations in iter_json_object(source, path=("data",)):
+            count += 1
+    return count
+
+
+def _peak_memory_mb(func: Callable[[Path], Any], path: Path) -> float:
+    """Peak Python heap allocated while running ``func`` (traced separately from timing)."""
+    tracemalloc.start()
+    try:
+        func(path)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def _benchmark(
+    path: Path,
+    iterations: int,
+    label: str,
+    loader: Callable[[Path], Any] = _load_whole,
+    measure_memory: bool = False,
+) -> None:
     if not path.exists():
         logger.warning(f"{label} cache not found at {path}")
         return
@@ -33,8 +97,7 @@ def _benchmark(path: Path, iterations: int, label: str) -> None:
     for iteration in range(iterations):
         start = time.perf_counter()
         try:
-            with path.open("rb") as fh:
-                json.load(fh)
+            loader(path)
         except json.JSONDecodeError as exc:
             logger.error(f"Failed to parse {label} cache: {exc}")
             return
@@ -52,6 +115,8 @@ def _benchmark(path: Path, iterations: int, label: str) -> None:
         label=label,
         **summary,  # type: ignore[arg-type]
     )
+    if measure_memory:
+        logger.info(f"{label} peak memory: {_peak_memory_mb(loader, path):.1f} MB")
 
 
 def main() -> int:
@@ -74,6 +139,17 @@ def main() -> int:
         action="store_true",
         help="Skip measuring the compact printings index cache.",
     )
+    parser.add_argument(
+        "--bulk-data",
+        type=Path,
+        default=BULK_DATA_CACHE,
+        help="Bulk data file to measure (default: the cached bulk_data.json).",
+    )
+    parser.add_argument(
+        "--atomic-cards",
+        type=Path,
+        help="Also measure an MTGJSON AtomicCards.json.zip, loaded whole and streamed.",
+    )
 
     args = parser.parse_args()
 
@@ -84,10 +160,32 @@ def main() -> int:
         parser.error("Cannot skip both caches; nothing to benchmark.")
 
     if not args.skip_printings:
-        _benchmark(PRINTING_INDEX_CACHE, args.iterations, "Printings index")
+        _benchmark(
+            PRINTING_INDEX_CACHE,
+            args.iterations,
+            "Printings index",
+            loader=_open_printings,
+            measure_memory=True,
+        )
 
     if not args.skip_bulk:
-        _benchmark(BULK_DATA_CACHE, args.iterations, "Bulk data")
+        _benchmark(args.bulk_data, args.iterations, "Bulk data (json.load)", measure_memory=True)
+        _benchmark(
+            args.bulk_data,
+            args.iterations,
+            "Bulk data (streamed)",
+            loader=_stream,
+            measure_memory=True,
+        )
+
+    if args.atomic_cards:
+        for label, loader in (
+            ("AtomicCards (json.load)", _load_atomic_whole),
+            ("AtomicCards (streamed)", _stream_atomic),
+        ):
+            _benchmark(
+                args.atomic_cards, args.iterations, label, loader=loader, measure_memory=True
+            )
 
     return 0
 
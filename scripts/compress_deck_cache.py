@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Convert the deck text cache to compressed storage (or back to plain text)."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from utils.deck_text_cache import DECK_CACHE_DB, DeckTextCache
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, default=DECK_CACHE_DB, help="Deck cache database.")
+    parser.add_argument(
+        "--decompress", action="store_true", help="Store every deck as plain text again."
+    )
+    parser.add_argument(
+        "--retrain",
+        action="store_true",
+        help="Train a new dictionary even if the cache is already compressed.",
+    )
+    args = parser.parse_args()
+
+    cache = DeckTextCache(args.db)
+    before = args.db.stat().st_size
+    if args.decompress:
+        cache.decompress_storage()
+    else:
+        cache.compress_storage(retrain=args.retrain)
+    cache.vacuum()
+    cache.close()
+    after = args.db.stat().st_size
+    logger.info(f"{args.db}: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
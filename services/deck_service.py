@@ -18,6 +18,8 @@ from loguru import logger
 
 from repositories.deck_repository import DeckRepository, get_deck_repository
 from repositories.metagame_repository import MetagameRepository, get_metagame_repository
+from utils.deck import parse_deck_zones
+from utils.deck_text_cache import DeckCardAggregates
 
 
 @dataclass(frozen=True)
@@ -122,62 +124,9 @@ class DeckService:
                 - sideboard_cards: list of (card_name, count) tuples
                 - estimated_lands: int
         """
-        lines = deck_content.strip().split("\n")
-
-        mainboard_totals: dict[str, float] = {}
-        sideboard_totals: dict[str, float] = {}
-        mainboard_order: list[str] = []
-        sideboard_order: list[str] = []
-        is_sideboard = False
-
-        for line in lines:
-            line = line.strip()
-
-            # Empty line marks sideboard
-            if not line:
-                is_sideboard = True
-                continue
-
-            # Skip "Sideboard" header
-            if line.lower() == "sideboard":
-                is_sideboard = True
-                continue
-
-            # Parse card line
-            try:
-                parts = line.split(" ", 1)
-                if len(parts) < 2:
-                    continue
-
-                # Preserve float quantities from average decks
-                count_float = float(parts[0])
-                card_name = parts[1].strip()
-
-                if is_sideboard:
-                    target_totals = sideboard_totals
-                    target_order = sideboard_order
-                else:
-                    target_totals = mainboard_totals
-                    target_order = mainboard_order
-
-                if card_name not in target_totals:
-                    target_order.append(card_name)
-                target_totals[card_name] = target_totals.get(card_name, 0.0) + count_float
-
-            except (ValueError, IndexError):
-                continue
-
-        def _build_card_list(
-            order: list[str], totals: dict[str, float]
-        ) -> list[tuple[str, int | float]]:
-            cards: list[tuple[str, int | float]] = []
-            for card in order:
-                total = totals[card]
-                cards.append((card, int(total) if float(total).is_integer() else total))
-            return cards
-
-        mainboard = _build_card_list(mainboard_order, mainboard_totals)
-        sideboard = _build_card_list(sideboard_order, sideboard_totals)
+        zones = parse_deck_zones(deck_content)
+        mainboard = list(zones["main"].items())
+        sideboard = list(zones["side"].items())
 
         # Calculate statistics
         mainboard_count = sum(count for _, count in mainboard)
@@ -300,11 +249,39 @@ class DeckService:
             buffer: dict[str, float] = {}
             processed = 0
 
+            # Sum the cards of already-cached decks in one aggregate query
+            try:
+                aggregates = self.metagame_repo.get_cached_card_aggregates(
+                    decks_to_process, source_filter=source_filter
+                )
+            except Exception as exc:
+                logger.warning(f"Cached deck aggregation failed: {exc}")
+                aggregates = DeckCardAggregates([], [])
+            for card in aggregates.cards:
+                key = card.card_name if card.zone == "main" else f"Sideboard {card.card_name}"
+                buffer[key] = buffer.get(key, 0.0) + float(card.total_copies)
+            covered = set(aggregates.deck_numbers)
+            processed += len(covered)
+            decks_to_process = [
+                deck for deck in decks_to_process if str(deck.get("number", "")) not in covered
+            ]
+
+            # Read the remaining cached decks in one batched lookup
+            try:
+                cached = self.metagame_repo.get_cached_deck_contents(
+                    decks_to_process, source_filter=source_filter
+                )
+            except Exception as exc:
+                logger.warning(f"Batched deck cache lookup failed: {exc}")
+                cached = {}
+
             for deck in decks_to_process:
                 try:
-                    deck_content = self.metagame_repo.download_deck_content(
-                        deck, source_filter=source_filter
-                    )
+                    deck_content = cached.get(str(deck.get("number", "")))
+                    if deck_content is None:
+                        deck_content = self.metagame_repo.download_deck_content(
+                            deck, source_filter=source_filter
+                        )
                     buffer = self.add_deck_to_buffer(buffer, deck_content)
                     processed += 1
                 except Exception as exc:
@@ -6,10 +6,11 @@ This module handles:
 - Bulk metadata downloading
 - Printing index loading
 - Image cache management
+- Deck thumbnail atlas reads
 """
 
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from loguru import logger
@@ -20,6 +21,8 @@ from utils.card_images import (
     ensure_printing_index_cache,
     get_cache,
 )
+from utils.printing_index import PrintingIndex
+from utils.thumbnail_atlas import DEFAULT_THUMBNAIL_SIZE, ThumbnailAtlasBuilder
 
 
 class ImageService:
@@ -29,9 +32,11 @@ class ImageService:
         """Initialize the image service."""
         self.image_cache = get_cache()
         self.image_downloader: BulkImageDownloader | None = None
-        self.bulk_data_by_name: dict[str, list[dict[str, Any]]] | None = None
+        self.bulk_data_by_name: PrintingIndex | None = None
         self.printing_index_loading: bool = False
         self._bulk_check_worker_active: bool = False
+        self.atlas_builders: dict[str, ThumbnailAtlasBuilder] = {}
+        self._atlas_lock = threading.Lock()
 
     # ============= Bulk Data Management =============
 
@@ -84,7 +89,7 @@ class ImageService:
         max_age_days: int,
         worker_factory: Callable[..., Any],
         set_status: Callable[[str], None],
-        on_load_success: Callable[[dict[str, list[dict[str, Any]]], dict[str, Any]], None],
+        on_load_success: Callable[[PrintingIndex, dict[str, Any]], None],
         on_load_error: Callable[[str], None],
         on_download_success: Callable[[str], None],
         on_download_error: Callable[[str], None],
@@ -150,7 +155,7 @@ class ImageService:
         reason: str,
         force_cached: bool,
         set_status: Callable[[str], None],
-        on_load_success: Callable[[dict[str, list[dict[str, Any]]], dict[str, Any]], None],
+        on_load_success: Callable[[PrintingIndex, dict[str, Any]], None],
         on_load_error: Callable[[str], None],
         on_download_success: Callable[[str], None],
         on_download_error: Callable[[str], None],
@@ -189,7 +194,7 @@ class ImageService:
         *,
         set_status: Callable[[str], None],
         force: bool,
-        on_success: Callable[[dict[str, list[dict[str, Any]]], dict[str, Any]], None],
+        on_success: Callable[[PrintingIndex, dict[str, Any]], None],
         on_error: Callable[[str], None],
     ) -> None:
         """Load bulk data from cache."""
@@ -207,7 +212,7 @@ class ImageService:
         *,
         force: bool,
         set_status: Callable[[str], None],
-        on_load_success: Callable[[dict[str, list[dict[str, Any]]], dict[str, Any]], None],
+        on_load_success: Callable[[PrintingIndex, dict[str, Any]], None],
         on_load_error: Callable[[str], None],
     ) -> None:
         """Expose bulk data loading for fallback flows."""
@@ -223,7 +228,7 @@ class ImageService:
     def load_printing_index_async(
         self,
         force: bool,
-        on_success: Callable[[dict[str, list[dict[str, Any]]], dict[str, Any]], None],
+        on_success: Callable[[PrintingIndex, dict[str, Any]], None],
         on_error: Callable[[str], None],
     ) -> bool:
         """
@@ -231,7 +236,7 @@ class ImageService:
 
         Args:
             force: Force reload even if already loading/loaded
-            on_success: Callback for successful load (receives bulk_data_by_name, stats)
+            on_success: Callback for successful load (receives the printing index, stats)
             on_error: Callback for failed load (receives error message)
 
         Returns:
@@ -249,15 +254,12 @@ class ImageService:
 
         def worker():
             try:
-                payload = ensure_printing_index_cache(force=force)
-                data = payload.get("data", {})
+                index = ensure_printing_index_cache(force=force)
                 stats = {
-                    "unique_names": payload.get("unique_names", len(data)),
-                    "total_printings": payload.get(
-                        "total_printings", sum(len(v) for v in data.values())
-                    ),
+                    "unique_names": index.unique_names,
+                    "total_printings": index.total_printings,
                 }
-                on_success(data, stats)
+                on_success(index, stats)
             except Exception as exc:
                 logger.exception("Failed to prepare card printings index")
                 on_error(str(exc))
@@ -265,7 +267,7 @@ class ImageService:
         threading.Thread(target=worker, daemon=True).start()
         return True
 
-    def set_bulk_data(self, bulk_data: dict[str, list[dict[str, Any]]]) -> None:
+    def set_bulk_data(self, bulk_data: PrintingIndex) -> None:
         """Set the bulk data reference."""
         self.bulk_data_by_name = bulk_data
 
@@ -273,7 +275,7 @@ class ImageService:
         """Clear the printing index loading flag."""
         self.printing_index_loading = False
 
-    def get_bulk_data(self) -> dict[str, list[dict[str, Any]]] | None:
+    def get_bulk_data(self) -> PrintingIndex | None:
         """Get the current bulk data."""
         return self.bulk_data_by_name
 
@@ -281,6 +283,48 @@ class ImageService:
         """Check if printing index is currently loading."""
         return self.printing_index_loading
 
+    # ============= Thumbnail Atlases =============
+
+    def get_atlas_builder(self, size: str = DEFAULT_THUMBNAIL_SIZE) -> ThumbnailAtlasBuilder:
+        """Get the thumbnail atlas builder for an image size."""
+        with self._atlas_lock:
+            builder = self.atlas_builders.get(size)
+            if builder is None:
+                builder = self.atlas_builders[size] = ThumbnailAtlasBuilder(
+                    self.image_cache, size=size
+                )
+            return builder
+
+    def load_deck_thumbnails_async(
+        self,
+        card_names: Iterable[str],
+        on_loaded: Callable[[dict[str, bytes]], None],
+    ) -> None:
+        """
+        Read the thumbnails of cards shown together from their deck atlas in a background thread.
+
+        The atlas is built (or rebuilt) first if its thumbnails changed, so a deck costs one
+        file read instead of one per card.
+
+        Args:
+            card_names: Cards shown together, e.g. one deck zone
+            on_loaded: Callback receiving the encoded thumbnails keyed by lowercased card
+                name; cards without a cached thumbnail are left out
+        """
+        names = sorted({name.lower() for name in card_names if name})
+        builder = self.get_atlas_builder()
+
+        def worker():
+            try:
+                atlas = builder.ensure_deck_atlas(names)
+                thumbnails = {name: data for name in names if (data := atlas.get(name))}
+            except Exception:
+                logger.exception("Failed to load deck thumbnails")
+                return
+            on_loaded(thumbnails)
+
+        threading.Thread(target=worker, daemon=True).start()
+
 
 # Global instance for backward compatibility
 _default_service = None
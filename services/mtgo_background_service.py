@@ -12,9 +12,10 @@ except ImportError:  # pragma: no cover - Python 3.10 fallback
 from loguru import logger
 
 from navigators.mtgo_decklists import fetch_deck_event, fetch_decklist_index
+from repositories.metagame_repository import deck_day
 from utils.archetype_classifier import ArchetypeClassifier
 from utils.constants import CACHE_DIR, MTGO_DECKLISTS_ENABLED
-from utils.deck_text_cache import get_deck_cache
+from utils.deck_text_cache import archetype_key, get_deck_cache
 
 MTGO_METADATA_CACHE = CACHE_DIR / "mtgo_deck_metadata.json"
 
@@ -283,20 +284,27 @@ def process_mtgo_event(event_url: str, mtg_format: str = "modern", delay: float
 
         classifier.assign_archetypes(classifier_decks, mtg_format)
 
-        cached_count = 0
-        for idx, (clean_deck, classifier_deck) in enumerate(zip(clean_decks, classifier_decks), 1):
+        deck_texts: dict[str, str] = {}
+        for idx, clean_deck in enumerate(clean_decks, 1):
             deck_id = clean_deck["deck_id"]
             if not deck_id:
                 logger.warning(f"Deck {idx} has no deck_id, skipping")
                 continue
+            deck_texts[deck_id] = deck_to_text(clean_deck)
 
-            deck_text = deck_to_text(clean_deck)
-            success = deck_cache.set(deck_id, deck_text, source="mtgo")
-            if success:
-                cached_count += 1
-            else:
-                logger.warning(f"Failed to cache deck {deck_id}")
+        # Store the whole event in one transaction
+        if deck_texts and not deck_cache.set_many(deck_texts, source="mtgo"):
+            logger.warning(f"Failed to cache {len(deck_texts)} decks from {event_url}")
+            deck_texts = {}
+
+        cached_count = 0
+        archetype_decks: dict[str, list[tuple[str, str]]] = {}
+        event_day = deck_day(event_date)
+        for clean_deck, classifier_deck in zip(clean_decks, classifier_decks):
+            deck_id = clean_deck["deck_id"]
+            if deck_id not in deck_texts:
                 continue
+            cached_count += 1
 
             archetype = classifier_deck.get("archetype", "Unknown")
             player = clean_deck.get("player", "Unknown")
@@ -320,6 +328,12 @@ def process_mtgo_event(event_url: str, mtg_format: str = "modern", delay: float
                 save_mtgo_deck_metadata(archetype, mtg_format, deck_metadata)
             except Exception as meta_exc:
                 logger.warning(f"Failed to save MTGO deck metadata for {deck_id}: {meta_exc}")
+            if event_day:
+                archetype_decks.setdefault(archetype, []).append((deck_id, event_day))
+
+        # Fold the new decks into the stored per-archetype statistics
+        for archetype, decks in archetype_decks.items():
+            deck_cache.add_archetype_decks(archetype_key("mtgo", archetype, mtg_format), decks)
 
         logger.info(f"Cached {cached_count}/{len(clean_decks)} decks from {event_url}")
 
@@ -3,19 +3,46 @@ Radar Service - Business logic for archetype card frequency analysis.
 
 This module provides functionality for analyzing card frequencies across all decks
 in a specific archetype, tracking which cards appear and how often.
+
+Card counts come from the per-archetype statistics kept in the deck cache, which hold one
+partial aggregate per day and are updated whenever decks of the archetype are cached. A
+radar adds the archetype's current decks that are not in those statistics yet and then
+merges the days of its date window (by default, the days of the current decks). Only
+decks that are not cached at all are downloaded, by a small thread pool whose requests
+are spaced per host. The calling thread parses each downloaded deck as it arrives
+(reporting progress, which is also where cancellation is raised).
+
+With ``max_decks`` the radar covers exactly the newest decks instead: cached ones are
+aggregated by one query over the cache's ``deck_cards`` table and the rest are parsed.
 """
 
 from __future__ import annotations
 
+import threading
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import closing
 from dataclasses import dataclass
+from datetime import date
 from typing import Any
 
 from loguru import logger
 
-from repositories.metagame_repository import MetagameRepository, get_metagame_repository
+from repositories.metagame_repository import (
+    MetagameRepository,
+    deck_day,
+    get_metagame_repository,
+)
 from services.deck_service import DeckService, get_deck_service
+from utils.deck_text_cache import DeckCardAggregates
+from utils.rate_limiter import HostRateLimiter
+
+# Concurrent deck page downloads while calculating a radar.
+RADAR_FETCH_WORKERS = 4
+# Minimum spacing between requests to the same host, in seconds.
+RADAR_REQUEST_INTERVAL = 0.25
+DEFAULT_DECK_HOST = "www.mtggoldfish.com"
 
 
 @dataclass
@@ -51,6 +78,8 @@ class RadarService:
         self,
         metagame_repository: MetagameRepository | None = None,
         deck_service: DeckService | None = None,
+        max_workers: int = RADAR_FETCH_WORKERS,
+        rate_limiter: HostRateLimiter | None = None,
     ):
         """
         Initialize the radar service.
@@ -58,9 +87,13 @@ class RadarService:
         Args:
             metagame_repository: MetagameRepository instance
             deck_service: DeckService instance
+            max_workers: Maximum concurrent deck downloads
+            rate_limiter: Spacing applied to deck downloads per host
         """
         self.metagame_repo = metagame_repository or get_metagame_repository()
         self.deck_service = deck_service or get_deck_service()
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or HostRateLimiter(RADAR_REQUEST_INTERVAL)
 
     def calculate_radar(
         self,
@@ -68,6 +101,8 @@ class RadarService:
         format_name: str,
         max_decks: int | None = None,
         progress_callback: Callable[[int, int, str], None] | None = None,
+        since: date | None = None,
+        until: date | None = None,
     ) -> RadarData:
         """
         Calculate radar data for a specific archetype.
@@ -77,6 +112,8 @@ class RadarService:
             format_name: MTG format (e.g., "Modern", "Standard")
             max_decks: Maximum number of decks to analyze (None = all)
             progress_callback: Optional callback(current, total, deck_name)
+            since: First day of the decks to analyze (ignored with max_decks)
+            until: Last day of the decks to analyze (ignored with max_decks)
 
         Returns:
             RadarData with frequency statistics
@@ -102,6 +139,9 @@ class RadarService:
             # Limit decks if specified
             if max_decks is not None:
                 decks = decks[:max_decks]
+                window = None
+            else:
+                decks, window = self._select_window(decks, since, until)
 
             # Track card appearances
             mainboard_stats: dict[str, list[int]] = defaultdict(list)
@@ -109,37 +149,83 @@ class RadarService:
             successful_decks = 0
             failed_decks = 0
 
-            # Analyze each deck
-            for i, deck in enumerate(decks):
-                deck_name = deck.get("name", f"Deck {i+1}")
-
+            # Stored or cached decks are aggregated in SQL; only the others are downloaded
+            if window is None:
+                aggregates = self._cached_card_aggregates(decks)
+                covered = set(aggregates.deck_numbers)
+            else:
+                covered = self._record_archetype_decks(archetype, decks)
+            remaining: list[dict[str, Any]] = []
+            done = 0
+            for index, deck in enumerate(decks):
+                if str(deck.get("number", "")) not in covered:
+                    remaining.append(deck)
+                    continue
+                done += 1
                 if progress_callback:
-                    progress_callback(i + 1, len(decks), deck_name)
-
-                try:
-                    # Download deck content
-                    deck_content = self.metagame_repo.download_deck_content(deck)
-
-                    # Analyze deck structure
-                    analysis = self.deck_service.analyze_deck(deck_content)
-
-                    # Record mainboard card counts
-                    for card_name, count in analysis["mainboard_cards"]:
-                        # Convert to int (in case it's a float from averaging)
-                        count_int = int(count) if isinstance(count, float) else count
-                        mainboard_stats[card_name].append(count_int)
+                    progress_callback(done, len(decks), deck.get("name", f"Deck {index+1}"))
+
+            # Parse decks as they arrive; aggregate afterwards in deck order so the result
+            # does not depend on download timing.
+            analyses: list[dict[str, Any] | None] = [None] * len(remaining)
+            with closing(self._iter_deck_contents(remaining)) as deck_contents:
+                for index, deck_content, error in deck_contents:
+                    deck_name = remaining[index].get("name", f"Deck {index+1}")
+
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, len(decks), deck_name)
+
+                    try:
+                        if error is not None:
+                            raise error
+                        # Analyze deck structure
+                        analyses[index] = self.deck_service.analyze_deck(deck_content)
+                    except Exception as exc:
+                        logger.warning(f"Failed to analyze deck {deck_name}: {exc}")
+                        failed_decks += 1
+
+            if window is not None:
+                # Downloaded decks are cached now, so they can join the stored statistics
+                downloaded = [
+                    deck for deck, analysis in zip(remaining, analyses) if analysis is not None
+                ]
+                stored = self._record_archetype_decks(archetype, downloaded)
+                analyses = [
+                    analysis
+                    for deck, analysis in zip(remaining, analyses)
+                    if str(deck.get("number", "")) not in stored
+                ]
+                aggregates = self._archetype_aggregates(archetype, window)
+                included = covered | stored
+                if not included.issubset(aggregates.deck_numbers):
+                    # Stored under a day outside the window, or the lookup failed
+                    aggregates = self._cached_card_aggregates(
+                        [deck for deck in decks if str(deck.get("number", "")) in included]
+                    )
+
+            for card in aggregates.cards:
+                target = mainboard_stats if card.zone == "main" else sideboard_stats
+                for count, deck_count in card.copy_distribution.items():
+                    target[card.card_name].extend([int(count)] * deck_count)
+            successful_decks += len(aggregates.deck_numbers)
+
+            for analysis in analyses:
+                if analysis is None:
+                    continue
 
-                    # Record sideboard card counts
-                    for card_name, count in analysis["sideboard_cards"]:
-                        count_int = int(count) if isinstance(count, float) else count
-                        sideboard_stats[card_name].append(count_int)
+                # Record mainboard card counts
+                for card_name, count in analysis["mainboard_cards"]:
+                    # Convert to int (in case it's a float from averaging)
+                    count_int = int(count) if isinstance(count, float) else count
+                    mainboard_stats[card_name].append(count_int)
 
-                    successful_decks += 1
+                # Record sideboard card counts
+                for card_name, count in analysis["sideboard_cards"]:
+                    count_int = int(count) if isinstance(count, float) else count
+                    sideboard_stats[card_name].append(count_int)
 
-                except Exception as exc:
-                    logger.warning(f"Failed to analyze deck {deck_name}: {exc}")
-                    failed_decks += 1
-                    continue
+                successful_decks += 1
 
             if successful_decks == 0:
                 logger.error(f"Failed to analyze any decks for {archetype_name}")
@@ -182,6 +268,108 @@ class RadarService:
             logger.error(f"Failed to calculate radar for {archetype_name}: {exc}")
             raise
 
+    def _select_window(
+        self, decks: list[dict[str, Any]], since: date | None, until: date | None
+    ) -> tuple[list[dict[str, Any]], tuple[date | None, date | None] | None]:
+        """
+        Resolve the date window of a radar and the current decks inside it.
+
+        Without an explicit window, the window spans the dates of ``decks``; it is None
+        when no deck has a date, and the stored statistics cannot be used.
+        """
+        days = [deck_day(deck.get("date", "")) for deck in decks]
+        if since is None and until is None:
+            dated = sorted(day for day in days if day)
+            if not dated:
+                return decks, None
+            return decks, (date.fromisoformat(dated[0]), date.fromisoformat(dated[-1]))
+        low = since.isoformat() if since else ""
+        high = until.isoformat() if until else "9999-12-31"
+        selected = [deck for deck, day in zip(decks, days) if day and low <= day <= high]
+        return selected, (since, until)
+
+    def _record_archetype_decks(
+        self, archetype: dict[str, Any], decks: list[dict[str, Any]]
+    ) -> set[str]:
+        """Add the cached decks among ``decks`` to the stored statistics; on failure, none."""
+        if not decks:
+            return set()
+        try:
+            return self.metagame_repo.record_archetype_decks(archetype, decks)
+        except Exception as exc:
+            logger.warning(f"Updating archetype statistics failed: {exc}")
+            return set()
+
+    def _archetype_aggregates(
+        self, archetype: dict[str, Any], window: tuple[date | None, date | None]
+    ) -> DeckCardAggregates:
+        """Merge the stored statistics of ``archetype`` over ``window``."""
+        since, until = window
+        try:
+            return self.metagame_repo.get_archetype_aggregates(archetype, since=since, until=until)
+        except Exception as exc:
+            logger.warning(f"Archetype statistics lookup failed: {exc}")
+            return DeckCardAggregates([], [])
+
+    def _cached_card_aggregates(self, decks: list[dict[str, Any]]) -> DeckCardAggregates:
+        """Aggregate the cached decks among ``decks``; on failure, none are covered."""
+        try:
+            return self.metagame_repo.get_cached_card_aggregates(decks)
+        except Exception as exc:
+            logger.warning(f"Cached deck aggregation failed: {exc}")
+            return DeckCardAggregates([], [])
+
+    def _iter_deck_contents(
+        self, decks: list[dict[str, Any]]
+    ) -> Generator[tuple[int, str | None, Exception | None], None, None]:
+        """
+        Yield ``(index, deck_content, error)`` for every deck, cached ones first.
+
+        Cached decks come from a single batched lookup. The others are downloaded on a
+        bounded thread pool and yielded as they complete. If the consumer stops early
+        (e.g. cancellation raised from a progress callback), queued downloads are
+        cancelled and running ones are not followed by new requests.
+        """
+        try:
+            cached = self.metagame_repo.get_cached_deck_contents(decks)
+        except Exception as exc:
+            logger.warning(f"Batched deck cache lookup failed: {exc}")
+            cached = {}
+
+        pending: list[int] = []
+        for index, deck in enumerate(decks):
+            deck_content = cached.get(str(deck.get("number", "")))
+            if deck_content is not None:
+                yield index, deck_content, None
+            else:
+                pending.append(index)
+        if not pending:
+            return
+
+        stop = threading.Event()
+
+        def fetch(deck: dict[str, Any]) -> str:
+            self.rate_limiter.acquire(deck.get("url") or DEFAULT_DECK_HOST)
+            if stop.is_set():
+                raise InterruptedError("Radar generation stopped")
+            return self.metagame_repo.download_deck_content(deck)
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(pending)), thread_name_prefix="radar-fetch"
+        )
+        try:
+            futures: dict[Future[str], int] = {
+                executor.submit(fetch, decks[index]): index for index in pending
+            }
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as exc:
+                    yield futures[future], None, exc
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _calculate_frequencies(
         self, card_stats: dict[str, list[int]], total_decks: int
     ) -> list[CardFrequency]:
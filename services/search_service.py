@@ -9,15 +9,103 @@ This module contains all the business logic for searching and filtering cards:
 - Advanced search combinations
 """
 
-from typing import Any
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from repositories.card_repository import CardRepository, get_card_repository
 from utils.card_data import CardDataManager
+from utils.lru_cache import SizedLRUCache
 from utils.mana_icon_factory import normalize_mana_query
+from utils.name_completer import NameCompleter
+from utils.search_executor import CancellationToken
 from utils.search_filters import matches_color_filter, matches_mana_cost, matches_mana_value
 
+if TYPE_CHECKING:
+    from utils.card_filter_engine import CardFilterEngine
+
+
+# Builder query results (as bitsets) kept for refining successive keystrokes.
+REFINEMENT_CACHE_ENTRIES = 64
+REFINEMENT_CACHE_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BuilderQuery:
+    """Normalized builder filters; equal filters produce equal (hashable) queries."""
+
+    name: str = ""
+    type: str = ""
+    text: str = ""
+    mana: str = ""
+    mana_mode: str = "contains"
+    mv_value: float | None = None
+    mv_comparator: str = "Any"
+    formats: frozenset[str] = frozenset()
+    color_mode: str = "Any"
+    colors: frozenset[str] = frozenset()
+    radar_cards: frozenset[str] | None = None
+
+    @classmethod
+    def from_filters(cls, filters: dict[str, Any]) -> BuilderQuery:
+        """Normalize a builder panel filter dict (see ``search_with_builder_filters``)."""
+        mv_value = None
+        mv_comparator = filters.get("mv_comparator", "Any")
+        mv_value_text = filters.get("mv_value", "")
+        if mv_value_text:
+            try:
+                mv_value = float(mv_value_text)
+            except ValueError:
+                logger.warning(f"Invalid mana value: {mv_value_text}")
+        if mv_value is None or mv_comparator == "Any":
+            mv_value, mv_comparator = None, "Any"
+
+        color_mode = filters.get("color_mode", "Any")
+        colors = frozenset(filters.get("selected_colors") or ())
+        if not colors or color_mode == "Any":
+            color_mode, colors = "Any", frozenset()
+
+        radar_cards = None
+        if filters.get("radar_enabled") and filters.get("radar_cards"):
+            radar_cards = frozenset(filters["radar_cards"])
+
+        return cls(
+            name=(filters.get("name") or "").lower(),
+            type=(filters.get("type") or "").lower(),
+            text=(filters.get("text") or "").lower(),
+            mana=normalize_mana_query(filters.get("mana", "")),
+            mana_mode="exact" if filters.get("mana_exact") else "contains",
+            mv_value=mv_value,
+            mv_comparator=mv_comparator,
+            formats=frozenset(filters.get("formats") or ()),
+            color_mode=color_mode,
+            colors=colors,
+            radar_cards=radar_cards,
+        )
+
+    def is_refined_by(self, other: BuilderQuery) -> bool:
+        """True if every card matching ``other`` also matches this query."""
+        return (
+            self.name in other.name
+            and self.type in other.type
+            and self.text in other.text
+            and (not self.mana or (self.mana, self.mana_mode) == (other.mana, other.mana_mode))
+            and (
+                self.mv_value is None
+                or (self.mv_value, self.mv_comparator) == (other.mv_value, other.mv_comparator)
+            )
+            and self.formats <= other.formats
+            and (
+                self.color_mode == "Any"
+                or (self.color_mode, self.colors) == (other.color_mode, other.colors)
+            )
+            and (self.radar_cards is None or self.radar_cards == other.radar_cards)
+        )
+
 
 class SearchService:
     """Service for card search and filtering logic."""
@@ -30,6 +118,12 @@ class SearchService:
             card_repository: CardRepository instance
         """
         self.card_repo = card_repository or get_card_repository()
+        self._refinement_cache: SizedLRUCache[BuilderQuery, int] = SizedLRUCache(
+            REFINEMENT_CACHE_ENTRIES, REFINEMENT_CACHE_BYTES
+        )
+        self._refinement_engine: CardFilterEngine | None = None
+        self._card_popularity: dict[str, float] = {}
+        self._ranked_completer: NameCompleter | None = None
 
     # ============= Basic Search =============
 
@@ -135,21 +229,27 @@ class SearchService:
         filters: dict[str, Any],
         card_manager: CardDataManager,
         limit: int | None = None,
-    ) -> list[dict[str, Any]]:
+        cancel_token: CancellationToken | None = None,
+    ) -> Sequence[dict[str, Any]]:
         """
         Perform a comprehensive card search with all builder panel filters.
 
         This method handles the complex filtering logic used by the deck builder,
         including name, type, mana cost, oracle text, format legality, mana value,
-        and color identity filters.
+        and color identity filters. Each filter is evaluated as a bitmask over the
+        whole card pool by the manager's ``CardFilterEngine``. Results are cached per
+        normalized filter set, and a query that narrows a cached one (e.g. "lig" ->
+        "ligh") only re-filters the cached result.
 
         Args:
             filters: Dictionary of filter criteria from builder panel
             card_manager: CardDataManager instance to search
             limit: Maximum number of results to return (default None for unlimited)
+            cancel_token: Optional token from ``SearchExecutor``; the search stops with
+                ``SearchCancelled`` once a newer query supersedes it
 
         Returns:
-            List of filtered card dictionaries
+            Filtered card dictionaries in card index order, materialized lazily
 
         Filter keys expected:
             - name: str - Card name filter
@@ -165,90 +265,69 @@ class SearchService:
             - radar_enabled: bool - Whether radar filtering is enabled
             - radar_cards: set[str] - Set of card names to filter by (from radar)
         """
-        # Parse and normalize filters
-        mana_query = normalize_mana_query(filters.get("mana", ""))
-        mana_mode = "exact" if filters.get("mana_exact") else "contains"
-        mv_cmp = filters.get("mv_comparator", "Any")
-
-        # Parse mana value
-        mv_value = None
-        mv_value_text = filters.get("mv_value", "")
-        if mv_value_text:
-            try:
-                mv_value = float(mv_value_text)
-            except ValueError:
-                logger.warning(f"Invalid mana value: {mv_value_text}")
-                mv_value = None
-
-        selected_formats = filters.get("formats", [])
-        color_mode = filters.get("color_mode", "Any")
-        selected_colors = filters.get("selected_colors", [])
-
-        # Perform initial search
-        query = filters.get("name") or filters.get("text") or ""
-        results = card_manager.search_cards(query=query, format_filter=None)
-
-        # Apply all filters
-        filtered: list[dict[str, Any]] = []
-        for card in results:
-            # Name filter
-            if filters.get("name"):
-                name_lower = card.get("name_lower", "")
-                if filters["name"].lower() not in name_lower:
-                    continue
-
-            # Type filter
-            if filters.get("type"):
-                type_line = (card.get("type_line") or "").lower()
-                if filters["type"].lower() not in type_line:
-                    continue
-
-            # Mana cost filter
-            if mana_query:
-                mana_cost = (card.get("mana_cost") or "").upper()
-                if not matches_mana_cost(mana_cost, mana_query, mana_mode):
-                    continue
-
-            # Oracle text filter
-            if filters.get("text"):
-                oracle_text = (card.get("oracle_text") or "").lower()
-                if filters["text"].lower() not in oracle_text:
-                    continue
-
-            # Format legality filter
-            if selected_formats:
-                legalities = card.get("legalities", {}) or {}
-                if not all(legalities.get(fmt) == "Legal" for fmt in selected_formats):
-                    continue
-
-            # Mana value filter
-            if mv_value is not None and mv_cmp != "Any":
-                if not matches_mana_value(card.get("mana_value"), mv_value, mv_cmp):
-                    continue
-
-            # Color identity filter
-            if selected_colors and color_mode != "Any":
-                if not matches_color_filter(
-                    card.get("color_identity") or [], selected_colors, color_mode
-                ):
-                    continue
+        query = BuilderQuery.from_filters(filters)
+        engine = card_manager.filter_engine()
+        if engine is not self._refinement_engine:
+            # Card data was (re)loaded: cached bitsets refer to the old positions.
+            self._refinement_cache.clear()
+            self._refinement_engine = engine
+
+        bits = self._refinement_cache.get(query)
+        if bits is None:
+            bits = self._evaluate_builder_query(
+                engine, query, self._narrowest_cached(query), cancel_token
+            )
+            self._refinement_cache.put(query, bits)
+
+        results = engine.records(bits, limit)
+        logger.debug(f"Search completed: {len(results)} results")
+        return results
 
-            # Radar filter
-            if filters.get("radar_enabled") and filters.get("radar_cards"):
-                radar_cards = filters.get("radar_cards", set())
-                card_name = card.get("name", "")
-                if card_name not in radar_cards:
-                    continue
+    def clear_refinement_cache(self) -> None:
+        """Drop cached builder results (e.g. after card data changes)."""
+        self._refinement_cache.clear()
 
-            # Add to results
-            filtered.append(card)
-            if limit is not None and len(filtered) >= limit:
-                break
+    def _narrowest_cached(self, query: BuilderQuery) -> int | None:
+        """Return the smallest cached result that is a superset of ``query``'s result."""
+        best: int | None = None
+        for cached_query, bits in self._refinement_cache.items():
+            if cached_query.is_refined_by(query):
+                if best is None or bits.bit_count() < best.bit_count():
+                    best = bits
+        return best
 
-        logger.debug(
-            f"Search completed: {len(results)} initial results, {len(filtered)} after filtering"
-        )
-        return filtered
+    def _evaluate_builder_query(
+        self,
+        engine: CardFilterEngine,
+        query: BuilderQuery,
+        within: int | None,
+        cancel_token: CancellationToken | None,
+    ) -> int:
+        # Structured predicates are whole-collection bitsets; AND them together first
+        bits = engine.everything if within is None else within
+        if query.type:
+            bits &= engine.type_contains(query.type)
+        if query.mana:
+            bits &= engine.mana_cost(query.mana, query.mana_mode)
+        for fmt in query.formats:
+            bits &= engine.legal(fmt)
+        if query.mv_value is not None:
+            bits &= engine.mana_value(query.mv_value, query.mv_comparator)
+        if query.colors:
+            bits &= engine.color_identity(sorted(query.colors), query.color_mode)
+        if query.radar_cards is not None:
+            bits &= engine.named(query.radar_cards)
+
+        # Text predicates only verify the cards that are still in play
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if query.name:
+            bits = engine.text_contains("name", query.name, within=bits, cancel_token=cancel_token)
+        if query.text:
+            bits = engine.text_contains(
+                "oracle_text", query.text, within=bits, cancel_token=cancel_token
+            )
+        return bits
 
     # ============= Private Filter Methods =============
 
@@ -314,6 +393,39 @@ class SearchService:
             logger.warning(f"Failed to get card suggestions: {exc}")
             return []
 
+    def complete_card_names(self, partial_name: str, limit: int = 10) -> list[str]:
+        """
+        Complete a partially typed card name.
+
+        Uses a sorted alias index rather than a text search, so it is cheap enough to
+        call on every keystroke. Prefix matches come first (most played first when
+        popularity is known), then matches on a later word, then close misspellings.
+
+        Args:
+            partial_name: Partial card name
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of suggested card names (or aliases such as individual card faces)
+        """
+        completer = self.card_repo.get_name_completer()
+        if completer is None:
+            return []
+        if completer is not self._ranked_completer:
+            completer.set_popularity(self._card_popularity)
+            self._ranked_completer = completer
+        return completer.complete(partial_name, limit=limit)
+
+    def set_card_popularity(self, popularity: Mapping[str, float]) -> None:
+        """
+        Set how often each card is played, used to rank name completions.
+
+        Args:
+            popularity: Play counts (or any positive score) keyed by card name
+        """
+        self._card_popularity = dict(popularity)
+        self._ranked_completer = None
+
     # ============= Deck-Specific Search =============
 
     def find_cards_in_deck(self, deck_text: str, search_term: str) -> list[tuple[str, int]]:
@@ -3,6 +3,10 @@
 This module provides fixtures that are available to all tests in the project.
 """
 
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
 import pytest
 from test_helpers import reset_all_globals
 
@@ -16,3 +20,45 @@ def reset_global_state():
     """
     yield
     reset_all_globals()
+
+
+class _StubImageHandler(BaseHTTPRequestHandler):
+    """Serves ``/img/<name>`` bodies; ``/flaky/<name>`` fails with 503 on its first request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            first_attempt = server.requests.count(self.path) == 1
+        if self.path.startswith("/flaky/") and first_attempt:
+            self._reply(503, b"")
+        elif self.path.startswith(("/img/", "/flaky/")):
+            self._reply(200, f"image:{self.path.rsplit('/', 1)[-1]}".encode() * 512)
+        else:
+            self._reply(404, b"")
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def image_server():
+    """Local HTTP server standing in for the image CDN; yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubImageHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield SimpleNamespace(url=f"http://{host}:{port}", requests=server.requests)
+    server.shutdown()
+    server.server_close()
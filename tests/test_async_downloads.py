@@ -0,0 +1,90 @@
+"""Tests for the asyncio image download engine, run against a local stub server."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from utils.async_downloads import AdaptiveConcurrency, AsyncDownloadEngine, DownloadError
+
+
+def _engine(**kwargs):
+    kwargs.setdefault("retry_backoff", 0.01)
+    kwargs.setdefault("timeout", 5)
+    return AsyncDownloadEngine(**kwargs)
+
+
+def test_streams_every_url_to_disk(tmp_path, image_server):
+    engine = _engine(initial_concurrency=4, max_concurrency=8)
+    names = [f"card-{index}.jpg" for index in range(40)]
+    results = {}
+
+    async def handler(name):
+        return await engine.fetch_to_file(f"{image_server.url}/img/{name}", tmp_path / name)
+
+    engine.run(iter(names), handler, results.__setitem__)
+
+    assert sorted(results) == sorted(names)
+    for name in names:
+        assert (tmp_path / name).read_bytes() == f"image:{name}".encode() * 512
+        assert results[name] == len(f"image:{name}".encode()) * 512
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_retries_transient_errors_and_reports_permanent_ones(tmp_path, image_server):
+    engine = _engine(initial_concurrency=2)
+    results = {}
+
+    async def handler(path):
+        return await engine.fetch_to_file(f"{image_server.url}{path}", tmp_path / "out.jpg")
+
+    engine.run(["/flaky/a.jpg"], handler, results.__setitem__)
+    engine.run(["/missing.jpg"], handler, results.__setitem__)
+
+    assert results["/flaky/a.jpg"] > 0
+    assert image_server.requests.count("/flaky/a.jpg") == 2
+    assert isinstance(results["/missing.jpg"], DownloadError)
+    # 404s are permanent: no retry.
+    assert image_server.requests.count("/missing.jpg") == 1
+
+
+def test_adaptive_concurrency_grows_on_success_and_halves_on_errors():
+    async def scenario():
+        limiter = AdaptiveConcurrency(initial=4, minimum=2, maximum=6)
+        for _ in range(4):
+            await limiter.acquire()
+            await limiter.release(True)
+        grown = limiter.limit
+        await limiter.acquire()
+        await limiter.release(None)
+        unchanged = limiter.limit
+        for _ in range(3):
+            await limiter.acquire()
+            await limiter.release(False)
+        return grown, unchanged, limiter.limit
+
+    assert asyncio.run(scenario()) == (5, 5, 2)
+
+
+def test_limit_bounds_in_flight_transfers():
+    async def scenario():
+        limiter = AdaptiveConcurrency(initial=3, minimum=1, maximum=3)
+        peak = 0
+
+        async def transfer():
+            nonlocal peak
+            async with limiter.slot() as outcome:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.001)
+                outcome[0] = True
+
+        await asyncio.gather(*(transfer() for _ in range(30)))
+        return peak
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_fetch_outside_run_is_rejected(tmp_path):
+    with pytest.raises(RuntimeError):
+        asyncio.run(_engine().fetch_to_file("http://127.0.0.1:9/x", tmp_path / "x"))
@@ -16,10 +16,18 @@ class _StubResponse:
     def __init__(self, *, headers: dict[str, str] | None = None, content: bytes = b""):
         self.headers = headers or {}
         self.content = content
+        self.status_code = 200
 
     def raise_for_status(self) -> None:  # pragma: no cover - stub never errors
         return
 
+    def iter_content(self, chunk_size: int = 1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+    def close(self) -> None:
+        return
+
 
 def _build_bulk_zip(cards: dict[str, list[dict[str, Any]]]) -> bytes:
     buffer = io.BytesIO()
@@ -54,12 +62,12 @@ def _patch_requests(monkeypatch: pytest.MonkeyPatch, headers: dict[str, str], co
 
 def test_ensure_latest_downloads_when_cache_missing(tmp_path: Path, monkeypatch):
     cards = {"Opt": [_card("Opt", "{U}", "Scry 1, draw a card.", "U")]}
+    content = _build_bulk_zip(cards)
     headers = {
         "etag": "v1",
         "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT",
-        "content-length": "123",
+        "content-length": str(len(content)),
     }
-    content = _build_bulk_zip(cards)
     _patch_requests(monkeypatch, headers, content)
 
     manager = CardDataManager(tmp_path)
@@ -69,16 +77,17 @@ def test_ensure_latest_downloads_when_cache_missing(tmp_path: Path, monkeypatch)
     assert meta["etag"] == "v1"
     assert "sha512" in meta
     assert manager.get_card("Opt") is not None
+    assert not list(tmp_path.glob("AtomicCards.json.zip*"))
 
 
 def test_ensure_latest_skips_download_when_meta_matches(tmp_path: Path, monkeypatch):
     cards = {"Opt": [_card("Opt", "{U}", "", "U")]}
+    content = _build_bulk_zip(cards)
     headers = {
         "etag": "v1",
         "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT",
-        "content-length": "123",
+        "content-length": str(len(content)),
     }
-    content = _build_bulk_zip(cards)
     _patch_requests(monkeypatch, headers, content)
 
     first_manager = CardDataManager(tmp_path)
@@ -106,24 +115,24 @@ def test_ensure_latest_skips_download_when_meta_matches(tmp_path: Path, monkeypa
 
 def test_ensure_latest_downloads_when_meta_differs(tmp_path: Path, monkeypatch):
     initial_cards = {"Opt": [_card("Opt", "{U}", "", "U")]}
+    initial_content = _build_bulk_zip(initial_cards)
     initial_headers = {
         "etag": "v1",
         "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT",
-        "content-length": "123",
+        "content-length": str(len(initial_content)),
     }
-    initial_content = _build_bulk_zip(initial_cards)
     _patch_requests(monkeypatch, initial_headers, initial_content)
 
     manager = CardDataManager(tmp_path)
     manager.ensure_latest()
 
     new_cards = {"Lightning Bolt": [_card("Lightning Bolt", "{R}", "3 damage", "R")]}
+    new_content = _build_bulk_zip(new_cards)
     new_headers = {
         "etag": "v2",
         "last-modified": "Tue, 02 Jan 2024 00:00:00 GMT",
-        "content-length": "456",
+        "content-length": str(len(new_content)),
     }
-    new_content = _build_bulk_zip(new_cards)
 
     download_called = False
 
@@ -149,12 +158,12 @@ def test_ensure_latest_downloads_when_meta_differs(tmp_path: Path, monkeypatch):
 
 def test_ensure_latest_skips_download_when_only_etag_changes(tmp_path: Path, monkeypatch):
     cards = {"Opt": [_card("Opt", "{U}", "", "U")]}
+    content = _build_bulk_zip(cards)
     initial_headers = {
         "etag": "v1",
         "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT",
-        "content-length": "123",
+        "content-length": str(len(content)),
     }
-    content = _build_bulk_zip(cards)
     _patch_requests(monkeypatch, initial_headers, content)
 
     first_manager = CardDataManager(tmp_path)
@@ -163,7 +172,7 @@ def test_ensure_latest_skips_download_when_only_etag_changes(tmp_path: Path, mon
     new_headers = {
         "etag": "v2",
         "last-modified": "Tue, 02 Jan 2024 00:00:00 GMT",
-        "content-length": "123",
+        "content-length": str(len(content)),
     }
 
     download_called = False
@@ -184,3 +193,47 @@ def test_ensure_latest_skips_download_when_only_etag_changes(tmp_path: Path, mon
 
     assert download_called is False
     assert second_manager.get_card("Opt") is not None
+
+
+def test_ensure_latest_rejects_truncated_download(tmp_path: Path, monkeypatch):
+    content = _build_bulk_zip({"Opt": [_card("Opt", "{U}", "", "U")]})
+    headers = {"etag": "v1", "content-length": str(len(content) + 10)}
+    _patch_requests(monkeypatch, headers, content)
+
+    with pytest.raises(RuntimeError, match="no cache is available"):
+        CardDataManager(tmp_path).ensure_latest()
+
+    assert not (tmp_path / "AtomicCards.json.zip").exists()
+
+
+def test_refresh_reports_card_changes_and_skips_unchanged_rewrite(tmp_path: Path, monkeypatch):
+    cards = {
+        "Opt": [_card("Opt", "{U}", "Scry 1.", "U")],
+        "Shock": [_card("Shock", "{R}", "2 damage", "R")],
+    }
+    content = _build_bulk_zip(cards)
+    _patch_requests(monkeypatch, {"etag": "v1", "content-length": str(len(content))}, content)
+    manager = CardDataManager(tmp_path)
+    manager.ensure_latest()
+    assert manager.last_refresh is None
+
+    updated = {
+        "Opt": [_card("Opt", "{U}", "Scry 1. Draw a card.", "U")],
+        "Lightning Bolt": [_card("Lightning Bolt", "{R}", "3 damage", "R")],
+    }
+    content = _build_bulk_zip(updated)
+    _patch_requests(monkeypatch, {"etag": "v2", "content-length": str(len(content))}, content)
+    manager = CardDataManager(tmp_path)
+    manager.ensure_latest()
+
+    delta = manager.last_refresh
+    assert (delta.added, delta.removed, delta.changed) == (["Lightning Bolt"], ["Shock"], ["Opt"])
+    assert [card["name"] for card in manager.search_cards("damage")] == ["Lightning Bolt"]
+    assert [card["name"] for card in manager.search_cards("draw a card")] == ["Opt"]
+
+    index_mtime = (tmp_path / "atomic_cards_index.bin").stat().st_mtime_ns
+    manager = CardDataManager(tmp_path)
+    manager.ensure_latest(force=True)
+
+    assert not manager.last_refresh
+    assert (tmp_path / "atomic_cards_index.bin").stat().st_mtime_ns == index_mtime
@@ -0,0 +1,188 @@
+"""Tests for the bitmask card filter engine and the builder search built on it."""
+
+from __future__ import annotations
+
+import pytest
+from test_helpers import load_cards
+
+from services.search_service import SearchService
+from utils.card_data import CardDataManager
+from utils.card_filter_engine import bits_to_positions, positions_to_bits
+
+
+def _card(name, mana_cost, mana_value, type_line, oracle, identity, legalities):
+    return {
+        "name": name,
+        "name_lower": name.lower(),
+        "mana_cost": mana_cost,
+        "mana_value": mana_value,
+        "type_line": type_line,
+        "oracle_text": oracle,
+        "power": None,
+        "toughness": None,
+        "loyalty": None,
+        "colors": identity,
+        "color_identity": identity,
+        "legalities": legalities,
+        "aliases": [name],
+    }
+
+
+CARDS = [
+    _card(
+        "Counterspell",
+        "{U}{U}",
+        2,
+        "Instant",
+        "Counter target spell.",
+        ["U"],
+        {"legacy": "Legal", "pauper": "Legal"},
+    ),
+    _card(
+        "Llanowar Elves",
+        "{G}",
+        1,
+        "Creature — Elf Druid",
+        "{T}: Add {G}.",
+        ["G"],
+        {"modern": "Legal", "legacy": "Legal"},
+    ),
+    _card(
+        "Tarmogoyf",
+        "{1}{G}",
+        2,
+        "Creature — Lhurgoyf",
+        "Tarmogoyf's power is equal to the number of card types among cards in all graveyards.",
+        ["G"],
+        {"modern": "Legal", "legacy": "Legal"},
+    ),
+    _card(
+        "Uro, Titan of Nature's Wrath",
+        "{1}{G}{U}",
+        3,
+        "Legendary Creature — Elder Giant",
+        "When Uro enters, sacrifice it unless it escaped. Draw a card.",
+        ["G", "U"],
+        {"legacy": "Legal", "modern": "Banned"},
+    ),
+    _card(
+        "Mishra's Bauble",
+        "{0}",
+        0,
+        "Artifact",
+        "Look at the top card of target player's library. Draw a card.",
+        [],
+        {"modern": "Legal", "legacy": "Legal"},
+    ),
+    _card("Forest", None, 0, "Basic Land — Forest", "({T}: Add {G}.)", ["G"], {"modern": "Legal"}),
+]
+
+
+@pytest.fixture()
+def manager(tmp_path):
+    card_manager = CardDataManager(tmp_path)
+    load_cards(card_manager, CARDS)
+    return card_manager
+
+
+def _search(manager, **filters):
+    service = SearchService(card_repository=object())
+    return [card["name"] for card in service.search_with_builder_filters(filters, manager)]
+
+
+def test_bitset_round_trip():
+    positions = [0, 3, 8, 9, 15, 64, 1000]
+    bits = positions_to_bits(positions, 1001)
+
+    assert bits_to_positions(bits) == positions
+    assert bits_to_positions(bits, limit=3) == [0, 3, 8]
+    assert bits_to_positions(0) == []
+
+
+def test_engine_predicates(manager):
+    engine = manager.filter_engine()
+
+    assert engine.positions(engine.legal("pauper")) == [0]
+    assert engine.positions(engine.legal("vintage")) == []
+    assert engine.positions(engine.color_identity(["U"], "At least")) == [0, 3]
+    assert engine.positions(engine.color_identity(["G"], "Exactly")) == [1, 2, 5]
+    assert engine.positions(engine.color_identity(["C"], "Exactly")) == [4]
+    assert engine.positions(engine.mana_value(2, "≥")) == [0, 2, 3]
+    assert engine.positions(engine.mana_cost("{G}", "contains")) == [1, 2, 3]
+    assert engine.positions(engine.mana_cost("{G}", "exact")) == [1]
+    assert engine.positions(engine.type_contains("CREATURE")) == [1, 2, 3]
+    assert engine.positions(engine.named({"Forest", "forest", "Missing"})) == [5]
+    assert engine.positions(engine.text_contains("oracle_text", "draw a card")) == [3, 4]
+    assert engine.positions(engine.text_contains("name", "o", within=engine.legal("modern"))) == [
+        1,
+        2,
+        5,
+    ]
+
+
+def test_builder_search_combines_filters(manager):
+    assert _search(manager, formats=["modern"], type="creature") == [
+        "Llanowar Elves",
+        "Tarmogoyf",
+    ]
+    assert _search(manager, text="draw a card", mv_value="1", mv_comparator=">") == [
+        "Uro, Titan of Nature's Wrath"
+    ]
+    assert _search(manager, mana="1G", mana_exact=True, formats=["legacy"]) == ["Tarmogoyf"]
+    assert _search(manager, selected_colors=["G"], color_mode="Not these") == [
+        "Counterspell",
+        "Mishra's Bauble",
+    ]
+    assert _search(
+        manager, name="a", radar_enabled=True, radar_cards={"Tarmogoyf", "Forest", "Opt"}
+    ) == ["Tarmogoyf"]
+    assert _search(manager, mv_value="oops", mv_comparator="=") == [card["name"] for card in CARDS]
+
+
+def test_builder_search_respects_limit(manager):
+    service = SearchService(card_repository=object())
+
+    results = service.search_with_builder_filters({"formats": ["legacy"]}, manager, limit=2)
+
+    assert [card["name"] for card in results] == ["Counterspell", "Llanowar Elves"]
+
+
+def test_builder_query_refinement(manager, monkeypatch):
+    service = SearchService(card_repository=object())
+    engine = manager.filter_engine()
+    checked_within = []
+    original = engine.text_contains
+
+    def recording_text_contains(field, needle, within=None, cancel_token=None):
+        checked_within.append(engine.positions(within))
+        return original(field, needle, within=within, cancel_token=cancel_token)
+
+    monkeypatch.setattr(engine, "text_contains", recording_text_contains)
+
+    assert [c["name"] for c in service.search_with_builder_filters({"name": "o"}, manager)] == [
+        "Counterspell",
+        "Llanowar Elves",
+        "Tarmogoyf",
+        "Uro, Titan of Nature's Wrath",
+        "Forest",
+    ]
+    narrowed = service.search_with_builder_filters({"name": "oy", "formats": ["modern"]}, manager)
+
+    assert [card["name"] for card in narrowed] == ["Tarmogoyf"]
+    # The narrower query only re-checked the cached "o" matches that are modern legal.
+    assert checked_within[-1] == [1, 2, 5]
+
+    # A repeated query is served from the cache without touching the engine.
+    calls = len(checked_within)
+    service.search_with_builder_filters({"name": "oy", "formats": ["modern"]}, manager)
+    assert len(checked_within) == calls
+
+
+def test_refinement_cache_is_dropped_on_reload(manager):
+    service = SearchService(card_repository=object())
+    assert len(service.search_with_builder_filters({"type": "creature"}, manager)) == 3
+
+    load_cards(manager, CARDS[:2])
+
+    results = service.search_with_builder_filters({"type": "creature"}, manager)
+    assert [card["name"] for card in results] == ["Llanowar Elves"]
@@ -12,11 +12,11 @@ def test_ensure_printing_index_cache_includes_face_aliases(tmp_path, monkeypatch
     cache_dir = tmp_path / "card_images"
     cache_dir.mkdir(parents=True, exist_ok=True)
     bulk_path = cache_dir / "bulk_data.json"
-    printings_path = cache_dir / "printings.json"
+    printings_path = cache_dir / "printings.bin"
     payload = [
         {
             "name": "Delver of Secrets // Insectile Aberration",
-            "id": "uuid-delver",
+            "id": "7fc3a5a4-2a34-4e3a-9d7c-0f4c4c2b1a11",
             "set": "isd",
             "set_name": "Innistrad",
             "collector_number": "51",
@@ -32,16 +32,18 @@ def test_ensure_printing_index_cache_includes_face_aliases(tmp_path, monkeypatch
     monkeypatch.setattr(card_images, "IMAGE_CACHE_DIR", cache_dir, raising=False)
     monkeypatch.setattr(card_images, "BULK_DATA_CACHE", bulk_path, raising=False)
     monkeypatch.setattr(card_images, "PRINTING_INDEX_CACHE", printings_path, raising=False)
+    monkeypatch.setattr(card_images, "_printing_index", None)
 
-    data = card_images.ensure_printing_index_cache(force=True)["data"]
+    data = card_images.ensure_printing_index_cache(force=True)
 
     canonical_key = "delver of secrets // insectile aberration"
     assert canonical_key in data
     assert "delver of secrets" in data
     assert "insectile aberration" in data
     # Face aliases should reuse the same printings entries
-    assert data["delver of secrets"] == data[canonical_key]
-    assert data["insectile aberration"] == data[canonical_key]
+    assert data.get("delver of secrets") == data.get(canonical_key)
+    assert data.get("insectile aberration") == data.get(canonical_key)
+    data.close()
 
 
 def test_card_image_cache_resolves_double_faced_alias(tmp_path):
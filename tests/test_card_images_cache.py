@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import json
 import sqlite3
+import threading
 from datetime import datetime
 
+import pytest
+
 from utils import card_images
+from utils.sqlite_pool import BatchedWriter, SQLiteConnectionPool
 
 
 def test_card_image_cache_migrates_face_index_column(tmp_path):
@@ -132,3 +137,230 @@ def test_is_bulk_data_outdated_respects_cached_metadata(tmp_path, monkeypatch):
 
     assert is_outdated is False
     assert returned_metadata["download_uri"] == metadata["download_uri"]
+
+
+def test_bulk_download_batches_image_rows(tmp_path, monkeypatch, image_server):
+    """Rows queued during a bulk download are committed once the download finishes."""
+    cache_dir = tmp_path / "card_images"
+    bulk_path = cache_dir / "bulk_data.json"
+    bulk_path.parent.mkdir(parents=True, exist_ok=True)
+    cards = [
+        {
+            "id": f"uuid-{index}",
+            "name": f"Card {index}",
+            "set": "tst",
+            "collector_number": str(index),
+            "image_uris": {"normal": f"{image_server.url}/img/{index}.jpg"},
+        }
+        for index in range(25)
+    ]
+    cards.append(
+        {
+            "id": "uuid-dfc",
+            "name": "Delver of Secrets // Insectile Aberration",
+            "card_faces": [
+                {
+                    "name": "Delver of Secrets",
+                    "image_uris": {"normal": f"{image_server.url}/img/front.jpg"},
+                },
+                {
+                    "name": "Insectile Aberration",
+                    "image_uris": {"normal": f"{image_server.url}/img/back.jpg"},
+                },
+            ],
+        }
+    )
+    bulk_path.write_text(json.dumps(cards), encoding="utf-8")
+    monkeypatch.setattr(card_images, "BULK_DATA_CACHE", bulk_path, raising=False)
+
+    cache = card_images.CardImageCache(cache_dir=cache_dir, db_path=cache_dir / "images.db")
+    downloader = card_images.BulkImageDownloader(cache, max_workers=4)
+
+    stats = downloader.download_all_images()
+
+    assert stats["downloaded"] == 26
+    assert cache.get_image_path("card 7") == cache.cache_dir / "normal" / "uuid-7.jpg"
+    assert cache.get_image_path("Insectile Aberration").read_bytes().startswith(b"image:back")
+    with sqlite3.connect(cache.db_path) as conn:
+        # 25 single-faced cards, two faces and the combined double-faced name.
+        assert conn.execute("SELECT COUNT(*) FROM card_images").fetchone()[0] == 28
+
+    requests_after_first_sync = len(image_server.requests)
+    again = downloader.download_all_images()
+    assert again["skipped"] == 26
+    assert len(image_server.requests) == requests_after_first_sync
+    cache.close()
+
+
+def test_image_sync_plan_schedules_only_missing_faces(tmp_path, monkeypatch, image_server):
+    cache_dir = tmp_path / "card_images"
+    bulk_path = cache_dir / "bulk_data.json"
+    bulk_path.parent.mkdir(parents=True, exist_ok=True)
+    cards = [
+        {"id": "uuid-a", "name": "A", "image_uris": {"normal": f"{image_server.url}/img/a.jpg"}},
+        {
+            "id": "uuid-b",
+            "name": "B // C",
+            "card_faces": [
+                {"name": "B", "image_uris": {"normal": f"{image_server.url}/img/b.jpg"}},
+                {"name": "C", "image_uris": {"normal": f"{image_server.url}/img/c.jpg"}},
+            ],
+        },
+    ]
+    bulk_path.write_text(json.dumps(cards), encoding="utf-8")
+    monkeypatch.setattr(card_images, "BULK_DATA_CACHE", bulk_path, raising=False)
+    cache = card_images.CardImageCache(cache_dir=cache_dir, db_path=cache_dir / "images.db")
+    downloader = card_images.BulkImageDownloader(cache)
+
+    plan = downloader.download_all_images(dry_run=True)
+    assert plan == {
+        "success": True,
+        "dry_run": True,
+        "total": 2,
+        "cached": 0,
+        "to_download": 2,
+        "missing_faces": 3,
+    }
+    assert image_server.requests == []
+
+    downloader.download_all_images()
+    normal_dir = cache.cache_dir / "normal"
+    assert cache.cached_faces("normal") == {
+        ("uuid-a", 0): normal_dir / "uuid-a.jpg",
+        ("uuid-b", 0): normal_dir / "uuid-b.jpg",
+        ("uuid-b", 1): normal_dir / "uuid-b-f1.jpg",
+    }
+
+    # A face whose file disappeared is planned and fetched again, alone.
+    (normal_dir / "uuid-b-f1.jpg").unlink()
+    assert downloader.plan_image_sync()["missing_faces"] == 1
+    image_server.requests.clear()
+
+    def no_lookup(*_args, **_kwargs):
+        raise AssertionError("cached faces must not be looked up one by one")
+
+    monkeypatch.setattr(cache, "get_image_by_uuid", no_lookup)
+    downloader.download_all_images()
+    assert image_server.requests == ["/img/c.jpg"]
+    assert downloader.plan_image_sync()["cached"] == 2
+    cache.close()
+
+
+def test_batched_writer_flushes_rows_from_many_threads(tmp_path):
+    pool = SQLiteConnectionPool(tmp_path / "rows.db")
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE rows (thread INTEGER, value INTEGER)")
+    writer = BatchedWriter(pool, "INSERT INTO rows VALUES (?, ?)", batch_size=50)
+
+    def produce(thread_id):
+        writer.submit_many((thread_id, value) for value in range(100))
+        # Each thread reuses one connection for its reads.
+        assert pool.connection() is pool.connection()
+
+    threads = [threading.Thread(target=produce, args=(thread_id,)) for thread_id in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writer.flush(timeout=5)
+    assert pool.connection().execute("SELECT COUNT(*) FROM rows").fetchone()[0] == 400
+    assert pool.connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    writer.close()
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.connection()
+    with pytest.raises(RuntimeError):
+        writer.submit((0, 0))
+
+
+def test_name_lookups_use_indexed_keys_after_migration(tmp_path):
+    """Databases without name keys are backfilled, including double-faced aliases."""
+    cache_dir = tmp_path / "cache"
+    db_path = cache_dir / "images.db"
+    front_path = cache_dir / "normal" / "uuid-fable.jpg"
+    front_path.parent.mkdir(parents=True, exist_ok=True)
+    front_path.write_bytes(b"front")
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE card_images (
+                uuid TEXT NOT NULL,
+                face_index INTEGER NOT NULL DEFAULT 0,
+                name TEXT NOT NULL,
+                set_code TEXT,
+                collector_number TEXT,
+                image_size TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                downloaded_at TEXT NOT NULL,
+                scryfall_uri TEXT,
+                artist TEXT,
+                PRIMARY KEY (uuid, face_index, image_size)
+            )
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO card_images (
+                uuid, face_index, name, set_code, collector_number, image_size, file_path,
+                downloaded_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                "uuid-fable",
+                -1,
+                "Fable of the Mirror-Breaker // Reflection of Kiki-Jiki",
+                "NEO",
+                "141",
+                "normal",
+                str(front_path),
+                datetime.now(card_images.UTC).isoformat(),
+            ),
+        )
+        conn.commit()
+
+    cache = card_images.CardImageCache(cache_dir=cache_dir, db_path=db_path)
+
+    assert cache.get_image_path("fable of the mirror-breaker // reflection of kiki-jiki") == (
+        front_path.resolve()
+    )
+    assert cache.get_image_path("Reflection of Kiki-Jiki") == front_path.resolve()
+    assert cache.get_image_path("Reflection of Kiki-Jiki", size="small") is None
+    assert cache.get_image_path("Kiki-Jiki") is None
+
+    conn = cache.connection()
+    name_plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT file_path FROM card_images WHERE name_key = ? AND image_size = ?",
+        ("x", "normal"),
+    ).fetchall()
+    alias_plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT uuid FROM card_image_aliases WHERE alias_key = ?", ("x",)
+    ).fetchall()
+    assert "idx_card_name_key" in str(name_plan)
+    assert "PRIMARY KEY" in str(alias_plan)
+    cache.close()
+
+
+def test_renamed_image_replaces_face_aliases(tmp_path):
+    cache = card_images.CardImageCache(cache_dir=tmp_path, db_path=tmp_path / "images.db")
+    image_path = cache.cache_dir / "normal" / "uuid-split.jpg"
+    image_path.write_bytes(b"split")
+    for name in ("Fire // Ice", "Fire // Ice // Extra"):
+        cache.add_image(
+            uuid="uuid-split",
+            name=name,
+            set_code="MH2",
+            collector_number="290",
+            image_size="normal",
+            file_path=image_path,
+        )
+
+    aliases = cache.connection().execute(
+        "SELECT alias_key, position FROM card_image_aliases ORDER BY position"
+    )
+    assert aliases.fetchall() == [("fire", 0), ("ice", 1), ("extra", 2)]
+    assert cache.get_image_path("ICE") == image_path
+    cache.close()
@@ -0,0 +1,247 @@
+"""Tests for the memory-mapped binary card index."""
+
+from __future__ import annotations
+
+import json
+from array import array
+from pathlib import Path
+
+import pytest
+
+from utils import binary_index, card_data
+from utils.binary_index import (
+    IndexFormatError,
+    MappedHashTable,
+    MappedIndexFile,
+    MappedStrings,
+    build_hash_table,
+    pack_strings,
+    write_index_file,
+)
+from utils.card_data import CardDataManager
+from utils.card_index_file import (
+    CARD_INDEX_MAGIC,
+    CARD_INDEX_VERSION,
+    is_current_card_index,
+    open_card_index,
+    write_card_index,
+)
+from utils.card_search_index import CardSearchIndex
+from utils.card_store import CardStore
+
+
+def _card(name: str, type_line: str, oracle: str, **overrides):
+    card = {
+        "name": name,
+        "name_lower": name.lower(),
+        "mana_cost": "{U}",
+        "mana_value": 1.0,
+        "type_line": type_line,
+        "oracle_text": oracle,
+        "power": None,
+        "toughness": None,
+        "loyalty": None,
+        "colors": ["U"],
+        "color_identity": ["U"],
+        "legalities": {"modern": "Legal"},
+        "aliases": [name],
+    }
+    card.update(overrides)
+    return card
+
+
+CARDS = [
+    _card("Brainstorm", "Instant", "Draw three cards, then put two cards back."),
+    _card(
+        "Delver of Secrets // Insectile Aberration",
+        "Creature — Human Wizard",
+        "Look at the top card of your library.",
+        aliases=[
+            "Delver of Secrets",
+            "Delver of Secrets // Insectile Aberration",
+            "Insectile Aberration",
+        ],
+        legalities={"legacy": "Legal", "modern": "Banned"},
+    ),
+    _card("Ponder", "Sorcery", "Look at the top three cards — then draw a card.", mana_value=None),
+]
+
+
+def test_mapped_strings_and_hash_table_round_trip(tmp_path: Path):
+    keys = ["opt", "ponder", "", "jace, vryn's prodigy", "æther vial"]
+    offsets, blob = pack_strings(keys)
+    path = tmp_path / "strings.bin"
+    write_index_file(
+        path,
+        b"TESTIDX",
+        3,
+        {
+            "keys.offsets": offsets,
+            "keys.blob": blob,
+            "keys.table": build_hash_table(keys, range(10, 15)),
+        },
+        {"note": "meta"},
+    )
+
+    mapped = MappedIndexFile(path, b"TESTIDX", 3)
+    strings = MappedStrings(mapped, "keys")
+    table = MappedHashTable(mapped.section("keys.table"), strings)
+
+    assert mapped.meta == {"note": "meta"}
+    assert list(strings) == keys
+    assert [table.get(key) for key in keys] == [10, 11, 12, 13, 14]
+    assert table.get("missing") is None
+    assert strings.positions_containing("er") == [1, 4]
+    assert strings.positions_containing("o", candidates=[0, 1, 2]) == [0, 1]
+
+
+def test_mapped_index_rejects_other_versions(tmp_path: Path):
+    path = tmp_path / "cards.bin"
+    write_index_file(path, CARD_INDEX_MAGIC, 999, {})
+
+    with pytest.raises(IndexFormatError):
+        open_card_index(path)
+    assert is_current_card_index(path) is False
+    assert is_current_card_index(tmp_path / "missing.bin") is False
+
+
+def test_card_index_round_trip(tmp_path: Path):
+    store = CardStore.from_cards(CARDS)
+    search_index = CardSearchIndex.from_haystacks(store.haystacks())
+    path = tmp_path / "atomic_cards_index.bin"
+    write_card_index(path, store, search_index)
+
+    mapped_store, mapped_index = open_card_index(path)
+
+    assert len(mapped_store) == len(CARDS)
+    for position, card in enumerate(CARDS):
+        assert mapped_store[position] == card
+    assert mapped_store.get("insectile aberration")["name"] == CARDS[1]["name"]
+    assert mapped_store.get("Missing") is None
+    assert mapped_store.available_formats() == ["legacy", "modern"]
+    for query in ("", "dr", "draw", "top card", "wizard", "zzz"):
+        assert mapped_index.search(query) == search_index.search(query)
+    assert mapped_index.search("the", candidates=[0, 2]) == [0, 2]
+    mapped_store.close()
+
+
+def test_index_without_optional_digests_is_still_current(tmp_path: Path):
+    store = CardStore.from_cards(CARDS)
+    search_index = CardSearchIndex.from_haystacks(store.haystacks())
+    sections, meta = store.to_sections()
+    del sections["digests"]
+    sections.update(search_index.to_sections())
+    path = tmp_path / "atomic_cards_index.bin"
+    write_index_file(path, CARD_INDEX_MAGIC, CARD_INDEX_VERSION, sections, meta)
+
+    assert is_current_card_index(path)
+    mapped_store, _mapped_index = open_card_index(path)
+    assert mapped_store[0] == CARDS[0]
+    assert store.diff(mapped_store) is None  # readable, just not diffable
+    mapped_store.close()
+
+
+def test_closing_the_store_unmaps_the_card_index(tmp_path: Path):
+    store = CardStore.from_cards(CARDS)
+    path = tmp_path / "atomic_cards_index.bin"
+    write_card_index(path, store, CardSearchIndex.from_haystacks(store.haystacks()))
+    mapped_store, mapped_index = open_card_index(path)
+    mapping = mapped_store._mapped
+    assert mapped_store[0]["name"] == "Brainstorm"
+
+    mapped_index.close()
+    mapped_store.close()
+
+    assert mapping.closed and mapping._mmap.closed
+    assert len(mapped_store) == 0 and mapped_store.get("Brainstorm") is None
+    assert mapped_index.search("draw") == []
+    # Nothing maps the file any more, so it can be replaced (required on Windows).
+    write_card_index(path, store, CardSearchIndex.from_haystacks(store.haystacks()))
+
+
+def test_mapped_index_refuses_to_close_under_live_slices(tmp_path: Path):
+    path = tmp_path / "numbers.bin"
+    write_index_file(path, b"TESTIDX", 1, {"numbers": array("I", range(8))})
+    mapped = MappedIndexFile(path, b"TESTIDX", 1)
+    numbers = mapped.section("numbers")
+    head = numbers[:2]
+
+    with pytest.raises(BufferError):
+        mapped.close()
+    with pytest.raises(ValueError):
+        numbers[0]
+    head.release()
+    mapped._mmap.close()
+
+
+def test_patched_search_index_matches_full_rebuild(tmp_path: Path):
+    path = tmp_path / "atomic_cards_index.bin"
+    store = CardStore.from_cards(CARDS)
+    write_card_index(path, store, CardSearchIndex.from_haystacks(store.haystacks()))
+    previous_store, previous_index = open_card_index(path)
+    updated_cards = [
+        CARDS[0],
+        _card("Counterspell", "Instant", "Counter target spell."),
+        {**CARDS[1], "oracle_text": "Flying. Scry 1."},
+    ]
+    updated = CardStore.from_cards(updated_cards)
+
+    delta = updated.diff(previous_store)
+    patched = CardSearchIndex.patched(previous_index, updated.haystacks(), delta.carried)
+    rebuilt = CardSearchIndex.from_haystacks(updated.haystacks())
+
+    assert delta.added == ["Counterspell"]
+    assert delta.removed == [CARDS[2]["name"]]
+    assert delta.changed == [CARDS[1]["name"]]
+    assert patched.gram_count == rebuilt.gram_count
+    for query in ("", "counter", "scry", "draw", "top card", "wizard", "zzz"):
+        assert patched.search(query) == rebuilt.search(query), query
+    previous_store.close()
+
+
+def test_manager_migrates_legacy_json_index(tmp_path: Path):
+    legacy = tmp_path / "atomic_cards_index.json"
+    legacy.write_text(json.dumps({"cards": CARDS, "cards_by_name": {}}), encoding="utf-8")
+
+    manager = CardDataManager(tmp_path)
+    manager._migrate_legacy_index()
+    manager._load_index()
+
+    assert not legacy.exists()
+    assert is_current_card_index(manager.index_path)
+    assert manager.get_card("Delver of Secrets")["name"] == CARDS[1]["name"]
+    assert [card["name"] for card in manager.search_cards("draw", format_filter="modern")] == [
+        "Brainstorm",
+        "Ponder",
+    ]
+
+
+def test_refresh_unmaps_the_index_before_replacing_it(tmp_path: Path, monkeypatch):
+    manager = CardDataManager(tmp_path)
+    manager._write_index(CARDS)
+    manager._load_index()
+    assert manager.get_card("Ponder") is not None
+    mappings = [manager._cards._mapped]
+
+    def tracking_open(path):
+        store, search_index = open_card_index(path)
+        mappings.append(store._mapped)
+        return store, search_index
+
+    def checked_replace(source, destination):
+        # Windows refuses to replace a file that is still mapped.
+        assert all(mapping._mmap.closed for mapping in mappings)
+        real_replace(source, destination)
+
+    real_replace = binary_index.os.replace
+    monkeypatch.setattr(card_data, "open_card_index", tracking_open)
+    monkeypatch.setattr(binary_index.os, "replace", checked_replace)
+    changed = [*CARDS[:2], {**CARDS[2], "oracle_text": "Scry 3, then draw a card."}]
+
+    delta = manager._write_index(changed)
+    manager._load_index()
+
+    assert delta.changed == ["Ponder"]
+    assert len(mappings) == 3 and all(mapping.closed for mapping in mappings[:2])
+    assert manager.get_card("Ponder")["oracle_text"] == "Scry 3, then draw a card."
+    assert [card["name"] for card in manager.search_cards("scry 3")] == ["Ponder"]
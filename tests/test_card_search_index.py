@@ -0,0 +1,106 @@
+"""Tests for the trigram card search index."""
+
+from __future__ import annotations
+
+from test_helpers import load_cards
+
+from utils.card_data import CardDataManager
+from utils.card_search_index import CardSearchIndex
+
+
+def _cards():
+    return [
+        {
+            "name": "Lightning Bolt",
+            "type_line": "Instant",
+            "oracle_text": "Lightning Bolt deals 3 damage to any target.",
+        },
+        {
+            "name": "Lightning Helix",
+            "type_line": "Instant",
+            "oracle_text": "Lightning Helix deals 3 damage to any target and you gain 3 life.",
+        },
+        {
+            "name": "Opt",
+            "type_line": "Instant",
+            "oracle_text": "Scry 1.\nDraw a card.",
+        },
+        {
+            "name": "Tarmogoyf",
+            "type_line": "Creature — Lhurgoyf",
+            "oracle_text": None,
+        },
+    ]
+
+
+def _scan(cards, query):
+    query = query.strip().lower()
+    return [
+        idx
+        for idx, card in enumerate(cards)
+        if any(
+            query in (card.get(field) or "").lower()
+            for field in ("name", "type_line", "oracle_text")
+        )
+    ]
+
+
+def test_search_matches_linear_scan():
+    cards = _cards()
+    index = CardSearchIndex.from_cards(cards)
+
+    for query in ("bolt", "LIGHT", "gain 3", "draw a card", "lhurgoyf", "in", "t", "missing"):
+        assert index.search(query) == _scan(cards, query), query
+
+
+def test_search_empty_query_returns_everything():
+    index = CardSearchIndex.from_cards(_cards())
+
+    assert index.search("") == [0, 1, 2, 3]
+
+
+def test_search_does_not_match_across_fields():
+    index = CardSearchIndex.from_cards(_cards())
+
+    # "optinstant" would only exist if name and type line were concatenated.
+    assert index.search("optinstant") == []
+    assert index.search("goyfcreature") == []
+
+
+def test_search_restricted_to_candidates():
+    index = CardSearchIndex.from_cards(_cards())
+
+    assert index.search("lightning", candidates=[1, 2]) == [1]
+
+
+def test_card_data_manager_search_uses_index(tmp_path):
+    manager = CardDataManager(tmp_path)
+    cards = []
+    for card in _cards():
+        card = dict(card, name_lower=card["name"].lower(), color_identity=[], legalities={})
+        cards.append(card)
+    cards[0]["legalities"] = {"modern": "Legal"}
+    cards[0]["color_identity"] = ["R"]
+    load_cards(manager, cards)
+
+    assert [c["name"] for c in manager.search_cards("lightning")] == [
+        "Lightning Bolt",
+        "Lightning Helix",
+    ]
+    assert [c["name"] for c in manager.search_cards("lightning", format_filter="modern")] == [
+        "Lightning Bolt"
+    ]
+    assert [c["name"] for c in manager.search_cards("", type_filter="creature")] == ["Tarmogoyf"]
+    assert [c["name"] for c in manager.search_cards("3 damage", color_identity=["r"])] == [
+        "Lightning Bolt"
+    ]
+    assert len(manager.search_cards("instant", limit=2)) == 2
+
+    results = manager.search_cards("lightning")
+    load_cards(manager, cards[:1])
+    assert type(results) is list
+    assert [c["name"] for c in results + results[:1]] == [
+        "Lightning Bolt",
+        "Lightning Helix",
+        "Lightning Bolt",
+    ]
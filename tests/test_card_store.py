@@ -0,0 +1,150 @@
+"""Tests for the columnar CardStore."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from utils import card_store
+from utils.card_store import CardRecordList, CardStore, color_mask, mask_colors
+
+
+def _card(name: str, **overrides):
+    card = {
+        "name": name,
+        "name_lower": name.lower(),
+        "mana_cost": "{1}{U}",
+        "mana_value": 2.0,
+        "type_line": "Instant",
+        "oracle_text": "Draw a card.",
+        "power": None,
+        "toughness": None,
+        "loyalty": None,
+        "colors": ["U"],
+        "color_identity": ["U"],
+        "legalities": {"modern": "Legal", "legacy": "Banned"},
+        "aliases": [name],
+    }
+    card.update(overrides)
+    return card
+
+
+def test_color_mask_round_trip():
+    assert color_mask(["G", "w"]) == 0b10001
+    assert mask_colors(color_mask(["G", "W", "U"])) == ["W", "U", "G"]
+    assert color_mask([]) == 0
+
+
+def test_store_materializes_original_records():
+    cards = [
+        _card("Brainstorm"),
+        _card(
+            "Fable of the Mirror-Breaker // Reflection of Kiki-Jiki",
+            mana_cost="{2}{R}",
+            mana_value=3.0,
+            type_line="Enchantment — Saga",
+            colors=["R"],
+            color_identity=["R"],
+            legalities={"modern": "Legal"},
+            aliases=[
+                "Fable of the Mirror-Breaker",
+                "Fable of the Mirror-Breaker // Reflection of Kiki-Jiki",
+                "Reflection of Kiki-Jiki",
+            ],
+        ),
+        _card("Tarmogoyf", mana_value=None, power="*", toughness="1+*", colors=[], legalities={}),
+    ]
+    store = CardStore.from_cards(cards)
+
+    assert len(store) == 3
+    for position, card in enumerate(cards):
+        assert store[position] == card
+    assert store.mana_value(2) is None
+
+
+def test_store_lookup_by_alias_is_case_insensitive():
+    store = CardStore.from_cards(
+        [
+            _card("Brainstorm"),
+            _card("Delver of Secrets // Insectile Aberration", aliases=["Delver of Secrets"]),
+        ]
+    )
+
+    assert store.position_of("BRAINSTORM") == 0
+    assert store.get("delver of secrets")["name"] == "Delver of Secrets // Insectile Aberration"
+    assert store.get("Missing Card") is None
+
+
+def test_store_legalities_and_formats():
+    store = CardStore.from_cards(
+        [
+            _card("Brainstorm", legalities={"legacy": "Legal", "modern": "Not Legal"}),
+            _card("Ponder", legalities={"pauper": "Legal", "vintage": "Restricted"}),
+        ]
+    )
+
+    assert store.is_legal(0, "legacy") is True
+    assert store.is_legal(0, "modern") is False
+    assert store.legality(1, "vintage") == "Restricted"
+    assert store.legality(1, "legacy") is None
+    assert store.available_formats() == ["legacy", "pauper"]
+
+
+def test_records_are_lazy_sequences():
+    store = CardStore.from_cards([_card("Brainstorm"), _card("Ponder"), _card("Preordain")])
+
+    records = store.records([2, 0])
+
+    assert isinstance(records, CardRecordList)
+    assert len(records) == 2
+    assert [card["name"] for card in records] == ["Preordain", "Brainstorm"]
+    assert [card["name"] for card in records[1:]] == ["Brainstorm"]
+    assert records[0] is store[2]
+    with pytest.raises(IndexError):
+        store[3]
+
+
+def test_materialized_records_are_shared_across_threads(monkeypatch):
+    monkeypatch.setattr(card_store, "MATERIALIZED_CACHE_SIZE", 4)
+    store = CardStore.from_cards([_card(f"Card {i}") for i in range(64)])
+    errors: list[BaseException] = []
+
+    def read(offset: int) -> None:
+        try:
+            for round_ in range(200):
+                position = (offset + round_) % len(store)
+                assert store[position]["name"] == f"Card {position}"
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=read, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(store._materialized) <= 4
+
+
+def test_diff_reports_added_removed_and_changed_cards():
+    previous = CardStore.from_cards([_card("Brainstorm"), _card("Opt"), _card("Ponder")])
+    updated = CardStore.from_cards(
+        [
+            _card("Brainstorm"),
+            _card("Consider"),
+            _card("Opt", legalities={"modern": "Banned"}),
+        ]
+    )
+
+    delta = updated.diff(previous)
+
+    assert delta.added == ["Consider"]
+    assert delta.removed == ["Ponder"]
+    assert delta.changed == ["Opt"]
+    assert list(delta.carried) == [0, -1, -1]
+    assert delta.summary() == "1 added, 1 removed, 1 changed"
+    assert not previous.diff(
+        CardStore.from_cards([_card("Brainstorm"), _card("Opt"), _card("Ponder")])
+    )
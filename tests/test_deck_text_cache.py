@@ -0,0 +1,144 @@
+"""Tests for the SQLite deck text cache."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from utils import deck_text_cache
+from utils.deck_text_cache import DeckTextCache, archetype_key
+
+
+def test_get_many_reads_chunks_and_filters_by_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(deck_text_cache, "IN_QUERY_CHUNK_SIZE", 2)
+    cache = DeckTextCache(tmp_path / "decks.db")
+    for number in range(5):
+        cache.set(str(number), f"deck {number}", source="mtgo" if number == 4 else "mtggoldfish")
+
+    found = cache.get_many(["0", "1", "2", "3", "4", "missing", "1"])
+    assert found == {str(n): f"deck {n}" for n in range(5)}
+    assert cache.get_many(["3", "4"], source="mtgo") == {"4": "deck 4"}
+    assert cache.get_many([]) == {}
+
+    cache.flush()
+    with sqlite3.connect(tmp_path / "decks.db") as conn:
+        counts = dict(conn.execute("SELECT deck_number, access_count FROM deck_cache"))
+    assert counts == {"0": 1, "1": 1, "2": 1, "3": 1, "4": 2}
+    cache.close()
+
+
+def test_reads_queue_access_stats_and_set_many_keeps_counts(tmp_path):
+    cache = DeckTextCache(tmp_path / "decks.db")
+    assert cache.set_many({"1": "old", "2": "two"}) == 2
+    assert cache.get("1") == "old"
+    assert cache.get("missing") is None
+
+    stored = cache.set_many([("1", "new"), ("3", "three")], source="mtgo")
+    cache.flush()
+
+    assert stored == 2
+    assert cache.get_many(["1", "3"], source="mtgo") == {"1": "new", "3": "three"}
+    assert cache.get_stats()["top_accessed"][0] == ("1", 2)
+    assert cache.set_many([]) == 0
+    cache.close()
+
+
+def test_compressed_storage_round_trips_and_migrates_back(tmp_path):
+    cache = DeckTextCache(tmp_path / "decks.db")
+    decks = {
+        str(n): f"4 Lightning Bolt\n4 Island\n{n % 4 + 1} Opt\n\nSideboard\n2 Pyroblast\n"
+        for n in range(20)
+    }
+    cache.set_many(decks)
+
+    assert cache.compress_storage(sample_size=10, batch_size=7) == 20
+    assert cache.compressed
+    cache.set("new", "1 Brand New Card\n", source="mtgo")
+
+    reopened = DeckTextCache(tmp_path / "decks.db")
+    assert reopened.compressed
+    assert reopened.get_many(decks) == decks
+    assert reopened.get("new") == "1 Brand New Card\n"
+    assert reopened.get_stats()["compressed_decks"] == 21
+    with sqlite3.connect(tmp_path / "decks.db") as conn:
+        assert (
+            conn.execute("SELECT COUNT(*) FROM deck_cache WHERE deck_text != ''").fetchone()[0] == 0
+        )
+
+    assert reopened.decompress_storage(batch_size=7) == 21
+    assert not reopened.compressed
+    assert reopened.get("5") == decks["5"]
+    assert reopened.get_stats()["compressed_decks"] == 0
+    reopened.close()
+    cache.close()
+
+
+def test_card_aggregates_come_from_normalized_deck_cards(tmp_path):
+    cache = DeckTextCache(tmp_path / "decks.db")
+    cache.set_many(
+        {
+            "1": "4 Lightning Bolt\n2 Island\n\nSideboard\n2 Pyroblast\n",
+            "2": "4 Lightning Bolt\n1 Island\n1 Island\n",
+        }
+    )
+    cache.set("3", "3 Lightning Bolt\nsideboard\n1 Pyroblast\n", source="mtgo")
+    # A deck cached before deck_cards existed is broken down on first use
+    with cache.connection() as conn:
+        conn.execute(
+            "INSERT INTO deck_cache (deck_number, deck_text, cached_at, last_accessed) "
+            "VALUES ('4', '1 Opt', 0, 0)"
+        )
+
+    result = cache.card_aggregates(["1", "2", "3", "4", "missing"])
+    cards = {(card.zone, card.card_name): card for card in result.cards}
+
+    assert sorted(result.deck_numbers) == ["1", "2", "3", "4"]
+    assert cards[("main", "Lightning Bolt")].copy_distribution == {3: 1, 4: 2}
+    assert cards[("main", "Island")].copy_distribution == {2: 2}
+    assert cards[("side", "Pyroblast")].total_copies == 3
+    assert cards[("main", "Opt")].max_copies == 1
+    mtgo = cache.card_aggregates(["1", "3"], source="mtgo")
+    assert mtgo.deck_numbers == ["3"] and len(mtgo.zone("side")) == 1
+
+    cache.set("1", "1 Opt\n")
+    assert cache.clear()
+    with cache.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM deck_cards").fetchone()[0] == 0
+    cache.close()
+
+
+def test_archetype_statistics_are_incremental_and_windowed(tmp_path):
+    cache = DeckTextCache(tmp_path / "decks.db")
+    cache.set_many(
+        {
+            "1": "4 Lightning Bolt\n2 Island\n\nSideboard\n2 Pyroblast\n",
+            "2": "4 Lightning Bolt\n1 Island\n",
+            "3": "3 Lightning Bolt\n",
+        }
+    )
+    key = archetype_key("mtgo", "Izzet Prowess", "Modern")
+    assert key == "mtgo:modern:izzet prowess"
+
+    added = cache.add_archetype_decks(key, [("1", "2024-03-01"), ("2", "2024-03-02"), ("9", "x")])
+    assert added == {"1", "2"}
+    # Re-adding is a no-op; uncached decks are skipped until cached
+    assert cache.add_archetype_decks(key, [("1", "2024-03-05"), ("9", "2024-03-03")]) == {"1"}
+    cache.set("9", "2 Lightning Bolt\n")
+    assert cache.add_archetype_decks(key, [("9", "2024-03-03"), ("3", "2024-03-03")]) == {"9", "3"}
+
+    every_day = cache.archetype_aggregates([key, "mtgo:pioneer:izzet prowess"])
+    cards = {(card.zone, card.card_name): card for card in every_day.cards}
+    assert sorted(every_day.deck_numbers) == ["1", "2", "3", "9"]
+    assert cards[("main", "Lightning Bolt")].copy_distribution == {2: 1, 3: 1, 4: 2}
+    assert cards[("side", "Pyroblast")].appearances == 1
+
+    window = cache.archetype_aggregates([key], since="2024-03-02", until="2024-03-02")
+    assert window.deck_numbers == ["2"]
+    assert [(card.card_name, card.copy_distribution) for card in window.cards] == [
+        ("Island", {1: 1}),
+        ("Lightning Bolt", {4: 1}),
+    ]
+
+    # Statistics outlive the deck texts they were built from
+    cache.cleanup_lru(max_entries=0)
+    assert sorted(cache.archetype_aggregates([key], since="2024-03-03").deck_numbers) == ["3", "9"]
+    cache.close()
@@ -0,0 +1,37 @@
+"""Tests for the compact deck list encoding."""
+
+from __future__ import annotations
+
+from utils.deck_text_codec import (
+    card_names_in,
+    compress,
+    decode_deck,
+    decompress,
+    encode_deck,
+    train_dictionary,
+)
+
+DECK = "4 Lightning Bolt\n2 Fire // Ice\n\nSideboard\n3 Pyroblast\n"
+
+
+def test_card_id_encoding_round_trips_exactly():
+    ids = {name: index for index, name in enumerate(sorted(card_names_in(DECK)))}
+    names = {index: name for name, index in ids.items()}
+
+    payload = encode_deck(DECK, ids.__getitem__)
+
+    assert b"Lightning" not in payload
+    assert decode_deck(payload, names.__getitem__) == DECK
+    odd = "1 Card\x1fName\nnot a card line"
+    assert decode_deck(encode_deck(odd, ids.__getitem__), names.__getitem__) == odd
+
+
+def test_dictionary_compression_round_trips_and_helps():
+    decks = [f"I4 Island\n4 Opt\n{n} Card {n}\nsideboard\n2 Negate\n".encode() for n in range(50)]
+    dictionary = train_dictionary(decks)
+
+    assert b"4 Island\n4 Opt\n" in dictionary and len(dictionary) < 100
+    blob = compress(decks[3], dictionary)
+    assert decompress(blob, dictionary) == decks[3]
+    assert len(blob) < len(compress(decks[3], b""))
+    assert decompress(compress(decks[3], b""), b"") == decks[3]
@@ -1,5 +1,5 @@
 from services.deck_service import DeckService
-from utils.deck import sanitize_filename
+from utils.deck import parse_deck_zones, sanitize_filename
 
 SAMPLE_DECK = """4 Ragavan, Nimble Pilferer
 2 Blood Moon
@@ -177,3 +177,17 @@ def test_sanitize_filename_normal_cases():
     # Single dots are allowed for version numbers
     assert sanitize_filename("UW Control v2.0") == "UW Control v2.0"
     assert sanitize_filename("deck.backup") == "deck.backup"
+
+
+def test_parse_deck_zones_sums_cards_per_zone():
+    zones = parse_deck_zones(SAMPLE_DECK + "1 Blood Moon\n")
+    assert zones["main"] == {
+        "Ragavan, Nimble Pilferer": 4,
+        "Blood Moon": 2,
+        "Otawara, Soaring City": 1,
+    }
+    assert zones["side"] == {"Sideboard Card": 2, "Force of Vigor": 3, "Blood Moon": 1}
+    assert parse_deck_zones("1.5 Island\nSideboard\nnot a card\n2 Negate") == {
+        "main": {"Island": 1.5},
+        "side": {"Negate": 2},
+    }
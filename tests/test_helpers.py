@@ -6,6 +6,7 @@ instances to ensure test isolation and prevent state leakage between tests.
 
 import sys
 from pathlib import Path
+from typing import Any
 
 # Add parent directory to sys.path to enable imports from repositories and services
 parent_dir = Path(__file__).parent.parent
@@ -63,3 +64,11 @@ def reset_all_globals() -> None:
     """
     reset_all_services()
     reset_all_repositories()
+
+
+def load_cards(manager: Any, cards: list[dict[str, Any]]) -> None:
+    """Give a ``CardDataManager`` an in-memory card store over ``cards``, bypassing its index file."""
+    from utils.card_store import CardStore
+
+    manager._close_index()
+    manager._cards = CardStore.from_cards(cards)
@@ -0,0 +1,38 @@
+"""Tests for the precomputed rounded-corner alpha masks."""
+
+from __future__ import annotations
+
+import pytest
+
+from utils.image_masks import _inside_rounded_rect, apply_alpha_mask, rounded_corner_mask
+
+
+@pytest.mark.parametrize(
+    "width,height,radius",
+    [(260, 360, 12), (31, 17, 12), (5, 40, 12), (10, 10, 0), (1, 1, 3)],
+)
+def test_mask_matches_per_pixel_predicate(width, height, radius):
+    expected = bytes(
+        255 if _inside_rounded_rect(x, y, width, height, radius) else 0
+        for y in range(height)
+        for x in range(width)
+    )
+
+    assert rounded_corner_mask(width, height, radius) == expected
+
+
+def test_mask_clips_only_the_corners():
+    mask = rounded_corner_mask(40, 30, 6)
+
+    assert mask[0] == 0 and mask[39] == 0 and mask[-1] == 0 and mask[-40] == 0
+    assert mask[15 * 40 : 16 * 40] == b"\xff" * 40
+    assert mask.count(0) == 2 * mask[: 6 * 40].count(0)
+
+
+def test_apply_alpha_mask_keeps_alpha_inside_the_mask():
+    alpha = bytes([10, 200, 255, 0, 128])
+    mask = bytes([255, 0, 255, 255, 0])
+
+    assert apply_alpha_mask(alpha, mask) == bytes([10, 0, 255, 0, 0])
+    with pytest.raises(ValueError):
+        apply_alpha_mask(alpha, mask[:-1])
@@ -0,0 +1,107 @@
+"""Tests for the background image prefetch scheduler."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from utils.image_prefetcher import ImagePrefetcher
+
+
+class _GatedLoader:
+    """Records loaded names; the first load blocks until released."""
+
+    def __init__(self):
+        self.loaded: list[str] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.done = threading.Event()
+        self.expected = 0
+
+    def __call__(self, name, cancelled):
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(2)
+        if name == "boom":
+            raise RuntimeError("decode failed")
+        if not cancelled():
+            self.loaded.append(name)
+        if len(self.loaded) >= self.expected:
+            self.done.set()
+
+
+@pytest.fixture()
+def loader():
+    return _GatedLoader()
+
+
+@pytest.fixture()
+def prefetcher(loader):
+    instance = ImagePrefetcher(loader)
+    yield instance
+    instance.shutdown()
+
+
+def test_loads_visible_names_before_upcoming_ones(prefetcher, loader):
+    loader.expected = 5
+    prefetcher.schedule("search", ["gate"])
+    assert loader.started.wait(2)
+    prefetcher.schedule("deck:main", ["Opt", "Island"], ["Brainstorm", "opt"])
+    prefetcher.schedule("deck:side", ["Pyroblast"])
+    loader.release.set()
+
+    assert loader.done.wait(2)
+    assert loader.loaded == ["gate", "Opt", "Island", "Pyroblast", "Brainstorm"]
+
+
+def test_rescheduling_a_context_drops_its_stale_entries(prefetcher, loader):
+    loader.expected = 3
+    prefetcher.schedule("deck:main", ["gate"])
+    assert loader.started.wait(2)
+    prefetcher.schedule("search", ["Old A", "Old B"])
+    prefetcher.schedule("deck:side", ["Kept"])
+    prefetcher.schedule("search", ["New"])
+    assert prefetcher.pending() == 2
+    loader.release.set()
+
+    assert loader.done.wait(2)
+    prefetcher.shutdown()
+    assert loader.loaded == ["gate", "Kept", "New"]
+    assert prefetcher.stats()["dropped"] == 2
+
+
+def test_running_load_sees_cancellation_and_failures_are_counted(prefetcher, loader):
+    loader.expected = 1
+    prefetcher.schedule("search", ["gate"])
+    assert loader.started.wait(2)
+    prefetcher.cancel("search")
+    prefetcher.schedule("deck:main", ["boom", "Ponder"])
+    loader.release.set()
+
+    assert loader.done.wait(2)
+    assert loader.loaded == ["Ponder"]
+    prefetcher.shutdown()
+    stats = prefetcher.stats()
+    assert stats["scheduled"] == 3
+    assert stats["failed"] == 1
+    assert stats["loaded"] == 2
+
+
+def test_schedule_can_bind_its_own_load(prefetcher, loader):
+    loader.expected = 1
+    prefetcher.schedule("search", ["gate"])
+    assert loader.started.wait(2)
+    bound: list[tuple[str, str]] = []
+    done = threading.Event()
+
+    def load(name, cancelled):
+        bound.append(("snapshot", name))
+        done.set()
+
+    prefetcher.schedule("deck:main", ["Opt"], load=load)
+    loader.release.set()
+
+    assert done.wait(2)
+    assert bound == [("snapshot", "Opt")]
+    assert loader.loaded == ["gate"]
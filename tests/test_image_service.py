@@ -1,6 +1,10 @@
 """Tests for ImageService business logic."""
 
+import threading
+
 from services.image_service import ImageService
+from utils.card_images import CardImageCache
+from utils.thumbnail_atlas import ThumbnailAtlasBuilder
 
 
 def test_image_service_initialization():
@@ -55,3 +59,35 @@ def test_is_loading_when_loading():
     service.printing_index_loading = True
 
     assert service.is_loading() is True
+
+
+def test_deck_thumbnails_are_read_from_the_deck_atlas(tmp_path):
+    """Cached thumbnails come back keyed by lowercased name; uncached cards are left out."""
+    cache = CardImageCache(cache_dir=tmp_path / "images", db_path=tmp_path / "images.db")
+    path = cache.cache_dir / "small" / "uuid-opt-0.jpg"
+    path.write_bytes(b"opt")
+    cache.add_image(
+        uuid="uuid-opt",
+        name="Opt",
+        set_code="xln",
+        collector_number="1",
+        image_size="small",
+        file_path=path,
+    )
+    service = ImageService()
+    builder = ThumbnailAtlasBuilder(cache, atlas_dir=tmp_path / "atlases")
+    service.atlas_builders["small"] = builder
+    loaded: list[dict[str, bytes]] = []
+    done = threading.Event()
+
+    def on_loaded(thumbnails):
+        loaded.append(thumbnails)
+        done.set()
+
+    service.load_deck_thumbnails_async(["Opt", "Uncached Card"], on_loaded)
+
+    assert done.wait(2)
+    assert loaded == [{"opt": b"opt"}]
+    assert len(list((tmp_path / "atlases").glob("deck-*.atlas"))) == 1
+    builder.close()
+    cache.close()
@@ -0,0 +1,91 @@
+"""Tests for the incremental JSON array and object readers."""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from utils.json_stream import iter_json_array, iter_json_object
+
+DOCUMENT = [
+    {"id": "a", "name": "Fire // Ice", "card_faces": [{"name": "Fire"}, {"name": "Ice"}]},
+    {"id": "b", "name": "Jötun Grunt", "prices": {"usd": "0.25"}, "text": "[not, an, array]"},
+    12345,
+    -0.5,
+    "plain string",
+    None,
+    [],
+    {},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 20])
+def test_yields_every_element_across_chunk_boundaries(chunk_size):
+    text = json.dumps(DOCUMENT, indent=2, ensure_ascii=False)
+
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == DOCUMENT
+
+
+def test_reads_files_and_empty_arrays(tmp_path):
+    path = tmp_path / "bulk.json"
+    path.write_text(json.dumps(DOCUMENT, ensure_ascii=False), encoding="utf-8")
+    empty = tmp_path / "empty.json"
+    empty.write_text(" [ ] \n", encoding="utf-8")
+
+    assert list(iter_json_array(path, chunk_size=16)) == DOCUMENT
+    assert list(iter_json_array(empty)) == []
+
+
+def test_elements_are_produced_lazily():
+    stream = iter_json_array(io.StringIO('[{"id": 1}, {"id": 2}, {"broken'), chunk_size=4)
+
+    assert next(stream) == {"id": 1}
+    assert next(stream) == {"id": 2}
+    with pytest.raises(json.JSONDecodeError):
+        next(stream)
+
+
+@pytest.mark.parametrize("text", ['{"id": 1}', "[1, 2", "[1 2]", "[1,]", ""])
+def test_malformed_documents_raise(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), chunk_size=3))
+
+
+ATOMIC = {
+    "meta": {"date": "2024-01-01", "version": "5.2.2"},
+    "data": {
+        "Fire // Ice": [{"name": "Fire // Ice", "faceName": "Fire"}, {"faceName": "Ice"}],
+        "Opt": [{"name": "Opt", "manaValue": -0.5, "text": '{"not": "a key"}'}],
+        "Empty": [],
+    },
+    "trailing": [1, 2, 3],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 20])
+def test_object_members_stream_across_chunk_boundaries(chunk_size):
+    text = json.dumps(ATOMIC, indent=2, ensure_ascii=False)
+
+    top_level = list(iter_json_object(io.StringIO(text), chunk_size=chunk_size))
+    cards = list(iter_json_object(io.StringIO(text), path=("data",), chunk_size=chunk_size))
+
+    assert top_level == list(ATOMIC.items())
+    assert cards == list(ATOMIC["data"].items())
+
+
+def test_object_members_missing_path_and_empty_objects():
+    text = json.dumps(ATOMIC)
+
+    assert list(iter_json_object(io.StringIO(text), path=("cards",))) == []
+    assert list(iter_json_object(io.StringIO('{"data": {}}'), path=("data",))) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"data": [1]}', '{"data": {"a": 1 "b": 2}}', '{"data": {"a" 1}}', "[]", '{"data"'],
+)
+def test_malformed_objects_raise(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_object(io.StringIO(text), path=("data",), chunk_size=3))
@@ -0,0 +1,48 @@
+"""Tests for the size-bounded LRU cache."""
+
+from __future__ import annotations
+
+from utils.lru_cache import SizedLRUCache
+
+
+def test_evicts_least_recently_used_by_entry_count():
+    cache = SizedLRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.keys() == ["a", "c"]
+    assert cache.get("b") is None
+
+
+def test_evicts_by_total_size():
+    cache = SizedLRUCache(max_entries=10, max_bytes=10, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "yyyy")
+    cache.put("c", "zzzz")
+
+    assert cache.keys() == ["b", "c"]
+    assert cache.total_bytes == 8
+
+    cache.put("huge", "x" * 11)
+    assert "huge" not in cache
+    assert cache.pop("b") == "yyyy"
+    assert cache.total_bytes == 4
+
+
+def test_counts_hits_and_misses():
+    cache = SizedLRUCache(max_entries=2)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "entries": 1,
+        "bytes": cache.total_bytes,
+    }
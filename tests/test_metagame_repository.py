@@ -5,7 +5,7 @@ import time
 
 import pytest
 
-from repositories.metagame_repository import MetagameRepository, _parse_deck_date
+from repositories.metagame_repository import MetagameRepository, _parse_deck_date, deck_day
 
 
 def _write_cache(path, payload):
@@ -13,6 +13,11 @@ def _write_cache(path, payload):
     path.write_text(json.dumps(payload), encoding="utf-8")
 
 
+def _record_in_memory(_key, members):
+    """Stands in for the deck cache, so fetched decks stay out of the real one."""
+    return {number for number, _day in members}
+
+
 @pytest.fixture
 def archetype_cache_file(tmp_path):
     """Create a temporary archetype cache file."""
@@ -32,6 +37,7 @@ def metagame_repo(archetype_cache_file, archetype_deck_cache_file):
         cache_ttl=3600,
         archetype_list_cache_file=archetype_cache_file,
         archetype_decks_cache_file=archetype_deck_cache_file,
+        archetype_deck_recorder=_record_in_memory,
     )
 
 
@@ -315,6 +321,39 @@ def test_parse_deck_date_supports_common_formats():
     assert _parse_deck_date("not a date") == (0, 0, 0)
 
 
+def test_deck_day_normalizes_dates_and_timestamps():
+    assert deck_day("2024-03-09") == "2024-03-09"
+    assert deck_day("3/9/2024") == "2024-03-09"
+    assert deck_day("2024-03-09T18:00:00Z") == "2024-03-09"
+    assert deck_day("") is None and deck_day("soon") is None
+
+
+def test_record_archetype_decks_keys_decks_by_source(metagame_repo, monkeypatch):
+    """MTGGoldfish decks are stored under the href, MTGO decks under format and name."""
+    recorded = {}
+
+    def fake_record(key, members):
+        recorded[key] = members
+        return {number for number, _day in members}
+
+    monkeypatch.setattr(metagame_repo, "archetype_deck_recorder", fake_record)
+    archetype = {"href": "modern-living-end", "name": "Living End"}
+    decks = [
+        {"number": "1", "date": "2024-03-04", "source": "mtggoldfish"},
+        {"number": "2", "date": "03/05/2024", "source": "mtgo", "format": "modern"},
+        {"number": "3", "date": "", "source": "mtggoldfish"},
+    ]
+
+    assert metagame_repo.record_archetype_decks(archetype, decks) == {"1", "2"}
+    assert recorded == {
+        "mtggoldfish::modern-living-end": [("1", "2024-03-04")],
+        "mtgo:modern:living end": [("2", "2024-03-05")],
+    }
+    assert metagame_repo._archetype_keys(archetype, "mtggoldfish") == [
+        "mtggoldfish::modern-living-end"
+    ]
+
+
 def test_merge_and_sort_decks_is_deterministic(metagame_repo):
     """Merged decks should sort by date while remaining stable for ties."""
     mtggoldfish_decks = [
@@ -343,6 +382,7 @@ def test_get_decks_respects_source_filters_and_sorting(
     repo = MetagameRepository(
         archetype_list_cache_file=archetype_cache_file,
         archetype_decks_cache_file=archetype_deck_cache_file,
+        archetype_deck_recorder=_record_in_memory,
     )
     mtggoldfish_decks = [
         {"name": "GF New", "date": "2024-03-04", "source": "mtggoldfish", "number": "1"},
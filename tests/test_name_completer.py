@@ -0,0 +1,75 @@
+"""Tests for card name completion."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from services.search_service import SearchService
+from utils.name_completer import NameCompleter
+
+NAMES = [
+    "Lightning Bolt",
+    "Lightning Helix",
+    "Lightning Axe",
+    "Light Up the Stage",
+    "Chain Lightning",
+    "Ligthouse Chronologist",
+    "Fable of the Mirror-Breaker // Reflection of Kiki-Jiki",
+    "Fable of the Mirror-Breaker",
+    "Reflection of Kiki-Jiki",
+    "Counterspell",
+]
+
+
+def test_prefix_matches_are_alphabetical_and_case_insensitive():
+    completer = NameCompleter(NAMES)
+
+    assert completer.complete("LIGHTNING", limit=3) == [
+        "Lightning Axe",
+        "Lightning Bolt",
+        "Lightning Helix",
+    ]
+    assert completer.complete("fable") == [
+        "Fable of the Mirror-Breaker",
+        "Fable of the Mirror-Breaker // Reflection of Kiki-Jiki",
+    ]
+    assert completer.complete("") == []
+
+
+def test_popular_names_rank_first_then_word_matches():
+    completer = NameCompleter(NAMES)
+    completer.set_popularity({"Lightning Helix": 3, "Lightning Bolt": 40, "Unknown": 99})
+
+    assert completer.complete("lightning") == [
+        "Lightning Bolt",
+        "Lightning Helix",
+        "Lightning Axe",
+        "Chain Lightning",
+    ]
+    assert completer.complete("kiki") == [
+        "Fable of the Mirror-Breaker // Reflection of Kiki-Jiki",
+        "Reflection of Kiki-Jiki",
+    ]
+
+
+def test_fuzzy_fallback_handles_typos():
+    completer = NameCompleter(NAMES)
+
+    assert completer.complete("conterspell") == ["Counterspell"]
+    assert completer.complete("lightnign b", limit=1) == ["Lightning Bolt"]
+    assert completer.complete("zz") == []
+
+
+def test_search_service_completes_names_with_popularity():
+    completer = NameCompleter(NAMES)
+    repo = SimpleNamespace(get_name_completer=lambda: completer)
+    service = SearchService(card_repository=repo)
+    service.set_card_popularity({"Lightning Helix": 5})
+
+    assert service.complete_card_names("light", limit=2) == [
+        "Lightning Helix",
+        "Light Up the Stage",
+    ]
+
+    unloaded = SearchService(card_repository=SimpleNamespace(get_name_completer=lambda: None))
+    assert unloaded.complete_card_names("light") == []
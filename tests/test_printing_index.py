@@ -0,0 +1,119 @@
+"""Tests for the memory-mapped printings index."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from utils import card_images
+from utils.binary_index import IndexFormatError
+from utils.printing_index import PrintingIndex, write_printing_index
+
+
+def _card(card_id: int, name: str, set_code: str, released_at: str, **extra):
+    return {
+        "id": f"00000000-0000-4000-8000-{card_id:012d}",
+        "name": name,
+        "set": set_code,
+        "set_name": f"Set {set_code.upper()}",
+        "collector_number": str(card_id),
+        "released_at": released_at,
+        **extra,
+    }
+
+
+CARDS = [
+    _card(1, "Lightning Bolt", "lea", "1993-08-05"),
+    _card(2, "Lightning Bolt", "m11", "2010-07-16"),
+    _card(3, "Lightning Bolt", "2xm", "2020-08-07"),
+    _card(4, "Fire // Ice", "apc", "2001-06-04"),
+    _card(5, "Opt", "xln", ""),
+]
+
+
+def _write(path, cards=CARDS):
+    printings = []
+    for card in cards:
+        names = [card["name"]]
+        if "//" in card["name"]:
+            names += [face.strip() for face in card["name"].split("//")]
+        printings.append((card, names))
+    return write_printing_index(path, printings, {"bulk_mtime": 123.0})
+
+
+def test_lookup_returns_printings_newest_first(tmp_path):
+    path = tmp_path / "printings.bin"
+    meta = _write(path)
+    index = PrintingIndex(path)
+
+    bolts = index.get("LIGHTNING BOLT")
+
+    assert [printing["set"] for printing in bolts] == ["2XM", "M11", "LEA"]
+    assert bolts[0] == {
+        "id": "00000000-0000-4000-8000-000000000003",
+        "set": "2XM",
+        "set_name": "Set 2XM",
+        "collector_number": "3",
+        "released_at": "2020-08-07",
+    }
+    assert index.get("Opt")[0]["released_at"] == ""
+    assert index.get("Missing", []) == []
+    assert (meta["unique_names"], meta["total_printings"]) == (5, 5)
+    assert (index.unique_names, index.total_printings) == (5, 5)
+    assert index.meta["bulk_mtime"] == 123.0
+    index.close()
+
+
+def test_face_names_share_the_split_card_records(tmp_path):
+    path = tmp_path / "printings.bin"
+    _write(path)
+    index = PrintingIndex(path)
+
+    assert index.get("fire") == index.get("ice") == index.get("fire // ice")
+    assert "ice" in index
+    assert sorted(index) == ["fire", "fire // ice", "ice", "lightning bolt", "opt"]
+    mapping = index._mapped
+    index.close()
+    assert mapping._mmap.closed
+    assert index.get("fire") is None
+    assert len(index) == 0
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "printings.bin"
+    path.write_bytes(b"not an index")
+
+    with pytest.raises(IndexFormatError):
+        PrintingIndex(path)
+
+
+def test_ensure_printing_index_cache_builds_once_and_rebuilds_when_stale(tmp_path, monkeypatch):
+    bulk_path = tmp_path / "bulk_data.json"
+    bulk_path.write_text(json.dumps(CARDS), encoding="utf-8")
+    legacy_path = tmp_path / "printings_v2.json"
+    legacy_path.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(card_images, "IMAGE_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(card_images, "BULK_DATA_CACHE", bulk_path)
+    monkeypatch.setattr(card_images, "PRINTING_INDEX_CACHE", tmp_path / "printings_v3.bin")
+    monkeypatch.setattr(card_images, "_printing_index", None)
+
+    first = card_images.ensure_printing_index_cache()
+    assert card_images.ensure_printing_index_cache() is first
+    assert not legacy_path.exists()
+
+    bulk_path.write_text(json.dumps(CARDS[:1]), encoding="utf-8")
+    stat = bulk_path.stat()
+    os.utime(bulk_path, (stat.st_atime, first.meta["bulk_mtime"] + 10))
+    old_mapping = first._mapped
+    rebuilt = card_images.ensure_printing_index_cache()
+
+    # Remapped in place: holders of the index see the new printings, never a closed index.
+    assert rebuilt is first
+    assert old_mapping._mmap.closed
+    assert rebuilt.total_printings == 1
+    assert first.get("opt") is None
+    assert first.get("lightning bolt")
+    assert not (tmp_path / "printings_v3.bin.new").exists()
+    rebuilt.close()
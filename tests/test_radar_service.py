@@ -1,16 +1,23 @@
 """Tests for the Radar Service."""
 
+from datetime import date
 from unittest.mock import MagicMock
 
 import pytest
 
 from services.radar_service import CardFrequency, RadarData, RadarService
+from utils.deck_text_cache import CardAggregate, DeckCardAggregates
+from utils.rate_limiter import HostRateLimiter
 
 
 @pytest.fixture
 def mock_metagame_repo():
     """Mock metagame repository."""
     repo = MagicMock()
+    repo.get_cached_deck_contents.return_value = {}
+    repo.get_cached_card_aggregates.return_value = DeckCardAggregates([], [])
+    repo.record_archetype_decks.return_value = set()
+    repo.get_archetype_aggregates.return_value = DeckCardAggregates([], [])
     return repo
 
 
@@ -24,7 +31,11 @@ def mock_deck_service():
 @pytest.fixture
 def radar_service(mock_metagame_repo, mock_deck_service):
     """RadarService with mocked dependencies."""
-    return RadarService(metagame_repository=mock_metagame_repo, deck_service=mock_deck_service)
+    return RadarService(
+        metagame_repository=mock_metagame_repo,
+        deck_service=mock_deck_service,
+        rate_limiter=HostRateLimiter(0),
+    )
 
 
 @pytest.fixture
@@ -190,6 +201,146 @@ def test_calculate_radar_handles_failures(
     assert radar.decks_failed == 1
 
 
+def test_calculate_radar_reads_cached_decks_without_downloading(
+    radar_service, mock_metagame_repo, mock_deck_service, sample_archetype
+):
+    """Cached decks come from one batched lookup; only the others are downloaded."""
+    decks = [
+        {"name": f"Deck {i}", "number": str(i), "url": "https://example.com"} for i in (1, 2, 3)
+    ]
+    mock_metagame_repo.get_decks_for_archetype.return_value = decks
+    mock_metagame_repo.get_cached_deck_contents.return_value = {"1": "cached", "3": "cached"}
+    mock_metagame_repo.download_deck_content.return_value = "downloaded"
+    mock_deck_service.analyze_deck.return_value = {
+        "mainboard_cards": [("Island", 4)],
+        "sideboard_cards": [],
+    }
+    progress = []
+
+    radar = radar_service.calculate_radar(
+        sample_archetype, "Modern", progress_callback=lambda *args: progress.append(args)
+    )
+
+    mock_metagame_repo.get_cached_deck_contents.assert_called_once_with(decks)
+    mock_metagame_repo.download_deck_content.assert_called_once_with(decks[1])
+    assert [call[0] for call in progress] == [1, 2, 3]
+    assert {call[2] for call in progress} == {"Deck 1", "Deck 2", "Deck 3"}
+    assert radar.total_decks_analyzed == 3
+
+
+def test_calculate_radar_uses_sql_aggregates_for_cached_decks(
+    radar_service, mock_metagame_repo, mock_deck_service, sample_archetype
+):
+    """Cached decks are counted from card aggregates without being parsed."""
+    decks = [{"name": f"Deck {i}", "number": str(i)} for i in (1, 2, 3)]
+    mock_metagame_repo.get_decks_for_archetype.return_value = decks
+    mock_metagame_repo.get_cached_card_aggregates.return_value = DeckCardAggregates(
+        ["1", "3"],
+        [
+            CardAggregate("Island", "main", {4: 2}),
+            CardAggregate("Negate", "side", {2: 1}),
+        ],
+    )
+    mock_metagame_repo.download_deck_content.return_value = "downloaded"
+    mock_deck_service.analyze_deck.return_value = {
+        "mainboard_cards": [("Island", 3)],
+        "sideboard_cards": [],
+    }
+
+    radar = radar_service.calculate_radar(sample_archetype, "Modern")
+
+    mock_metagame_repo.download_deck_content.assert_called_once_with(decks[1])
+    mock_deck_service.analyze_deck.assert_called_once_with("downloaded")
+    island = radar.mainboard_cards[0]
+    assert radar.total_decks_analyzed == 3
+    assert island.copy_distribution == {4: 2, 3: 1}
+    assert radar.sideboard_cards[0].inclusion_rate == pytest.approx(33.3, abs=0.1)
+
+
+def test_calculate_radar_merges_stored_archetype_statistics(
+    radar_service, mock_metagame_repo, mock_deck_service, sample_archetype
+):
+    """Dated decks join the stored statistics, which are merged over the deck dates."""
+    decks = [
+        {"name": "Deck 1", "number": "1", "date": "2024-03-05"},
+        {"name": "Deck 2", "number": "2", "date": "03/02/2024"},
+        {"name": "Deck 3", "number": "3", "date": "2024-03-01"},
+    ]
+    mock_metagame_repo.get_decks_for_archetype.return_value = decks
+    # Decks 1 and 3 are stored already; deck 2 is stored once downloaded
+    mock_metagame_repo.record_archetype_decks.side_effect = [{"1", "3"}, {"2"}]
+    mock_metagame_repo.get_archetype_aggregates.return_value = DeckCardAggregates(
+        ["1", "2", "3", "older"],
+        [CardAggregate("Island", "main", {4: 3, 2: 1})],
+    )
+    mock_metagame_repo.download_deck_content.return_value = "downloaded"
+    mock_deck_service.analyze_deck.return_value = {
+        "mainboard_cards": [("Island", 4)],
+        "sideboard_cards": [],
+    }
+
+    radar = radar_service.calculate_radar(sample_archetype, "Modern")
+
+    mock_metagame_repo.download_deck_content.assert_called_once_with(decks[1])
+    assert mock_metagame_repo.record_archetype_decks.call_args_list[1].args == (
+        sample_archetype,
+        [decks[1]],
+    )
+    mock_metagame_repo.get_archetype_aggregates.assert_called_once_with(
+        sample_archetype, since=date(2024, 3, 1), until=date(2024, 3, 5)
+    )
+    mock_metagame_repo.get_cached_card_aggregates.assert_not_called()
+    assert radar.total_decks_analyzed == 4
+    assert radar.mainboard_cards[0].copy_distribution == {4: 3, 2: 1}
+
+
+def test_calculate_radar_explicit_window_skips_decks_outside_it(
+    radar_service, mock_metagame_repo, sample_archetype
+):
+    """Only current decks inside an explicit window are stored or downloaded."""
+    decks = [
+        {"name": "New", "number": "1", "date": "2024-03-05"},
+        {"name": "Old", "number": "2", "date": "2024-02-01"},
+    ]
+    mock_metagame_repo.get_decks_for_archetype.return_value = decks
+    mock_metagame_repo.record_archetype_decks.return_value = {"1"}
+    mock_metagame_repo.get_archetype_aggregates.return_value = DeckCardAggregates(
+        ["1"], [CardAggregate("Island", "main", {4: 1})]
+    )
+
+    radar = radar_service.calculate_radar(sample_archetype, "Modern", since=date(2024, 3, 1))
+
+    mock_metagame_repo.record_archetype_decks.assert_called_once_with(sample_archetype, [decks[0]])
+    mock_metagame_repo.download_deck_content.assert_not_called()
+    mock_metagame_repo.get_archetype_aggregates.assert_called_once_with(
+        sample_archetype, since=date(2024, 3, 1), until=None
+    )
+    assert radar.total_decks_analyzed == 1
+
+
+def test_calculate_radar_cancellation_stops_downloads(
+    mock_metagame_repo, mock_deck_service, sample_archetype
+):
+    """An exception from the progress callback aborts the run and pending downloads."""
+    decks = [{"name": f"Deck {i}", "number": str(i)} for i in range(20)]
+    mock_metagame_repo.get_decks_for_archetype.return_value = decks
+    mock_metagame_repo.download_deck_content.return_value = "4 Island"
+    service = RadarService(
+        metagame_repository=mock_metagame_repo,
+        deck_service=mock_deck_service,
+        max_workers=1,
+        rate_limiter=HostRateLimiter(0.01),
+    )
+
+    def cancel(current, total, name):
+        raise InterruptedError("cancelled")
+
+    with pytest.raises(InterruptedError):
+        service.calculate_radar(sample_archetype, "Modern", progress_callback=cancel)
+
+    assert mock_metagame_repo.download_deck_content.call_count < len(decks)
+
+
 def test_export_radar_as_decklist():
     """Test exporting radar as a deck list."""
     service = RadarService()
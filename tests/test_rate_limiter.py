@@ -0,0 +1,31 @@
+"""Tests for per-host request spacing."""
+
+from __future__ import annotations
+
+from utils.rate_limiter import HostRateLimiter
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+
+def test_requests_to_one_host_are_spaced_and_hosts_are_independent():
+    clock = _FakeClock()
+    limiter = HostRateLimiter(0.5, clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire("https://www.mtggoldfish.com/deck/1") == 0
+    assert limiter.acquire("https://WWW.mtggoldfish.com/deck/2") == 0.5
+    assert limiter.acquire("www.mtggoldfish.com") == 1.0
+    assert limiter.acquire("https://api.scryfall.com/cards") == 0
+    assert clock.sleeps == [0.5, 1.0]
+
+    clock.now += 5
+    assert limiter.acquire("https://www.mtggoldfish.com/deck/3") == 0
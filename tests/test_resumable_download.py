@@ -0,0 +1,160 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+import urllib3
+
+from utils.resumable_download import (
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    DownloadVerificationError,
+    chunk_size_for,
+    download_resumable,
+)
+
+BODY = bytes(range(256)) * 4096  # 1 MiB
+# The raw (still gzip encoded) stream surfaces urllib3's errors unwrapped.
+TRANSFER_ERRORS = (requests.RequestException, urllib3.exceptions.HTTPError)
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves ``server.body`` with Range/If-Range support, optionally gzip encoded."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        body = gzip.compress(server.body, mtime=0) if server.gzip else server.body
+        start = 0
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or if_range == f'"{server.etag}"'):
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+        status = 206 if start else 200
+        self.send_response(status)
+        self.send_header("ETag", f'"{server.etag}"')
+        if server.gzip:
+            self.send_header("Content-Encoding", "gzip")
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        payload = body[start:]
+        if server.cut_after:
+            # Drop the connection midway, as a flaky network would.
+            payload = payload[: server.cut_after]
+            server.cut_after = 0
+            self.close_connection = True
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def range_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.body = BODY
+    server.etag = "v1"
+    server.gzip = False
+    server.cut_after = 0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield SimpleNamespace(url=f"http://{host}:{port}/bulk.json", server=server)
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_writes_file_atomically(tmp_path, range_server):
+    dest = tmp_path / "bulk.json"
+
+    result = download_resumable(requests.get, range_server.url, dest, expected_size=len(BODY))
+
+    assert dest.read_bytes() == BODY
+    assert result.size == len(BODY)
+    assert result.etag == "v1"
+    assert result.resumed_from == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["bulk.json"]
+
+
+def test_interrupted_download_resumes_with_range(tmp_path, range_server):
+    dest = tmp_path / "bulk.json"
+    range_server.server.cut_after = 300_000
+
+    with pytest.raises(TRANSFER_ERRORS):
+        download_resumable(requests.get, range_server.url, dest, expected_size=len(BODY))
+    assert not dest.exists()
+    partial_size = (tmp_path / "bulk.json.part").stat().st_size
+    assert 0 < partial_size <= 300_000
+
+    result = download_resumable(requests.get, range_server.url, dest, expected_size=len(BODY))
+
+    assert result.resumed_from == partial_size
+    assert range_server.server.requests[-1]["Range"] == f"bytes={partial_size}-"
+    assert dest.read_bytes() == BODY
+    assert not (tmp_path / "bulk.json.part").exists()
+    assert not (tmp_path / "bulk.json.part.json").exists()
+
+
+def test_changed_file_restarts_instead_of_splicing(tmp_path, range_server):
+    dest = tmp_path / "bulk.json"
+    range_server.server.cut_after = 300_000
+    with pytest.raises(TRANSFER_ERRORS):
+        download_resumable(requests.get, range_server.url, dest)
+
+    new_body = bytes(reversed(BODY))
+    range_server.server.body = new_body
+    range_server.server.etag = "v2"
+    result = download_resumable(requests.get, range_server.url, dest)
+
+    assert result.resumed_from == 0
+    assert dest.read_bytes() == new_body
+
+
+def test_gzip_encoded_transfer_resumes_and_decodes(tmp_path, range_server):
+    dest = tmp_path / "bulk.json"
+    range_server.server.gzip = True
+    range_server.server.cut_after = 2_000
+
+    with pytest.raises(TRANSFER_ERRORS):
+        download_resumable(requests.get, range_server.url, dest, expected_size=len(BODY))
+    result = download_resumable(requests.get, range_server.url, dest, expected_size=len(BODY))
+
+    assert result.resumed_from > 0
+    assert result.size == len(BODY)
+    assert dest.read_bytes() == BODY
+
+
+def test_size_mismatch_fails_verification_and_keeps_old_file(tmp_path, range_server):
+    dest = tmp_path / "bulk.json"
+    dest.write_bytes(b"previous")
+
+    with pytest.raises(DownloadVerificationError):
+        download_resumable(requests.get, range_server.url, dest, expected_size=len(BODY) + 1)
+
+    assert dest.read_bytes() == b"previous"
+    assert not (tmp_path / "bulk.json.part").exists()
+
+
+def test_etag_mismatch_fails_verification(tmp_path, range_server):
+    dest = tmp_path / "bulk.json"
+    dest.write_bytes(b"previous")
+
+    with pytest.raises(DownloadVerificationError):
+        download_resumable(requests.get, range_server.url, dest, expected_etag='"v0"')
+
+    assert dest.read_bytes() == b"previous"
+
+
+def test_chunk_size_scales_with_transfer_size():
+    assert chunk_size_for(None) == 1024 * 1024
+    assert chunk_size_for(1000) == MIN_CHUNK_SIZE
+    assert chunk_size_for(512 * 1024 * 1024) == 1024 * 1024
+    assert chunk_size_for(10 * 1024**3) == MAX_CHUNK_SIZE
@@ -0,0 +1,85 @@
+"""Tests for the latest-query-wins search executor."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from utils.search_executor import SearchCancelled, SearchExecutor
+
+
+@pytest.fixture()
+def executor():
+    # Deliver on the worker thread so tests can observe results without a wx loop.
+    instance = SearchExecutor(call_after=lambda callback, *args: callback(*args))
+    yield instance
+    instance.shutdown()
+
+
+def test_delivers_result_of_latest_query(executor):
+    delivered = threading.Event()
+    results = []
+
+    def on_result(value):
+        results.append(value)
+        delivered.set()
+
+    generation = executor.submit(lambda token: token.generation * 10, on_result)
+
+    assert delivered.wait(2)
+    assert results == [generation * 10]
+
+
+def test_superseded_query_is_cancelled_and_dropped(executor):
+    started = threading.Event()
+    release = threading.Event()
+    outcomes = []
+    delivered = threading.Event()
+
+    def slow_search(token):
+        started.set()
+        release.wait(2)
+        try:
+            token.raise_if_cancelled()
+        except SearchCancelled:
+            outcomes.append("cancelled")
+            raise
+        return "stale"
+
+    def on_result(value):
+        outcomes.append(value)
+        delivered.set()
+
+    executor.submit(slow_search, on_result)
+    assert started.wait(2)
+    executor.submit(lambda token: "fresh first", on_result)
+    executor.submit(lambda token: "fresh", on_result)
+    release.set()
+
+    assert delivered.wait(2)
+    assert outcomes == ["cancelled", "fresh"]
+
+
+def test_errors_of_latest_query_are_reported(executor):
+    errors = []
+    delivered = threading.Event()
+
+    def failing_search(token):
+        raise ValueError("boom")
+
+    def on_error(exc):
+        errors.append(str(exc))
+        delivered.set()
+
+    executor.submit(failing_search, lambda value: None, on_error)
+
+    assert delivered.wait(2)
+    assert errors == ["boom"]
+
+
+def test_submit_after_shutdown_raises(executor):
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda token: None, lambda value: None)
@@ -0,0 +1,93 @@
+"""Tests for packed thumbnail atlases."""
+
+from __future__ import annotations
+
+import pytest
+
+from utils import thumbnail_atlas
+from utils.card_images import CardImageCache
+from utils.thumbnail_atlas import ThumbnailAtlas, ThumbnailAtlasBuilder, write_atlas
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    instance = CardImageCache(cache_dir=tmp_path / "images", db_path=tmp_path / "images.db")
+    yield instance
+    instance.close()
+
+
+def _add_thumbnail(cache, uuid, name, set_code, payload, face_index=0):
+    path = cache.cache_dir / "small" / f"{uuid}-{face_index}.jpg"
+    path.write_bytes(payload)
+    cache.add_image(
+        uuid=uuid,
+        name=name,
+        set_code=set_code,
+        collector_number=str(face_index + 1),
+        image_size="small",
+        file_path=path,
+        face_index=face_index,
+    )
+    return path
+
+
+def test_atlas_round_trips_encoded_images(tmp_path):
+    first = tmp_path / "a.jpg"
+    second = tmp_path / "b.jpg"
+    first.write_bytes(b"\xff\xd8first")
+    second.write_bytes(b"\xff\xd8second")
+    path = tmp_path / "test.atlas"
+
+    meta = write_atlas(
+        path,
+        [("a", first), ("b", second), ("a", second), ("gone", tmp_path / "missing.jpg")],
+        {"signature": "abc"},
+    )
+    atlas = ThumbnailAtlas(path)
+
+    assert meta["entries"] == 2
+    assert atlas.signature == "abc"
+    assert list(atlas) == ["a", "b"] and len(atlas) == 2
+    assert atlas.get("a") == b"\xff\xd8first"
+    assert atlas.get("b") == b"\xff\xd8second"
+    assert atlas.get("gone") is None and "gone" not in atlas
+    atlas.close()
+    assert atlas._mapped._mmap.closed
+    assert atlas.get("a") is None and len(atlas) == 0
+    path.unlink()  # nothing maps the file any more
+
+
+def test_deck_atlases_are_keyed_by_name_and_pruned(cache, tmp_path, monkeypatch):
+    _add_thumbnail(cache, "uuid-opt", "Opt", "xln", b"opt")
+    _add_thumbnail(cache, "uuid-bolt", "Lightning Bolt", "m10", b"bolt")
+    monkeypatch.setattr(thumbnail_atlas, "MAX_DECK_ATLASES", 1)
+    builder = ThumbnailAtlasBuilder(cache, atlas_dir=tmp_path / "atlases")
+
+    deck = builder.ensure_deck_atlas(["Opt", "Lightning Bolt", "Uncached Card"])
+    assert deck.get("opt") == b"opt"
+    assert deck.get("lightning bolt") == b"bolt"
+    assert len(deck) == 2
+
+    builder.ensure_deck_atlas(["Opt"])
+
+    assert len(list((tmp_path / "atlases").glob("deck-*.atlas"))) == 1
+    assert deck._mapped._mmap.closed
+    builder.close()
+
+
+def test_deck_atlas_is_rebuilt_only_when_its_thumbnails_change(cache, tmp_path):
+    _add_thumbnail(cache, "uuid-opt", "Opt", "xln", b"opt")
+    builder = ThumbnailAtlasBuilder(cache, atlas_dir=tmp_path / "atlases")
+    deck = ["Opt", "Shock"]
+
+    atlas = builder.ensure_deck_atlas(deck)
+    assert list(atlas) == ["opt"]
+    assert builder.ensure_deck_atlas(deck) is atlas
+
+    _add_thumbnail(cache, "uuid-shock", "Shock", "xln", b"shock")
+    rebuilt = builder.ensure_deck_atlas(deck)
+
+    assert rebuilt is not atlas
+    assert atlas._mapped._mmap.closed
+    assert rebuilt.get("shock") == b"shock"
+    builder.close()
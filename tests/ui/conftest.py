@@ -10,6 +10,8 @@ import pytest
 if sys.platform != "win32":
     pytest.skip("wxPython UI tests must run on Windows", allow_module_level=True)
 
+from test_helpers import load_cards
+
 import navigators.mtggoldfish as mtggoldfish
 import utils.card_images as card_images
 import utils.constants as constants
@@ -21,6 +23,7 @@ from controllers.app_controller import (
 )
 from utils.card_data import CardDataManager
 from utils.constants import METAGAME_CACHE_TTL_SECONDS
+from utils.printing_index import PrintingIndex, write_printing_index
 from widgets.app_frame import AppFrame
 
 wx = pytest.importorskip("wx")
@@ -211,35 +214,35 @@ def ui_environment(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(mtggoldfish, "download_deck", fake_download, raising=False)
     monkeypatch.setattr(app_frame, "download_deck", fake_download, raising=False)
 
-    payload_data: dict[str, list[dict[str, Any]]] = {}
-    for card in SAMPLE_CARDS:
-        key = card["name_lower"]
-        payload_data.setdefault(key, []).append(
-            {
-                "id": f"{key}-id",
-                "set": "TEST",
-                "set_name": "Test Set",
-                "collector_number": "1",
-                "released_at": "2024-01-01",
-            }
-        )
-
-    fake_printing_index_payload: dict[str, Any] = {
-        "version": 1,
-        "bulk_mtime": time_module.time(),
-        "unique_names": len(payload_data),
-        "total_printings": sum(len(entries) for entries in payload_data.values()),
-        "data": payload_data,
-    }
+    printings_path = image_cache / "printings_v3.bin"
+    write_printing_index(
+        printings_path,
+        (
+            (
+                {
+                    "id": f"00000000-0000-4000-8000-{position:012d}",
+                    "set": "TEST",
+                    "set_name": "Test Set",
+                    "collector_number": "1",
+                    "released_at": "2024-01-01",
+                },
+                [card["name"]],
+            )
+            for position, card in enumerate(SAMPLE_CARDS)
+        ),
+        {"bulk_mtime": time_module.time()},
+    )
+    fake_printing_index = PrintingIndex(printings_path)
 
     monkeypatch.setattr(
         card_images,
         "ensure_printing_index_cache",
-        lambda force=False: fake_printing_index_payload,
+        lambda force=False: fake_printing_index,
         raising=False,
     )
 
     yield
+    fake_printing_index.close()
 
 
 def pump_ui_events(app: wx.App, *, max_passes: int = 25) -> None:
@@ -332,8 +335,7 @@ def deck_selector_factory(wx_app) -> AppFrame:
 
 def prepare_card_manager(frame: AppFrame) -> None:
     manager = CardDataManager()
-    manager._cards = SAMPLE_CARDS
-    manager._cards_by_name = {card["name_lower"]: card for card in SAMPLE_CARDS}
+    load_cards(manager, SAMPLE_CARDS)
     frame.card_repo.set_card_manager(manager)
     frame.card_repo.set_card_data_loading(False)
     frame.card_repo.set_card_data_ready(True)
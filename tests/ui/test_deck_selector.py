@@ -1,3 +1,5 @@
+import time
+
 import pytest
 import wx
 
@@ -42,7 +44,10 @@ def test_builder_search_populates_results(
         name_ctrl = frame.builder_panel.inputs["name"]
         name_ctrl.ChangeValue("Mountain")
         frame._on_builder_search()
-        pump_ui_events(wx.GetApp())
+        # Searches run on the builder executor; results arrive through wx.CallAfter.
+        deadline = time.monotonic() + 5
+        while not frame.builder_panel.results_ctrl.GetItemCount() and time.monotonic() < deadline:
+            pump_ui_events(wx.GetApp())
 
         assert frame.builder_panel.results_ctrl is not None
         assert frame.builder_panel.results_ctrl.GetItemCount() >= 1
@@ -0,0 +1,227 @@
+"""Asyncio download engine for bulk image sync.
+
+A single event loop drives every transfer through one ``curl_cffi`` ``AsyncSession``, whose
+libcurl multi handle keeps connections to the CDN alive and reuses them (multiplexing
+requests over HTTP/2 where the server supports it). Response bodies are streamed straight to
+disk, so memory stays flat however many transfers are in flight. The number of concurrent
+transfers adapts to the server: it grows by one after each window of successes and halves
+on errors or throttling (additive increase, multiplicative decrease).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from curl_cffi.requests import AsyncSession
+from loguru import logger
+
+__all__ = ["AdaptiveConcurrency", "AsyncDownloadEngine", "DownloadError"]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Responses worth retrying (and backing off for); other 4xx codes are permanent.
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+RETRY_BACKOFF_SECONDS = 0.5
+_STOP = object()
+
+
+class DownloadError(Exception):
+    """A transfer failed permanently or ran out of retries."""
+
+
+class _RetryableStatus(Exception):
+    """The server asked us to slow down or failed transiently."""
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight transfers, between ``minimum`` and ``maximum``."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        if not 1 <= minimum <= maximum:
+            raise ValueError("Concurrency bounds must satisfy 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(max(initial, minimum), maximum)
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, outcome: bool | None) -> None:
+        """
+        Free a slot and adapt the limit.
+
+        Args:
+            outcome: True for a success, False for an error worth backing off from, None
+                for results that say nothing about server load (e.g. a 404)
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if outcome is True:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self._successes = 0
+                    if self.limit < self.maximum:
+                        self.limit += 1
+            elif outcome is False:
+                self._successes = 0
+                reduced = max(self.minimum, self.limit // 2)
+                if reduced < self.limit:
+                    logger.debug(f"Backing off download concurrency to {reduced}")
+                self.limit = reduced
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a transfer slot; the body sets ``outcome[0]`` to report how it went."""
+        await self.acquire()
+        outcome: list[bool | None] = [None]
+        try:
+            yield outcome
+        finally:
+            await self.release(outcome[0])
+
+
+class AsyncDownloadEngine:
+    """Streams many URLs to files concurrently over pooled keep-alive connections."""
+
+    def __init__(
+        self,
+        initial_concurrency: int = 16,
+        max_concurrency: int = 64,
+        min_concurrency: int = 2,
+        timeout: float = 30.0,
+        retries: int = 2,
+        retry_backoff: float = RETRY_BACKOFF_SECONDS,
+        headers: Mapping[str, str] | None = None,
+        http_version: str = "v2tls",
+    ):
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max(max_concurrency, initial_concurrency)
+        self.min_concurrency = min(min_concurrency, initial_concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.headers = dict(headers or {})
+        self.http_version = http_version
+        self.limiter: AdaptiveConcurrency | None = None
+        self._session: AsyncSession | None = None
+
+    def run(
+        self,
+        items: Iterable[T],
+        handler: Callable[[T], Awaitable[R]],
+        on_result: Callable[[T, R | Exception], None],
+    ) -> None:
+        """
+        Run ``handler`` for every item on a fresh event loop, blocking until all finish.
+
+        ``items`` is consumed lazily, so only the items being worked on are held in memory.
+        ``handler`` typically awaits :meth:`fetch_to_file`; its return value, or the
+        exception it raised, is passed to ``on_result`` on the event loop thread.
+        """
+        asyncio.run(self._run(items, handler, on_result))
+
+    async def _run(
+        self,
+        items: Iterable[T],
+        handler: Callable[[T], Awaitable[R]],
+        on_result: Callable[[T, R | Exception], None],
+    ) -> None:
+        self.limiter = AdaptiveConcurrency(
+            self.initial_concurrency, self.min_concurrency, self.max_concurrency
+        )
+        queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=self.max_concurrency)
+
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is _STOP:
+                    return
+                try:
+                    result = await handler(item)
+                except Exception as exc:
+                    result = exc
+                on_result(item, result)
+
+        async with AsyncSession(
+            max_clients=self.max_concurrency,
+            headers=self.headers,
+            http_version=self.http_version,
+        ) as session:
+            self._session = session
+            workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+            try:
+                for item in items:
+                    await queue.put(item)
+                for _ in workers:
+                    await queue.put(_STOP)
+                await asyncio.gather(*workers)
+            finally:
+                for task in workers:
+                    task.cancel()
+                self._session = None
+
+    async def fetch_to_file(self, url: str, dest: Path) -> int:
+        """
+        Stream ``url`` into ``dest``, retrying transient failures.
+
+        The body is written to a ``.part`` file and moved into place once complete, so an
+        interrupted transfer never leaves a truncated image behind.
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            DownloadError: On a permanent HTTP error or once retries are exhausted
+        """
+        if self._session is None or self.limiter is None:
+            raise RuntimeError("fetch_to_file must be called from a handler passed to run()")
+        error = "no attempts made"
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            async with self.limiter.slot() as outcome:
+                try:
+                    written = await self._stream_once(url, dest)
+                except _RetryableStatus as exc:
+                    outcome[0] = False
+                    error = str(exc)
+                    continue
+                except OSError as exc:  # includes timeouts and curl transfer errors
+                    outcome[0] = False
+                    error = f"{type(exc).__name__}: {exc}"
+                    continue
+                outcome[0] = True
+                return written
+        raise DownloadError(f"{url}: {error} (after {self.retries + 1} attempts)")
+
+    async def _stream_once(self, url: str, dest: Path) -> int:
+        partial = dest.with_name(dest.name + ".part")
+        written = 0
+        try:
+            async with self._session.stream("GET", url, timeout=self.timeout) as response:
+                status = response.status_code
+                if status in RETRYABLE_STATUS:
+                    raise _RetryableStatus(f"HTTP {status}")
+                if status >= 400:
+                    raise DownloadError(f"{url}: HTTP {status}")
+                with partial.open("wb") as fh:
+                    async for chunk in response.aiter_content():
+                        fh.write(chunk)
+                        written += len(chunk)
+            os.replace(partial, dest)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return written
@@ -0,0 +1,295 @@
+"""Building blocks for versioned, memory-mapped binary index files.
+
+A file consists of a fixed header, a JSON directory and a sequence of 8-byte aligned
+sections holding ``array`` data in native byte order::
+
+    magic (8 bytes) | format version (u32) | directory length (u32) | directory JSON
+    | section data ...
+
+Readers map the file once and expose each section as a typed ``memoryview``, so opening
+an index costs the same regardless of how many records it contains. Strings are stored
+as an offsets section plus a UTF-8 blob and are decoded only when accessed, and name
+lookups go through an open-addressing hash table keyed by CRC-32.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+_HEADER = struct.Struct("<8sII")
+_ALIGNMENT = 8
+
+
+class IndexFormatError(ValueError):
+    """Raised when a binary index file is missing, truncated or of another version."""
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def pack_strings(strings: Iterable[str | None], separator: bytes = b"") -> tuple[array, bytes]:
+    """
+    Pack strings into an offsets array and a UTF-8 blob.
+
+    ``offsets[i]:offsets[i + 1]`` (minus the optional separator) is the i-th string;
+    ``None`` is stored as an empty string.
+    """
+    offsets = array("Q", [0])
+    chunks: list[bytes] = []
+    total = 0
+    for value in strings:
+        encoded = (value or "").encode("utf-8") + separator
+        chunks.append(encoded)
+        total += len(encoded)
+        offsets.append(total)
+    return offsets, b"".join(chunks)
+
+
+def _hash_key(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8"))
+
+
+def build_hash_table(keys: Sequence[str], values: Sequence[int]) -> array:
+    """
+    Build an open-addressing hash table mapping ``keys[i]`` to ``values[i]``.
+
+    Slots are stored as ``(key index + 1, value)`` pairs; a zero key index marks an
+    empty slot. The table is sized to a power of two at most half full.
+    """
+    capacity = 8
+    while capacity < len(keys) * 2:
+        capacity *= 2
+    slots = array("I", bytes(capacity * 2 * 4))
+    mask = capacity - 1
+    for key_index, (key, value) in enumerate(zip(keys, values)):
+        slot = _hash_key(key) & mask
+        while slots[slot * 2]:
+            slot = (slot + 1) & mask
+        slots[slot * 2] = key_index + 1
+        slots[slot * 2 + 1] = value
+    return slots
+
+
+def write_index_file(
+    path: Path,
+    magic: bytes,
+    version: int,
+    sections: dict[str, array | bytes],
+    meta: dict[str, Any] | None = None,
+) -> None:
+    """Atomically write ``sections`` (and JSON-serializable ``meta``) to ``path``."""
+    layout: dict[str, list[Any]] = {}
+    offset = 0
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else "B"
+        nbytes = len(data) * data.itemsize if isinstance(data, array) else len(data)
+        layout[name] = [typecode, offset, nbytes]
+        offset = _align(offset + nbytes)
+    directory = json.dumps(
+        {"byteorder": sys.byteorder, "sections": layout, "meta": meta or {}},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    data_start = _align(_HEADER.size + len(directory))
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        fh.write(_HEADER.pack(magic.ljust(8, b"\0"), version, len(directory)))
+        fh.write(directory)
+        for name, data in sections.items():
+            fh.seek(data_start + layout[name][1])
+            fh.write(data.tobytes() if isinstance(data, array) else data)
+        fh.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+class MappedIndexFile:
+    """A read-only memory mapping of a file written by :func:`write_index_file`."""
+
+    def __init__(self, path: Path, magic: bytes, version: int):
+        self.path = Path(path)
+        try:
+            with self.path.open("rb") as fh:
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            raise IndexFormatError(f"Cannot map {self.path}: {exc}") from exc
+        try:
+            self._sections, self.meta = self._read_directory(magic, version)
+        except Exception:
+            self._mmap.close()
+            raise
+        self._view = memoryview(self._mmap)
+        # Every view handed out by section(), so close() can release them all.
+        self._section_views: list[memoryview] = []
+        self._closed = False
+
+    def _read_directory(
+        self, magic: bytes, version: int
+    ) -> tuple[dict[str, tuple[str, int, int]], dict[str, Any]]:
+        if len(self._mmap) < _HEADER.size:
+            raise IndexFormatError(f"{self.path} is truncated")
+        file_magic, file_version, directory_length = _HEADER.unpack_from(self._mmap, 0)
+        if file_magic != magic.ljust(8, b"\0"):
+            raise IndexFormatError(f"{self.path} is not a {magic.decode()} index")
+        if file_version != version:
+            raise IndexFormatError(
+                f"{self.path} has format version {file_version}, expected {version}"
+            )
+        try:
+            directory = json.loads(
+                self._mmap[_HEADER.size : _HEADER.size + directory_length].decode("utf-8")
+            )
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise IndexFormatError(f"{self.path} has a corrupt directory: {exc}") from exc
+        if directory.get("byteorder") != sys.byteorder:
+            raise IndexFormatError(f"{self.path} was written with a different byte order")
+        data_start = _align(_HEADER.size + directory_length)
+        sections: dict[str, tuple[str, int, int]] = {}
+        for name, (typecode, offset, nbytes) in directory["sections"].items():
+            start = data_start + offset
+            if start + nbytes > len(self._mmap):
+                raise IndexFormatError(f"{self.path} is truncated (section {name})")
+            sections[name] = (typecode, start, nbytes)
+        return sections, directory.get("meta") or {}
+
+    def has_section(self, name: str) -> bool:
+        return name in self._sections
+
+    def section(self, name: str) -> memoryview:
+        """Return a typed, zero-copy view of a section."""
+        try:
+            typecode, start, nbytes = self._sections[name]
+        except KeyError as exc:
+            raise IndexFormatError(f"{self.path} has no section {name!r}") from exc
+        if self._closed:
+            raise ValueError(f"{self.path} is closed")
+        view = self._view[start : start + nbytes].cast(typecode)
+        self._section_views.append(view)
+        return view
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def find(self, needle: bytes, start: int, end: int) -> int:
+        """``mmap.find`` over absolute file offsets."""
+        return self._mmap.find(needle, start, end)
+
+    def section_start(self, name: str) -> int:
+        return self._sections[name][1]
+
+    def close(self) -> None:
+        """
+        Unmap the file, releasing every view handed out by :meth:`section`.
+
+        Released views raise ``ValueError`` when used, so owners should drop them too.
+        The file can be replaced or deleted once this returns, even on Windows.
+
+        Raises:
+            BufferError: If slices taken from a section view are still alive
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for view in self._section_views:
+            view.release()
+        self._section_views.clear()
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError as exc:
+            raise BufferError(
+                f"{self.path} cannot be unmapped while slices of its sections are in use"
+            ) from exc
+
+
+class MappedStrings(Sequence[str]):
+    """Lazily decoded strings stored by :func:`pack_strings` in a mapped file."""
+
+    def __init__(self, mapped: MappedIndexFile, name: str, separator: bytes = b""):
+        self._mapped = mapped
+        self._offsets = mapped.section(f"{name}.offsets")
+        self._blob = mapped.section(f"{name}.blob")
+        self._blob_start = mapped.section_start(f"{name}.blob")
+        self._trim = len(separator)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        start = self._offsets[index]
+        end = self._offsets[index + 1] - self._trim
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def positions_containing(
+        self, needle: str, candidates: Iterable[int] | None = None
+    ) -> list[int]:
+        """Return positions whose string contains ``needle`` without decoding them."""
+        encoded = needle.encode("utf-8")
+        offsets = self._offsets
+        base = self._blob_start
+        find = self._mapped.find
+        if candidates is not None:
+            return [
+                position
+                for position in candidates
+                if find(encoded, base + offsets[position], base + offsets[position + 1]) != -1
+            ]
+        matches: list[int] = []
+        end = base + offsets[len(offsets) - 1]
+        hit = find(encoded, base, end)
+        while hit != -1:
+            position = bisect.bisect_right(offsets, hit - base) - 1
+            matches.append(position)
+            hit = find(encoded, base + offsets[position + 1], end)
+        return matches
+
+
+class MappedHashTable:
+    """Read-only lookup over a table written by :func:`build_hash_table`."""
+
+    def __init__(self, slots: memoryview, keys: Sequence[str]):
+        self._slots = slots
+        self._keys = keys
+        self._mask = len(slots) // 2 - 1
+
+    def get(self, key: str, default: int | None = None) -> int | None:
+        slots = self._slots
+        slot = _hash_key(key) & self._mask
+        while True:
+            key_index = slots[slot * 2]
+            if not key_index:
+                return default
+            if self._keys[key_index - 1] == key:
+                return slots[slot * 2 + 1]
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+__all__ = [
+    "IndexFormatError",
+    "MappedHashTable",
+    "MappedIndexFile",
+    "MappedStrings",
+    "build_hash_table",
+    "pack_strings",
+    "write_index_file",
+]
@@ -4,13 +4,28 @@ import hashlib
 import io
 import json
 import zipfile
+from collections.abc import Iterable, Mapping
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from curl_cffi import requests
 from loguru import logger
 
+from utils.card_index_file import (
+    IndexFormatError,
+    is_current_card_index,
+    open_card_index,
+    write_card_index,
+)
+from utils.card_search_index import CardSearchIndex
+from utils.card_store import COLOR_BITS, CardStore, CardStoreDelta, color_mask
 from utils.constants import ATOMIC_DATA_URL, CARD_DATA_DIR
+from utils.json_stream import iter_json_object
+from utils.name_completer import NameCompleter
+from utils.resumable_download import chunk_size_for, download_resumable
+
+if TYPE_CHECKING:
+    from utils.card_filter_engine import CardFilterEngine
 
 
 def load_card_manager(data_dir: Path | str = CARD_DATA_DIR, force: bool = False) -> CardDataManager:
@@ -39,16 +54,25 @@ class CardDataManager:
     def __init__(self, data_dir: Path | str = CARD_DATA_DIR):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.index_path = self.data_dir / "atomic_cards_index.json"
+        self.index_path = self.data_dir / "atomic_cards_index.bin"
+        # Pre-binary releases stored the whole index as JSON; migrated on first start.
+        self.legacy_index_path = self.data_dir / "atomic_cards_index.json"
         self.meta_path = self.data_dir / "atomic_cards_meta.json"
-        self._cards: list[dict[str, Any]] | None = None
-        self._cards_by_name: dict[str, dict[str, Any]] | None = None
+        # Downloaded archive; kept (as a .part file) only while a transfer is incomplete.
+        self.archive_path = self.data_dir / "AtomicCards.json.zip"
+        self._cards: CardStore | None = None
+        self._search_index: CardSearchIndex | None = None
+        self._filter_engine: CardFilterEngine | None = None
+        self._name_completer: NameCompleter | None = None
+        # Card-level changes made by the last refresh (None after a full rebuild).
+        self.last_refresh: CardStoreDelta | None = None
 
     def ensure_latest(self, force: bool = False) -> None:
 
+        self._migrate_legacy_index()
         remote_meta = self._fetch_remote_meta()
         local_meta = self._load_json(self.meta_path) or {}
-        missing_index = not self.index_path.exists()
+        missing_index = not is_current_card_index(self.index_path)
         needs_refresh = force or missing_index
         if not needs_refresh and remote_meta:
             remote_size = remote_meta.get("content_length")
@@ -83,51 +107,58 @@ class CardDataManager:
         limit: int | None = None,
     ) -> list[dict[str, Any]]:
         self._require_cards()
-        query = (query or "").strip().lower()
+        cards = self._cards
         fmt = (format_filter or "").strip().lower()
         type_filter = (type_filter or "").strip().lower()
-        color_identity = [c.upper() for c in (color_identity or [])]
-        results: list[dict[str, Any]] = []
-        for card in self._cards or []:
-            name_lower = card["name_lower"]
-            type_line = (card.get("type_line") or "").lower()
-            oracle_text = (card.get("oracle_text") or "").lower()
-            if query:
-                haystacks = (
-                    name_lower,
-                    type_line,
-                    oracle_text,
-                )
-                if not any(query in h for h in haystacks if h):
-                    continue
-            if fmt and card.get("legalities", {}).get(fmt) != "Legal":
+        required_colors = [c.upper() for c in (color_identity or [])]
+        if any(color not in COLOR_BITS for color in required_colors):
+            return []
+        required_mask = color_mask(required_colors)
+        if self._search_index is None:
+            self._search_index = CardSearchIndex.from_haystacks(cards.haystacks())
+        positions: list[int] = []
+        for position in self._search_index.search(query or ""):
+            if fmt and not cards.is_legal(position, fmt):
                 continue
-            if type_filter and type_filter not in type_line:
+            if type_filter and type_filter not in (cards.text("type_line", position) or "").lower():
                 continue
-            if color_identity:
-                identity = card.get("color_identity", [])
-                if not all(c in identity for c in color_identity):
-                    continue
-            results.append(card)
-            if limit and len(results) >= limit:
+            if cards.color_identity_mask(position) & required_mask != required_mask:
+                continue
+            positions.append(position)
+            if limit and len(positions) >= limit:
                 break
-        return results
+        # A real list: callers may keep, mutate or pickle it past a reload of the store.
+        return [cards[position] for position in positions]
+
+    def filter_engine(self) -> CardFilterEngine:
+        """Return the bitmask filter engine over the loaded cards."""
+        self._require_cards()
+        if self._filter_engine is None:
+            # Imported lazily: the mana filters pull in wx via mana_icon_factory.
+            from utils.card_filter_engine import CardFilterEngine
+
+            if self._search_index is None:
+                self._search_index = CardSearchIndex.from_haystacks(self._cards.haystacks())
+            self._filter_engine = CardFilterEngine(self._cards, self._search_index)
+        return self._filter_engine
+
+    def name_completer(self) -> NameCompleter:
+        """Return the name/alias completer over the loaded cards."""
+        self._require_cards()
+        if self._name_completer is None:
+            cards = self._cards
+            self._name_completer = NameCompleter(
+                alias for position in range(len(cards)) for alias in cards.aliases(position)
+            )
+        return self._name_completer
 
     def get_card(self, name: str) -> dict[str, Any] | None:
         self._require_cards()
-        return (self._cards_by_name or {}).get(name.lower())
+        return self._cards.get(name)
 
     def available_formats(self) -> list[str]:
         self._require_cards()
-        seen = set()
-        formats: list[str] = []
-        for card in self._cards or []:
-            for fmt, state in (card.get("legalities") or {}).items():
-                if state != "Legal" or fmt in seen:
-                    continue
-                seen.add(fmt)
-                formats.append(fmt)
-        return sorted(formats)
+        return self._cards.available_formats()
 
     def _require_cards(self) -> None:
         if self._cards is None:
@@ -154,34 +185,120 @@ class CardDataManager:
         return meta or None
 
     def _download_and_rebuild(self, remote_meta: dict[str, Any] | None) -> None:
-        resp = requests.get(ATOMIC_DATA_URL, impersonate="chrome", timeout=300)
-        resp.raise_for_status()
-        content = resp.content
-        digest = hashlib.sha512(content).hexdigest()
-        with zipfile.ZipFile(io.BytesIO(content)) as zf:
-            with zf.open("AtomicCards.json") as source:
-                raw = json.load(source)
-        index = self._build_index(raw.get("data", {}))
-        self.index_path.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
-        meta_to_store: dict[str, Any] = remote_meta.copy() if remote_meta else {}
-        meta_to_store.setdefault("sha512", digest)
-        headers = {k.lower(): v for k, v in resp.headers.items()}  # type: ignore[arg-type]
+        remote_meta = remote_meta or {}
+        expected_size = remote_meta.get("content_length")
+        download = download_resumable(
+            requests.get,
+            ATOMIC_DATA_URL,
+            self.archive_path,
+            expected_size=int(expected_size) if str(expected_size).isdigit() else None,
+            expected_etag=remote_meta.get("etag"),
+            timeout=300,
+            impersonate="chrome",
+        )
+        digest = hashlib.sha512()
+        with self.archive_path.open("rb") as fh:
+            while chunk := fh.read(chunk_size_for(download.size)):
+                digest.update(chunk)
+        # Cards are decoded one at a time straight from the compressed member, so only the
+        # simplified index is ever held in memory, not the full AtomicCards payload.
+        with zipfile.ZipFile(self.archive_path) as zf:
+            with zf.open("AtomicCards.json") as member:
+                source = io.TextIOWrapper(member, encoding="utf-8")
+                index = self._build_index(iter_json_object(source, path=("data",)))
+        self.last_refresh = self._write_index(index["cards"])
+        if self.last_refresh is not None:
+            logger.info(f"Card data refreshed: {self.last_refresh.summary()}")
+        self.archive_path.unlink(missing_ok=True)
+        meta_to_store: dict[str, Any] = remote_meta.copy()
+        meta_to_store.setdefault("sha512", digest.hexdigest())
+        headers = download.headers
         if "etag" in headers:
             meta_to_store.setdefault("etag", headers["etag"].strip('"'))
         if "last-modified" in headers:
             meta_to_store.setdefault("last_modified", headers["last-modified"])
-        if "content-length" in headers:
+        if "content-length" in headers and not download.resumed_from:
             meta_to_store.setdefault("content_length", headers["content-length"])
+        meta_to_store.setdefault("content_length", str(download.size))
         self.meta_path.write_text(json.dumps(meta_to_store, ensure_ascii=False), encoding="utf-8")
-        self._cards = index["cards"]
-        self._cards_by_name = index["cards_by_name"]
+
+    def _write_index(self, cards: list[dict[str, Any]]) -> CardStoreDelta | None:
+        """
+        Pack simplified cards into the binary index file.
+
+        If the index on disk carries card digests, the new cards are diffed against it: the
+        file is left alone when no card changed, and otherwise only new and changed cards
+        are tokenized for the search index while everything else is carried over.
+
+        Returns:
+            Added, removed and changed cards, or None if there was no index to diff against
+        """
+        store = CardStore.from_cards(cards)
+        delta: CardStoreDelta | None = None
+        search_index: CardSearchIndex | None = None
+        previous = self._open_previous_index()
+        if previous is not None:
+            previous_store, previous_search = previous
+            try:
+                delta = store.diff(previous_store)
+                if delta:
+                    search_index = CardSearchIndex.patched(
+                        previous_search, store.haystacks(), delta.carried
+                    )
+            finally:
+                # Unmaps the file; both objects share the mapping.
+                previous_search.close()
+                previous_store.close()
+            del previous, previous_store, previous_search
+        if delta is not None and not delta:
+            logger.info("Card index is already up to date")
+            return delta
+        if search_index is None:
+            search_index = CardSearchIndex.from_haystacks(store.haystacks())
+        # Every mapping of the file has to go before it can be replaced (Windows).
+        self._close_index()
+        write_card_index(self.index_path, store, search_index)
+        return delta
+
+    def _open_previous_index(self) -> tuple[CardStore, CardSearchIndex] | None:
+        if not is_current_card_index(self.index_path):
+            return None
+        try:
+            return open_card_index(self.index_path)
+        except IndexFormatError:
+            return None
+
+    def _migrate_legacy_index(self) -> None:
+        """Convert an ``atomic_cards_index.json`` from older releases to the binary index."""
+        if not self.legacy_index_path.exists():
+            return
+        if not is_current_card_index(self.index_path):
+            data = self._load_json(self.legacy_index_path)
+            if not data or not isinstance(data.get("cards"), list):
+                return
+            logger.info("Migrating atomic_cards_index.json to the binary card index")
+            self._write_index(data["cards"])
+        try:
+            self.legacy_index_path.unlink()
+        except OSError as exc:
+            logger.warning(f"Could not remove legacy card index: {exc}")
 
     def _load_index(self) -> None:
-        data = self._load_json(self.index_path)
-        if not data:
-            raise RuntimeError("Card data index missing or invalid")
-        self._cards = data["cards"]
-        self._cards_by_name = data["cards_by_name"]
+        self._close_index()
+        try:
+            self._cards, self._search_index = open_card_index(self.index_path)
+        except IndexFormatError as exc:
+            raise RuntimeError("Card data index missing or invalid") from exc
+
+    def _close_index(self) -> None:
+        if self._search_index is not None:
+            self._search_index.close()
+        if self._cards is not None:
+            self._cards.close()
+        self._cards = None
+        self._search_index = None
+        self._filter_engine = None
+        self._name_completer = None
 
     def _load_json(self, path: Path) -> dict[str, Any] | None:
         if not path.exists():
@@ -192,10 +309,15 @@ class CardDataManager:
             logger.warning(f"Invalid JSON at {path}: {exc}")
             return None
 
-    def _build_index(self, atomic_cards: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+    def _build_index(
+        self,
+        atomic_cards: Mapping[str, list[dict[str, Any]]] | Iterable[tuple[str, Any]],
+    ) -> dict[str, Any]:
+        """Simplify AtomicCards ``data`` (a mapping, or its items as a stream) into the index."""
         cards: dict[str, dict[str, Any]] = {}
         alias_map: dict[str, dict[str, Any]] = {}
-        for variations in atomic_cards.values():
+        entries = atomic_cards.items() if isinstance(atomic_cards, Mapping) else atomic_cards
+        for _name, variations in entries:
             if not isinstance(variations, list):
                 continue
             for printing in variations:
@@ -0,0 +1,238 @@
+"""Whole-collection bitmask filters over a :class:`~utils.card_store.CardStore`.
+
+Every predicate of the deck builder search evaluates to a bitset (a Python ``int`` whose
+bit *i* is set when the card at position *i* matches), so combining filters is a handful
+of ``&`` operations instead of a per-card Python loop. The bitsets are backed by
+precomputed groupings of the store's columns:
+
+- legality: one bitset per format
+- colour identity: one bitset per 5-bit WUBRG mask (32 buckets)
+- mana value: one bitset per distinct value
+- mana cost and type line: positions per distinct string, with mana costs tokenized into
+  symbol counts once per distinct cost rather than once per card and query
+
+Each grouping is built lazily on first use. Text predicates go through the trigram
+:class:`~utils.card_search_index.CardSearchIndex` and only verify the cards that survived
+the cheaper predicates.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from utils.card_search_index import NGRAM_SIZE, CardSearchIndex
+from utils.card_store import COLOR_ORDER, CardRecordList, CardStore, mask_colors
+from utils.search_executor import CancellationToken
+from utils.search_filters import (
+    mana_symbol_counts,
+    matches_color_filter,
+    matches_mana_counts,
+    matches_mana_value,
+)
+
+# Below this many surviving cards, text predicates verify candidates directly instead of
+# asking the search index for every match in the collection.
+TEXT_VERIFY_LIMIT = 2048
+
+# How many candidates text verification checks between cancellation checkpoints.
+CANCEL_CHECK_INTERVAL = 512
+
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def positions_to_bits(positions: Iterable[int], size: int) -> int:
+    """Return a bitset with the bits of ``positions`` (all below ``size``) set."""
+    buffer = bytearray((size + 7) >> 3)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def bits_to_positions(bits: int, limit: int | None = None) -> list[int]:
+    """Return the ascending positions set in ``bits``, at most ``limit`` of them."""
+    positions: list[int] = []
+    data = bits.to_bytes((bits.bit_length() + 7) >> 3, "little")
+    for index, byte in enumerate(data):
+        if not byte:
+            continue
+        base = index << 3
+        for bit in _BYTE_BITS[byte]:
+            positions.append(base + bit)
+        if limit is not None and len(positions) >= limit:
+            return positions[:limit]
+    return positions
+
+
+def _group_positions(column: Sequence[Any]) -> dict[Any, list[int]]:
+    groups: dict[Any, list[int]] = {}
+    for position, value in enumerate(column):
+        group = groups.get(value)
+        if group is None:
+            groups[value] = [position]
+        else:
+            group.append(position)
+    return groups
+
+
+class CardFilterEngine:
+    """Bitset predicates over the cards of one :class:`CardStore`."""
+
+    def __init__(self, store: CardStore, search_index: CardSearchIndex):
+        self._store = store
+        self._search_index = search_index
+        self._size = len(store)
+        self.everything = (1 << self._size) - 1
+        self._format_bits: dict[str, int] = {}
+        self._identity_bits: list[int] | None = None
+        self._mana_value_bits: dict[float, int] | None = None
+        self._mana_costs: list[tuple[Any, list[int]]] | None = None
+        self._type_lines: list[tuple[str, list[int]]] | None = None
+
+    @property
+    def store(self) -> CardStore:
+        return self._store
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ============= Predicates =============
+
+    def legal(self, fmt: str) -> int:
+        """Cards legal in ``fmt``."""
+        bits = self._format_bits.get(fmt)
+        if bits is None:
+            bits = positions_to_bits(self._store.legal_positions(fmt), self._size)
+            self._format_bits[fmt] = bits
+        return bits
+
+    def color_identity(self, selected: Sequence[str], mode: str) -> int:
+        """Cards whose colour identity satisfies ``matches_color_filter``."""
+        if not selected or mode == "Any":
+            return self.everything
+        if self._identity_bits is None:
+            groups = _group_positions(self._store.color_identity_column())
+            self._identity_bits = [
+                positions_to_bits(groups.get(mask, ()), self._size)
+                for mask in range(1 << len(COLOR_ORDER))
+            ]
+        bits = 0
+        for mask, mask_bits in enumerate(self._identity_bits):
+            if mask_bits and matches_color_filter(mask_colors(mask), list(selected), mode):
+                bits |= mask_bits
+        return bits
+
+    def mana_value(self, target: float, comparator: str) -> int:
+        """Cards whose mana value compares to ``target`` (cards without one never match)."""
+        if comparator == "Any":
+            return self.everything
+        if self._mana_value_bits is None:
+            groups = _group_positions(self._store.mana_value_column())
+            self._mana_value_bits = {
+                value: positions_to_bits(positions, self._size)
+                for value, positions in groups.items()
+                if not math.isnan(value)
+            }
+        bits = 0
+        for value, value_bits in self._mana_value_bits.items():
+            if matches_mana_value(value, target, comparator):
+                bits |= value_bits
+        return bits
+
+    def mana_cost(self, query: str, mode: str) -> int:
+        """Cards whose mana cost contains (or, in ``"exact"`` mode, equals) ``query``."""
+        query_counts = mana_symbol_counts(query)
+        if not query_counts:
+            return self.everything
+        if self._mana_costs is None:
+            store = self._store
+            self._mana_costs = [
+                (mana_symbol_counts((store.string(string_id) or "").upper()), positions)
+                for string_id, positions in _group_positions(store.text_ids("mana_cost")).items()
+            ]
+        matched: list[int] = []
+        for counts, positions in self._mana_costs:
+            if matches_mana_counts(counts, query_counts, mode):
+                matched.extend(positions)
+        return positions_to_bits(matched, self._size)
+
+    def type_contains(self, needle: str) -> int:
+        """Cards whose type line contains ``needle`` (case-insensitive)."""
+        needle = needle.lower()
+        if not needle:
+            return self.everything
+        if self._type_lines is None:
+            store = self._store
+            self._type_lines = [
+                ((store.string(string_id) or "").lower(), positions)
+                for string_id, positions in _group_positions(store.text_ids("type_line")).items()
+            ]
+        matched: list[int] = []
+        for type_line, positions in self._type_lines:
+            if needle in type_line:
+                matched.extend(positions)
+        return positions_to_bits(matched, self._size)
+
+    def named(self, names: Iterable[str]) -> int:
+        """Cards whose canonical name is exactly one of ``names``."""
+        store = self._store
+        matched = []
+        for name in names:
+            position = store.position_of(name)
+            if position is not None and store.text("name", position) == name:
+                matched.append(position)
+        return positions_to_bits(matched, self._size)
+
+    def text_contains(
+        self,
+        field: str,
+        needle: str,
+        within: int | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> int:
+        """
+        Cards whose ``field`` ("name" or "oracle_text") contains ``needle``.
+
+        Args:
+            field: Text field to check
+            needle: Case-insensitive substring
+            within: Optional bitset of cards still in play; only these are checked
+            cancel_token: Optional token checked periodically while verifying candidates
+
+        Returns:
+            Bitset of matching cards (a subset of ``within`` when given)
+
+        Raises:
+            SearchCancelled: If ``cancel_token`` is cancelled mid-scan
+        """
+        needle = needle.lower()
+        within = self.everything if within is None else within
+        if not needle or not within:
+            return within
+        if within.bit_count() <= TEXT_VERIFY_LIMIT or len(needle.strip()) < NGRAM_SIZE:
+            # The trigram index cannot narrow short needles; check the survivors directly.
+            candidates = bits_to_positions(within)
+        else:
+            matches = positions_to_bits(self._search_index.search(needle), self._size)
+            candidates = bits_to_positions(matches & within)
+        text = self._store.text
+        matched: list[int] = []
+        for index, position in enumerate(candidates):
+            if cancel_token is not None and index % CANCEL_CHECK_INTERVAL == 0:
+                cancel_token.raise_if_cancelled()
+            if needle in (text(field, position) or "").lower():
+                matched.append(position)
+        return positions_to_bits(matched, self._size)
+
+    # ============= Results =============
+
+    def positions(self, bits: int, limit: int | None = None) -> list[int]:
+        return bits_to_positions(bits, limit)
+
+    def records(self, bits: int, limit: int | None = None) -> CardRecordList:
+        """Return the cards set in ``bits`` in store order, lazily materialized."""
+        return self._store.records(bits_to_positions(bits, limit))
+
+
+__all__ = ["CardFilterEngine", "bits_to_positions", "positions_to_bits"]
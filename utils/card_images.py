@@ -8,7 +8,8 @@ This module provides functionality to:
 
 Architecture:
 - Uses Scryfall bulk data JSON for card metadata
-- Downloads images from cards.scryfall.io CDN (no rate limits)
+- Downloads images from cards.scryfall.io CDN (no rate limits) on an asyncio engine with
+  pooled connections and adaptive concurrency (see utils.async_downloads)
 - Stores images locally with UUID-based filenames
 - SQLite database tracks downloaded images and metadata
 - Supports multiple image sizes (small, normal, large, png)
@@ -16,11 +17,14 @@ Architecture:
 
 from __future__ import annotations
 
-import json
 import os
 import sqlite3
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from itertools import islice
+from types import MappingProxyType
 
 try:  # Python 3.11+ has UTC
     from datetime import UTC
@@ -32,14 +36,21 @@ from typing import Any
 import requests
 from loguru import logger
 
+from utils.async_downloads import AsyncDownloadEngine
+from utils.binary_index import IndexFormatError
 from utils.constants import BULK_DATA_CACHE_FRESHNESS_SECONDS, CACHE_DIR
+from utils.json_stream import iter_json_array
+from utils.printing_index import PrintingIndex, write_printing_index
+from utils.resumable_download import download_resumable
+from utils.sqlite_pool import BatchedWriter, SQLiteConnectionPool
 
 # Image cache configuration
 IMAGE_CACHE_DIR = CACHE_DIR / "card_images"
 IMAGE_DB_PATH = IMAGE_CACHE_DIR / "images.db"
 BULK_DATA_CACHE = IMAGE_CACHE_DIR / "bulk_data.json"
-PRINTING_INDEX_VERSION = 2
-PRINTING_INDEX_CACHE = IMAGE_CACHE_DIR / f"printings_v{PRINTING_INDEX_VERSION}.json"
+PRINTING_INDEX_VERSION = 3
+_NO_CACHED_FACES: Mapping[tuple[str, int], Path] = MappingProxyType({})
+PRINTING_INDEX_CACHE = IMAGE_CACHE_DIR / f"printings_v{PRINTING_INDEX_VERSION}.bin"
 
 # Image size options (in order of preference for storage)
 IMAGE_SIZES = {
@@ -51,9 +62,48 @@ IMAGE_SIZES = {
 
 # Download configuration
 BULK_DATA_URL = "https://api.scryfall.com/bulk-data/default-cards"
-MAX_WORKERS = 10  # Concurrent download threads
-CHUNK_SIZE = 8192  # Download chunk size
+MAX_WORKERS = 10  # Concurrent image transfers at the start of a bulk download
+MAX_CONCURRENT_DOWNLOADS = 64  # Ceiling for adaptive transfer concurrency
 REQUEST_TIMEOUT = 30  # Seconds
+IMAGE_WRITE_BATCH_SIZE = 500  # Rows per transaction while bulk downloading
+
+_INSERT_IMAGE_SQL = """
+    INSERT OR REPLACE INTO card_images
+    (uuid, face_index, name, set_code, collector_number, image_size, file_path,
+     downloaded_at, scryfall_uri, artist, name_key)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_DELETE_ALIASES_SQL = """
+    DELETE FROM card_image_aliases WHERE uuid = ? AND face_index = ? AND image_size = ?
+"""
+_INSERT_ALIAS_SQL = """
+    INSERT OR REPLACE INTO card_image_aliases (alias_key, image_size, position, uuid, face_index)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _name_key(name: str | None) -> str:
+    """Normalized form of a card name used for case-insensitive lookups."""
+    return (name or "").strip().lower()
+
+
+def _face_alias_keys(name: str | None) -> list[str]:
+    """Name keys of the individual faces of a split or double-faced name, front first."""
+    if not name or "//" not in name:
+        return []
+    return [key for key in (_name_key(piece) for piece in name.split("//")) if key]
+
+
+def _image_statements(row: tuple[Any, ...]) -> list[tuple[str, tuple[Any, ...]]]:
+    """Statements storing one card_images row along with its face aliases."""
+    uuid, face_index, name, image_size = row[0], row[1], row[2], row[5]
+    statements = [
+        (_INSERT_IMAGE_SQL, row),
+        (_DELETE_ALIASES_SQL, (uuid, face_index, image_size)),
+    ]
+    for position, alias_key in enumerate(_face_alias_keys(name)):
+        statements.append((_INSERT_ALIAS_SQL, (alias_key, image_size, position, uuid, face_index)))
+    return statements
 
 
 class CardImageCache:
@@ -66,6 +116,9 @@ class CardImageCache:
         self.cache_dir = self.cache_dir.resolve()
         self.db_path = self.db_path.resolve()
         self._path_roots = self._build_path_roots()
+        self._pool = SQLiteConnectionPool(self.db_path)
+        self._writer: BatchedWriter | None = None
+        self._writer_lock = threading.Lock()
         self._init_database()
 
     def _ensure_directories(self) -> None:
@@ -97,10 +150,54 @@ class CardImageCache:
 
     def _init_database(self) -> None:
         """Initialize SQLite database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connection() as conn:
             self._create_schema(conn)
             self._ensure_face_index_support(conn)
-            conn.commit()
+            self._ensure_name_keys(conn)
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's persistent connection to the image database."""
+        return self._pool.connection()
+
+    @contextmanager
+    def batched_writes(self) -> Iterator[None]:
+        """Queue :meth:`add_image` rows and commit them in large transactions.
+
+        Meant for bulk downloads, where committing each row would dominate. Rows are
+        committed no later than when the block exits.
+        """
+        with self._writer_lock:
+            if self._writer is not None:
+                owner = False
+            else:
+                owner = True
+                self._writer = BatchedWriter(
+                    self._pool,
+                    _INSERT_IMAGE_SQL,
+                    batch_size=IMAGE_WRITE_BATCH_SIZE,
+                    name="image-cache-writer",
+                )
+        try:
+            yield
+        finally:
+            if owner:
+                with self._writer_lock:
+                    writer, self._writer = self._writer, None
+                writer.close()
+
+    def flush_writes(self) -> None:
+        """Wait until queued :meth:`add_image` rows are committed."""
+        writer = self._writer
+        if writer is not None:
+            writer.flush()
+
+    def close(self) -> None:
+        """Commit pending writes and close all database connections."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+        self._pool.close()
 
     def _create_schema(self, conn: sqlite3.Connection) -> None:
         """Create base tables if they do not exist."""
@@ -117,6 +214,7 @@ class CardImageCache:
                 downloaded_at TEXT NOT NULL,
                 scryfall_uri TEXT,
                 artist TEXT,
+                name_key TEXT,
                 PRIMARY KEY (uuid, face_index, image_size)
             )
         """
@@ -182,6 +280,63 @@ class CardImageCache:
         )
         conn.execute("DROP TABLE card_images_old")
 
+    def _ensure_name_keys(self, conn: sqlite3.Connection) -> None:
+        """Index names by normalized key and faces of split/double-faced names by alias.
+
+        Lookups used to compare ``LOWER(name)``, which no index can serve. Rows from older
+        databases (or written by older versions) are backfilled here.
+        """
+        columns = {column[1] for column in conn.execute("PRAGMA table_info(card_images)")}
+        if "name_key" not in columns:
+            logger.info("Migrating card_images table to indexed name keys")
+            conn.execute("ALTER TABLE card_images ADD COLUMN name_key TEXT")
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_card_name_key
+            ON card_images(name_key, image_size, face_index)
+        """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS card_image_aliases (
+                alias_key TEXT NOT NULL,
+                image_size TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                uuid TEXT NOT NULL,
+                face_index INTEGER NOT NULL,
+                PRIMARY KEY (alias_key, image_size, uuid, face_index)
+            ) WITHOUT ROWID
+        """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_alias_target
+            ON card_image_aliases(uuid, face_index, image_size)
+        """
+        )
+
+        rows = conn.execute(
+            "SELECT uuid, face_index, image_size, name FROM card_images WHERE name_key IS NULL"
+        ).fetchall()
+        if not rows:
+            return
+        logger.info(f"Backfilling name keys for {len(rows)} cached images")
+        conn.executemany(
+            """
+            UPDATE card_images SET name_key = ?
+            WHERE uuid = ? AND face_index = ? AND image_size = ?
+            """,
+            [(_name_key(name), uuid, face, size) for uuid, face, size, name in rows],
+        )
+        conn.executemany(
+            _INSERT_ALIAS_SQL,
+            [
+                (alias_key, size, position, uuid, face)
+                for uuid, face, size, name in rows
+                for position, alias_key in enumerate(_face_alias_keys(name))
+            ],
+        )
+
     def _resolve_path(self, stored_path: str) -> Path:
         """Convert stored path strings into usable filesystem Paths.
 
@@ -251,58 +406,53 @@ class CardImageCache:
         Returns:
             Path to cached image file, or None if not cached
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT file_path
-                FROM card_images
-                WHERE LOWER(name) = LOWER(?) AND image_size = ?
-                ORDER BY face_index
-                LIMIT 1
-                """,
-                (card_name, size),
-            )
-            row = cursor.fetchone()
-            if row:
-                path = self._resolve_path(row[0])
-                if path.exists():
-                    return path
-
-            alias_path = self._lookup_double_faced_alias(conn, card_name, size)
-            if alias_path:
-                return alias_path
+        conn = self.connection()
+        cursor = conn.execute(
+            """
+            SELECT file_path
+            FROM card_images
+            WHERE name_key = ? AND image_size = ?
+            ORDER BY face_index
+            LIMIT 1
+            """,
+            (_name_key(card_name), size),
+        )
+        row = cursor.fetchone()
+        if row:
+            path = self._resolve_path(row[0])
+            if path.exists():
+                return path
+
+        alias_path = self._lookup_double_faced_alias(conn, card_name, size)
+        if alias_path:
+            return alias_path
         return None
 
     def _lookup_double_faced_alias(
         self, conn: sqlite3.Connection, card_name: str, size: str
     ) -> Path | None:
-        """Attempt to resolve legacy front/back alias lookups."""
-        alias = (card_name or "").strip()
-        if not alias or "//" in alias:
+        """Resolve a single face name to an image stored under the combined name."""
+        alias_key = _name_key(card_name)
+        if not alias_key or "//" in alias_key:
             return None
 
-        alias_lower = alias.lower()
-        patterns = (
-            f"{alias_lower} // %",
-            f"% // {alias_lower}",
+        rows = conn.execute(
+            """
+            SELECT images.file_path
+            FROM card_image_aliases AS aliases
+            JOIN card_images AS images
+                ON images.uuid = aliases.uuid
+                AND images.face_index = aliases.face_index
+                AND images.image_size = aliases.image_size
+            WHERE aliases.alias_key = ? AND aliases.image_size = ?
+            ORDER BY aliases.position, images.face_index
+            """,
+            (alias_key, size),
         )
-
-        for pattern in patterns:
-            cursor = conn.execute(
-                """
-                SELECT file_path
-                FROM card_images
-                WHERE LOWER(name) LIKE ? AND image_size = ?
-                ORDER BY face_index
-                LIMIT 1
-                """,
-                (pattern, size),
-            )
-            row = cursor.fetchone()
-            if row:
-                path = self._resolve_path(row[0])
-                if path.exists():
-                    return path
+        for (file_path,) in rows:
+            path = self._resolve_path(file_path)
+            if path.exists():
+                return path
         return None
 
     def get_image_by_uuid(
@@ -317,19 +467,18 @@ class CardImageCache:
             query = "SELECT file_path FROM card_images WHERE uuid = ? AND face_index = ? AND image_size = ?"
             params = (uuid, face_index, size)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            row = cursor.fetchone()
-            if row:
-                path = self._resolve_path(row[0])
-                if path.exists():
-                    return path
+        row = self.connection().execute(query, params).fetchone()
+        if row:
+            path = self._resolve_path(row[0])
+            if path.exists():
+                return path
         return None
 
     def get_image_paths_by_uuid(self, uuid: str, size: str = "normal") -> list[Path]:
         """Return all cached face images for a UUID, ordered by face index."""
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(
+        rows = (
+            self.connection()
+            .execute(
                 """
                 SELECT face_index, file_path
                 FROM card_images
@@ -337,7 +486,9 @@ class CardImageCache:
                 ORDER BY face_index
                 """,
                 (uuid, size),
-            ).fetchall()
+            )
+            .fetchall()
+        )
         paths: list[Path] = []
         for _, file_path in rows:
             path = self._resolve_path(file_path)
@@ -357,46 +508,48 @@ class CardImageCache:
         artist: str = None,
         face_index: int = 0,
     ) -> None:
-        """Add image record to database."""
-        file_path_str = str(Path(file_path).resolve())
+        """Add image record to database.
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO card_images
-                (uuid, face_index, name, set_code, collector_number, image_size, file_path,
-                 downloaded_at, scryfall_uri, artist)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    uuid,
-                    face_index,
-                    name,
-                    set_code,
-                    collector_number,
-                    image_size,
-                    file_path_str,
-                    datetime.now(UTC).isoformat(),
-                    scryfall_uri,
-                    artist,
-                ),
-            )
-            conn.commit()
+        Inside :meth:`batched_writes` the row is queued instead of committed immediately.
+        """
+        row = (
+            uuid,
+            face_index,
+            name,
+            set_code,
+            collector_number,
+            image_size,
+            str(Path(file_path).resolve()),
+            datetime.now(UTC).isoformat(),
+            scryfall_uri,
+            artist,
+            _name_key(name),
+        )
+        statements = _image_statements(row)
+        writer = self._writer
+        if writer is not None:
+            for sql, params in statements:
+                writer.submit(params, sql)
+            return
+        with self.connection() as conn:
+            for sql, params in statements:
+                conn.execute(sql, params)
 
     def get_cache_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            total = conn.execute("SELECT COUNT(DISTINCT uuid) FROM card_images").fetchone()[0]
-            by_size = {}
-            for size in IMAGE_SIZES.values():
-                count = conn.execute(
-                    "SELECT COUNT(*) FROM card_images WHERE image_size = ?", (size,)
-                ).fetchone()[0]
+        self.flush_writes()
+        conn = self.connection()
+        total = conn.execute("SELECT COUNT(DISTINCT uuid) FROM card_images").fetchone()[0]
+        by_size = dict.fromkeys(IMAGE_SIZES.values(), 0)
+        for size, count in conn.execute(
+            "SELECT image_size, COUNT(*) FROM card_images GROUP BY image_size"
+        ):
+            if size in by_size:
                 by_size[size] = count
 
-            bulk_meta = conn.execute(
-                "SELECT downloaded_at, total_cards FROM bulk_data_meta WHERE id = 1"
-            ).fetchone()
+        bulk_meta = conn.execute(
+            "SELECT downloaded_at, total_cards FROM bulk_data_meta WHERE id = 1"
+        ).fetchone()
 
         return {
             "unique_cards": total,
@@ -409,13 +562,50 @@ class CardImageCache:
         """Check if image is already cached."""
         return self.get_image_by_uuid(uuid, size, face_index=face_index) is not None
 
+    def cached_faces(self, size: str = "normal") -> dict[tuple[str, int], Path]:
+        """Map every (uuid, face_index) with a ``size`` image on disk to that image.
+
+        One query plus one directory listing, instead of a lookup and ``exists`` check per
+        face. Rows whose file is missing from the ``size`` directory are left out, so those
+        images get downloaded again.
+        """
+        self.flush_writes()
+        size_dir = self.cache_dir / size
+        try:
+            on_disk = {entry.name for entry in os.scandir(size_dir)}
+        except FileNotFoundError:
+            on_disk = set()
+        rows = self.connection().execute(
+            "SELECT uuid, face_index, file_path FROM card_images "
+            "WHERE image_size = ? AND face_index >= 0",
+            (size,),
+        )
+        faces: dict[tuple[str, int], Path] = {}
+        for uuid, face_index, file_path in rows:
+            filename = PureWindowsPath(file_path).name
+            if filename in on_disk:
+                faces[(uuid, face_index)] = size_dir / filename
+        return faces
+
 
 class BulkImageDownloader:
     """High-throughput bulk image downloader using Scryfall data."""
 
-    def __init__(self, cache: CardImageCache, max_workers: int = MAX_WORKERS):
+    def __init__(
+        self,
+        cache: CardImageCache,
+        max_workers: int = MAX_WORKERS,
+        max_concurrency: int = MAX_CONCURRENT_DOWNLOADS,
+    ):
+        """
+        Args:
+            cache: Image cache to fill
+            max_workers: Concurrent image transfers to start with
+            max_concurrency: Ceiling the transfer count may grow to while the CDN keeps up
+        """
         self.cache = cache
         self.max_workers = max_workers
+        self.max_concurrency = max(max_concurrency, max_workers)
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "MTGOMetagameCrawler/1.0"})
 
@@ -428,14 +618,28 @@ class BulkImageDownloader:
 
     def _get_cached_bulk_data_record(self) -> tuple[str | None, str | None]:
         """Return the saved bulk data metadata (updated_at, download URI)."""
-        with sqlite3.connect(self.cache.db_path) as conn:
-            row = conn.execute(
-                "SELECT downloaded_at, bulk_data_uri FROM bulk_data_meta WHERE id = 1"
-            ).fetchone()
+        row = (
+            self.cache.connection()
+            .execute("SELECT downloaded_at, bulk_data_uri FROM bulk_data_meta WHERE id = 1")
+            .fetchone()
+        )
         if row:
             return row[0], row[1]
         return None, None
 
+    def _get_cached_total_cards(self) -> int:
+        """Card count recorded by the last full pass over the bulk data (0 if unknown)."""
+        row = (
+            self.cache.connection()
+            .execute("SELECT total_cards FROM bulk_data_meta WHERE id = 1")
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def _set_cached_total_cards(self, total: int) -> None:
+        with self.cache.connection() as conn:
+            conn.execute("UPDATE bulk_data_meta SET total_cards = ? WHERE id = 1", (total,))
+
     def is_bulk_data_outdated(
         self, max_staleness_seconds: int | None = None
     ) -> tuple[bool, dict[str, Any]]:
@@ -500,16 +704,18 @@ class BulkImageDownloader:
             logger.info(f"Downloading bulk data from {download_uri}")
             logger.info(f"Size: {metadata.get('size', 0) / (1024 * 1024):.1f} MB")
 
-            # Download with progress
-            resp = self.session.get(download_uri, stream=True, timeout=120)
-            resp.raise_for_status()
-
-            with BULK_DATA_CACHE.open("wb") as f:
-                for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
-                    f.write(chunk)
+            # Resumes an interrupted transfer and only replaces the cache once verified
+            expected_size = metadata.get("size")
+            download_resumable(
+                self.session.get,
+                download_uri,
+                BULK_DATA_CACHE,
+                expected_size=expected_size if isinstance(expected_size, int) else None,
+                timeout=120,
+            )
 
             # Update database metadata (defer card count to avoid parsing 500MB file)
-            with sqlite3.connect(self.cache.db_path) as conn:
+            with self.cache.connection() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO bulk_data_meta (id, downloaded_at, total_cards, bulk_data_uri)
@@ -521,7 +727,6 @@ class BulkImageDownloader:
                         download_uri,
                     ),
                 )
-                conn.commit()
 
             logger.info("Bulk data downloaded successfully")
             return True, "Bulk data downloaded"
@@ -530,14 +735,21 @@ class BulkImageDownloader:
             logger.exception("Failed to download bulk data")
             return False, f"Error: {exc}"
 
-    def _download_single_image(
-        self, card: dict[str, Any], size: str = "normal"
+    async def _download_single_image(
+        self,
+        engine: AsyncDownloadEngine,
+        card: dict[str, Any],
+        size: str = "normal",
+        cached: Mapping[tuple[str, int], Path] = _NO_CACHED_FACES,
     ) -> tuple[bool, str]:
         """Download a single card image.
 
         Args:
+            engine: Download engine running the bulk sync
             card: Card object from bulk data
             size: Image size to download
+            cached: Images already on disk by (uuid, face_index) (see
+                CardImageCache.cached_faces)
 
         Returns:
             (success, message)
@@ -550,20 +762,27 @@ class BulkImageDownloader:
 
         card_faces = card.get("card_faces") or []
         if card_faces:
-            return self._download_multi_face_card(card, card_faces, size)
+            return await self._download_multi_face_card(engine, card, card_faces, size, cached)
 
-        success, message, _ = self._download_face_asset(
+        success, message, _ = await self._download_face_asset(
+            engine,
             uuid=uuid,
             face_index=0,
             name=name,
             image_uris=card.get("image_uris") or {},
             size=size,
             card=card,
+            cached=cached,
         )
         return success, message
 
-    def _download_multi_face_card(
-        self, card: dict[str, Any], faces: list[dict[str, Any]], size: str
+    async def _download_multi_face_card(
+        self,
+        engine: AsyncDownloadEngine,
+        card: dict[str, Any],
+        faces: list[dict[str, Any]],
+        size: str,
+        cached: Mapping[tuple[str, int], Path] = _NO_CACHED_FACES,
     ) -> tuple[bool, str]:
         """Download images for each face of a double-faced card."""
         uuid = card.get("id")
@@ -575,13 +794,15 @@ class BulkImageDownloader:
         for idx, face in enumerate(faces):
             face_name = face.get("name") or card.get("name", "Unknown")
             image_uris = face.get("image_uris") or {}
-            success, _, file_path = self._download_face_asset(
+            success, _, file_path = await self._download_face_asset(
+                engine,
                 uuid=uuid,
                 face_index=idx,
                 name=face_name,
                 image_uris=image_uris,
                 size=size,
                 card=card,
+                cached=cached,
             )
             if success:
                 downloaded += 1
@@ -607,41 +828,35 @@ class BulkImageDownloader:
             return False, f"No downloadable faces for {card.get('name', 'Unknown')}"
         return True, f"Downloaded {downloaded} faces for {card.get('name', 'Unknown')}"
 
-    def _download_face_asset(
+    async def _download_face_asset(
         self,
+        engine: AsyncDownloadEngine,
         uuid: str,
         face_index: int,
         name: str,
         image_uris: dict[str, Any],
         size: str,
         card: dict[str, Any],
+        cached: Mapping[tuple[str, int], Path] = _NO_CACHED_FACES,
     ) -> tuple[bool, str, Path | None]:
         """Download a specific face image."""
-        if self.cache.is_cached(uuid, size, face_index=face_index):
-            path = self.cache.get_image_by_uuid(uuid, size, face_index=face_index)
+        path = cached.get((uuid, face_index))
+        if path is not None:
             return True, f"Already cached: {name}", path
 
         image_url = image_uris.get(size) or image_uris.get("normal")
         if not image_url:
             return False, f"No {size} image for {name}", None
 
-        try:
-            resp = self.session.get(image_url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-        except Exception as exc:
-            logger.debug(f"Failed to download {name}: {exc}")
-            return False, f"Error: {name} - {exc}", None
-
         ext = "png" if size == "png" else "jpg"
         filename = self._build_face_filename(uuid, face_index, ext)
         file_path = self.cache.cache_dir / size / filename
 
         try:
-            with file_path.open("wb") as fh:
-                fh.write(resp.content)
+            await engine.fetch_to_file(image_url, file_path)
         except Exception as exc:
-            logger.debug(f"Failed to write image {name}: {exc}")
-            return False, f"Error saving image for {name}: {exc}", None
+            logger.debug(f"Failed to download {name}: {exc}")
+            return False, f"Error: {name} - {exc}", None
 
         self.cache.add_image(
             uuid=uuid,
@@ -663,22 +878,70 @@ class BulkImageDownloader:
             return f"{uuid}.{ext}"
         return f"{uuid}-f{face_index}.{ext}"
 
+    @staticmethod
+    def _missing_faces(
+        card: dict[str, Any], size: str, cached: Mapping[tuple[str, int], Path]
+    ) -> list[int]:
+        """Face indices of ``card`` with no ``size`` image in ``cached``."""
+        faces = card.get("card_faces") or []
+        indices = range(len(faces)) if faces else (0,)
+        uuid = card.get("id")
+        return [index for index in indices if (uuid, index) not in cached]
+
+    def plan_image_sync(self, size: str = "normal", max_cards: int | None = None) -> dict[str, Any]:
+        """Report what :meth:`download_all_images` would fetch, without downloading.
+
+        Returns:
+            Dict with ``total`` cards, ``cached`` cards (every face on disk),
+            ``to_download`` cards and ``missing_faces`` images
+        """
+        if not BULK_DATA_CACHE.exists():
+            return {
+                "success": False,
+                "error": "Bulk data not downloaded. Call download_bulk_metadata() first.",
+            }
+        try:
+            cards = iter_json_array(BULK_DATA_CACHE)
+            if max_cards:
+                cards = islice(cards, max_cards)
+            cached = self.cache.cached_faces(size)
+            plan = {"total": 0, "cached": 0, "to_download": 0, "missing_faces": 0}
+            for card in cards:
+                plan["total"] += 1
+                missing = self._missing_faces(card, size, cached)
+                if card.get("id") and not missing:
+                    plan["cached"] += 1
+                else:
+                    plan["to_download"] += 1
+                    plan["missing_faces"] += len(missing)
+        except Exception as exc:
+            logger.exception("Failed to plan image sync")
+            return {"success": False, "error": str(exc)}
+        return {"success": True, "dry_run": True, **plan}
+
     def download_all_images(
         self,
         size: str = "normal",
         max_cards: int | None = None,
         progress_callback: callable | None = None,
+        dry_run: bool = False,
     ) -> dict[str, Any]:
         """Download all card images from bulk data.
 
+        Cards whose faces are all on disk are counted as skipped without touching the
+        network; only missing images are scheduled.
+
         Args:
             size: Image size to download (small, normal, large, png)
             max_cards: Limit number of cards (for testing)
             progress_callback: Callback function(completed, total, message)
+            dry_run: Only report the plan (see :meth:`plan_image_sync`)
 
         Returns:
             Statistics dict
         """
+        if dry_run:
+            return self.plan_image_sync(size, max_cards)
         if not BULK_DATA_CACHE.exists():
             return {
                 "success": False,
@@ -686,58 +949,79 @@ class BulkImageDownloader:
             }
 
         try:
-            cards_data = json.loads(BULK_DATA_CACHE.read_text(encoding="utf-8"))
+            # Cards are streamed from the bulk file, so the total is only known up front
+            # when limited or counted by an earlier run (0 means unknown).
+            cards = iter_json_array(BULK_DATA_CACHE)
             if max_cards:
-                cards_data = cards_data[:max_cards]
-
-            total = len(cards_data)
-            completed = 0
-            successful = 0
-            failed = 0
-            skipped = 0
-
-            logger.info(f"Starting bulk download of {total} cards ({size} size)")
-
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {
-                    executor.submit(self._download_single_image, card, size): card
-                    for card in cards_data
-                }
-
-                for future in as_completed(futures):
-                    completed += 1
-                    try:
-                        success, message = future.result()
-                        if success:
-                            if "Already cached" in message:
-                                skipped += 1
-                            else:
-                                successful += 1
+                cards = islice(cards, max_cards)
+            total = max_cards or self._get_cached_total_cards()
+            counts = {"completed": 0, "downloaded": 0, "skipped": 0, "failed": 0}
+            cached = self.cache.cached_faces(size)
+
+            logger.info(
+                f"Starting bulk download of {total or 'all'} cards ({size} size, "
+                f"{len(cached)} images already cached)"
+            )
+
+            def record(result: tuple[bool, str] | Exception) -> None:
+                counts["completed"] += 1
+                if isinstance(result, Exception):
+                    counts["failed"] += 1
+                    logger.debug(f"Exception in download: {result}")
+                else:
+                    success, message = result
+                    if success:
+                        if "Already cached" in message:
+                            counts["skipped"] += 1
                         else:
-                            failed += 1
-                            logger.debug(message)
-                    except Exception as exc:
-                        failed += 1
-                        logger.debug(f"Exception in download: {exc}")
-
-                    # Progress callback
-                    if progress_callback and completed % 100 == 0:
-                        progress_callback(
-                            completed,
-                            total,
-                            f"{successful} downloaded, {skipped} cached, {failed} failed",
-                        )
+                            counts["downloaded"] += 1
+                    else:
+                        counts["failed"] += 1
+                        logger.debug(message)
+
+                # Progress callback
+                if progress_callback and counts["completed"] % 100 == 0:
+                    progress_callback(
+                        counts["completed"],
+                        total,
+                        f"{counts['downloaded']} downloaded, {counts['skipped']} cached, "
+                        f"{counts['failed']} failed",
+                    )
+
+            def missing_cards() -> Iterator[dict[str, Any]]:
+                for card in cards:
+                    if card.get("id") and not self._missing_faces(card, size, cached):
+                        record((True, f"Already cached: {card.get('name', 'Unknown')}"))
+                    else:
+                        yield card
+
+            engine = AsyncDownloadEngine(
+                initial_concurrency=self.max_workers,
+                max_concurrency=self.max_concurrency,
+                timeout=REQUEST_TIMEOUT,
+                headers={"User-Agent": self.session.headers["User-Agent"]},
+            )
+            with self.cache.batched_writes():
+                engine.run(
+                    missing_cards(),
+                    lambda card: self._download_single_image(engine, card, size, cached),
+                    lambda _card, result: record(result),
+                )
+
+            if not max_cards:
+                self._set_cached_total_cards(counts["completed"])
 
             logger.info(
-                f"Bulk download complete: {successful} downloaded, {skipped} cached, {failed} failed"
+                f"Bulk download complete: {counts['downloaded']} downloaded, "
+                f"{counts['skipped']} cached, {counts['failed']} failed"
             )
 
             return {
                 "success": True,
-                "total": total,
-                "downloaded": successful,
-                "skipped": skipped,
-                "failed": failed,
+                "total": counts["completed"],
+                "downloaded": counts["downloaded"],
+                "skipped": counts["skipped"],
+                "failed": counts["failed"],
             }
 
         except Exception as exc:
@@ -763,85 +1047,71 @@ def _collect_face_aliases(card: dict[str, Any], display_name: str) -> set[str]:
     return {alias for alias in aliases if alias.lower() != display_key}
 
 
-def _load_printing_index_payload() -> dict[str, Any] | None:
-    """Load the cached card printings index if available."""
+_printing_index: PrintingIndex | None = None
+_printing_index_lock = threading.Lock()
+
+
+def _open_printing_index() -> PrintingIndex | None:
+    """Map the cached card printings index if available."""
     if not PRINTING_INDEX_CACHE.exists():
         return None
     try:
-        with PRINTING_INDEX_CACHE.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-    except Exception as exc:
-        logger.warning(f"Failed to read printings index cache: {exc}")
-        return None
-    if payload.get("version") != PRINTING_INDEX_VERSION:
-        logger.info("Discarding printings index cache due to version mismatch")
+        return PrintingIndex(PRINTING_INDEX_CACHE)
+    except IndexFormatError as exc:
+        logger.info(f"Discarding printings index cache: {exc}")
         return None
-    return payload
-
 
-def ensure_printing_index_cache(force: bool = False) -> dict[str, Any]:
-    """Ensure a compact card printings index exists for fast wx lookups."""
-    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    existing = None if force else _load_printing_index_payload()
-    bulk_mtime = BULK_DATA_CACHE.stat().st_mtime if BULK_DATA_CACHE.exists() else None
 
-    if existing and (bulk_mtime is None or existing.get("bulk_mtime", 0) >= bulk_mtime):
-        return existing
-
-    if bulk_mtime is None:
-        raise FileNotFoundError("Bulk data cache not found; cannot build printings index")
-
-    logger.info("Building card printings index from bulk data…")
-    with BULK_DATA_CACHE.open("r", encoding="utf-8") as fh:
-        cards = json.load(fh)
-
-    by_name: dict[str, list[dict[str, Any]]] = {}
-    total_printings = 0
-    for card in cards:
+def _iter_printings() -> Iterator[tuple[dict[str, Any], list[str]]]:
+    for card in iter_json_array(BULK_DATA_CACHE):
         name = (card.get("name") or "").strip()
-        uuid = card.get("id")
-        if not name or not uuid:
+        if not name or not card.get("id"):
             continue
-        key = name.lower()
-        entry = {
-            "id": uuid,
-            "set": (card.get("set") or "").upper(),
-            "set_name": card.get("set_name") or "",
-            "collector_number": card.get("collector_number") or "",
-            "released_at": card.get("released_at") or "",
-        }
-        by_name.setdefault(key, []).append(entry)
-        for alias in _collect_face_aliases(card, name):
-            alias_key = alias.lower()
-            if alias_key == key:
-                continue
-            by_name.setdefault(alias_key, []).append(entry)
-        total_printings += 1
-
-    for entries in by_name.values():
-        entries.sort(key=lambda c: c.get("released_at") or "", reverse=True)
-
-    payload = {
-        "version": PRINTING_INDEX_VERSION,
-        "generated_at": datetime.now(UTC).isoformat(),
-        "bulk_mtime": bulk_mtime,
-        "unique_names": len(by_name),
-        "total_printings": total_printings,
-        "data": by_name,
-    }
+        yield card, [name, *_collect_face_aliases(card, name)]
 
-    try:
-        with PRINTING_INDEX_CACHE.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, separators=(",", ":"))
+
+def ensure_printing_index_cache(force: bool = False) -> PrintingIndex:
+    """Ensure the memory-mapped card printings index exists and return it."""
+    global _printing_index
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    bulk_mtime = BULK_DATA_CACHE.stat().st_mtime if BULK_DATA_CACHE.exists() else None
+
+    with _printing_index_lock:
+        current = _printing_index
+        if current is not None and current.path != PRINTING_INDEX_CACHE:
+            current = None
+        if not force:
+            current = current or _open_printing_index()
+            if current and (bulk_mtime is None or current.meta.get("bulk_mtime", 0) >= bulk_mtime):
+                _printing_index = current
+                return current
+
+        if bulk_mtime is None:
+            raise FileNotFoundError("Bulk data cache not found; cannot build printings index")
+
+        logger.info("Building card printings index from bulk data…")
+        # The current index keeps serving lookups while the new one is built next to it.
+        staging_path = PRINTING_INDEX_CACHE.with_name(PRINTING_INDEX_CACHE.name + ".new")
+        meta = write_printing_index(
+            staging_path,
+            _iter_printings(),
+            {"generated_at": datetime.now(UTC).isoformat(), "bulk_mtime": bulk_mtime},
+        )
         logger.info(
             "Cached card printings index ({unique_names} names, {total_printings} printings)",
-            unique_names=payload["unique_names"],
-            total_printings=payload["total_printings"],
+            unique_names=meta["unique_names"],
+            total_printings=meta["total_printings"],
         )
-    except Exception as exc:
-        logger.warning(f"Failed to write printings index cache: {exc}")
-
-    return payload
+        # Earlier releases kept the index as JSON.
+        PRINTING_INDEX_CACHE.with_name("printings_v2.json").unlink(missing_ok=True)
+        if current is None:
+            os.replace(staging_path, PRINTING_INDEX_CACHE)
+            current = PrintingIndex(PRINTING_INDEX_CACHE)
+        else:
+            # Remapped in place, so holders such as the card inspector see the new file.
+            current.replace_file(staging_path)
+        _printing_index = current
+        return current
 
 
 # Singleton instance
@@ -0,0 +1,68 @@
+"""Versioned binary card index (``atomic_cards_index.bin``).
+
+The file holds the columns of a :class:`~utils.card_store.CardStore` and the posting lists
+of its :class:`~utils.card_search_index.CardSearchIndex`. Opening it only maps the file
+and reads a small JSON directory, so startup cost no longer grows with the number of
+cards; records are decoded on demand when the UI asks for them.
+
+Bump ``CARD_INDEX_VERSION`` whenever the layout of existing sections changes: readers
+reject other versions and ``CardDataManager`` rebuilds the file. Optional sections may be
+added without a bump as long as readers check ``has_section`` and cope without them, as
+the ``digests`` section used to diff refreshes does.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from utils.binary_index import IndexFormatError, MappedIndexFile, write_index_file
+from utils.card_search_index import CardSearchIndex
+from utils.card_store import CardStore
+
+CARD_INDEX_MAGIC = b"MTGCARDS"
+CARD_INDEX_VERSION = 1
+
+
+def write_card_index(path: Path, store: CardStore, search_index: CardSearchIndex) -> None:
+    """Atomically write ``store`` and ``search_index`` to ``path``."""
+    sections, meta = store.to_sections()
+    sections.update(search_index.to_sections())
+    write_index_file(path, CARD_INDEX_MAGIC, CARD_INDEX_VERSION, sections, meta)
+
+
+def open_card_index(path: Path) -> tuple[CardStore, CardSearchIndex]:
+    """
+    Map a card index written by :func:`write_card_index`.
+
+    Raises:
+        IndexFormatError: If the file is missing, corrupt or of another format version
+    """
+    mapped = MappedIndexFile(path, CARD_INDEX_MAGIC, CARD_INDEX_VERSION)
+    try:
+        return CardStore.from_mapped(mapped), CardSearchIndex.from_mapped(mapped)
+    except (KeyError, TypeError, ValueError) as exc:
+        mapped.close()
+        if isinstance(exc, IndexFormatError):
+            raise
+        raise IndexFormatError(f"{path} is incomplete: {exc}") from exc
+
+
+def is_current_card_index(path: Path) -> bool:
+    """Return True if ``path`` holds a readable index in the current format version."""
+    if not path.exists():
+        return False
+    try:
+        MappedIndexFile(path, CARD_INDEX_MAGIC, CARD_INDEX_VERSION).close()
+    except IndexFormatError:
+        return False
+    return True
+
+
+__all__ = [
+    "CARD_INDEX_MAGIC",
+    "CARD_INDEX_VERSION",
+    "IndexFormatError",
+    "is_current_card_index",
+    "open_card_index",
+    "write_card_index",
+]
@@ -0,0 +1,252 @@
+"""Trigram inverted index for substring card searches.
+
+The deck builder re-runs a search on every debounce tick, so scanning ~30k cards and
+lowercasing their type line and oracle text each time is wasteful. This index is built
+once when card data loads: every card contributes the set of 3-character grams found in
+its lowercased name, type line and oracle text, and each gram maps to a sorted posting
+list of card positions. A substring query only has to intersect the posting lists of its
+own grams and verify the few remaining candidates.
+
+The index can be written into a binary card index file (see ``utils.card_index_file``)
+and reopened from a memory mapping, in which case posting lists and haystacks are read
+straight from the mapped file. When card data is refreshed, :meth:`CardSearchIndex.patched`
+renumbers the previous posting lists and only extracts grams for new or changed cards.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+from utils.binary_index import (
+    MappedHashTable,
+    MappedIndexFile,
+    MappedStrings,
+    build_hash_table,
+    pack_strings,
+)
+
+NGRAM_SIZE = 3
+# Separates the searchable fields of a card so grams never straddle two fields.
+FIELD_SEPARATOR = "\x00"
+# Once the candidate set is this small, verifying each candidate directly is cheaper
+# than intersecting further posting lists.
+VERIFY_THRESHOLD = 256
+
+
+def build_haystack(name: str | None, type_line: str | None, oracle_text: str | None) -> str:
+    """Return the lowercased, separator-joined search text for a card."""
+    return FIELD_SEPARATOR.join(
+        (
+            (name or "").lower(),
+            (type_line or "").lower(),
+            (oracle_text or "").lower(),
+        )
+    )
+
+
+def _distinct_grams(text: str) -> set[str]:
+    """Return the distinct n-grams of ``text`` that do not cross a field boundary."""
+    grams: set[str] = set()
+    for field in text.split(FIELD_SEPARATOR):
+        grams.update(field[i : i + NGRAM_SIZE] for i in range(len(field) - NGRAM_SIZE + 1))
+    return grams
+
+
+class CardSearchIndex:
+    """Substring search over card names, type lines and oracle text."""
+
+    def __init__(
+        self, haystacks: Sequence[str], postings: dict[str, Sequence[int]] | _MappedPostings
+    ):
+        self._haystacks = haystacks
+        self._postings = postings
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[dict[str, Any]]) -> CardSearchIndex:
+        """Build an index over card dictionaries in their iteration order."""
+        haystacks = [
+            build_haystack(card.get("name"), card.get("type_line"), card.get("oracle_text"))
+            for card in cards
+        ]
+        return cls.from_haystacks(haystacks)
+
+    @classmethod
+    def from_haystacks(cls, haystacks: Sequence[str]) -> CardSearchIndex:
+        """Build an index from precomputed haystacks (see :func:`build_haystack`)."""
+        lists: dict[str, list[int]] = {}
+        for position, haystack in enumerate(haystacks):
+            for gram in _distinct_grams(haystack):
+                posting = lists.get(gram)
+                if posting is None:
+                    lists[gram] = [position]
+                else:
+                    posting.append(position)
+        postings = {gram: array("I", posting) for gram, posting in lists.items()}
+        return cls(haystacks, postings)
+
+    @classmethod
+    def patched(
+        cls, previous: CardSearchIndex, haystacks: Sequence[str], carried: Sequence[int]
+    ) -> CardSearchIndex:
+        """
+        Build the index for an updated card list, reusing ``previous`` for unchanged cards.
+
+        Args:
+            previous: Index over the earlier card list
+            haystacks: Haystacks of the updated card list
+            carried: For each updated position, the position of the same unchanged card in
+                ``previous`` (ascending), or -1 where the card is new or changed
+
+        Raises:
+            ValueError: If the carried positions are not ascending
+        """
+        remap = array("i", [-1]) * len(previous)
+        dirty: list[int] = []
+        last = -1
+        for position, old_position in enumerate(carried):
+            if old_position < 0:
+                dirty.append(position)
+                continue
+            if old_position <= last:
+                raise ValueError("Carried positions must be ascending")
+            remap[old_position] = position
+            last = old_position
+        lists: dict[str, list[int]] = {}
+        for gram, posting in previous._postings.items():
+            renumbered = [new for old in posting if (new := remap[old]) >= 0]
+            if renumbered:
+                lists[gram] = renumbered
+        touched: set[str] = set()
+        for position in dirty:
+            for gram in _distinct_grams(haystacks[position]):
+                lists.setdefault(gram, []).append(position)
+                touched.add(gram)
+        for gram in touched:
+            lists[gram].sort()
+        postings = {gram: array("I", posting) for gram, posting in lists.items()}
+        return cls(haystacks, postings)
+
+    @classmethod
+    def from_mapped(cls, mapped: MappedIndexFile) -> CardSearchIndex:
+        """Open an index stored in a mapped file by :meth:`to_sections`."""
+        return cls(
+            MappedStrings(mapped, "search.haystacks", separator=FIELD_SEPARATOR.encode()),
+            _MappedPostings(mapped),
+        )
+
+    def to_sections(self) -> dict[str, array | bytes]:
+        """Serialize the index into named sections for ``write_index_file``."""
+        haystack_offsets, haystack_blob = pack_strings(
+            self._haystacks, separator=FIELD_SEPARATOR.encode()
+        )
+        grams = sorted(self._postings)
+        gram_offsets, gram_blob = pack_strings(grams)
+        posting_offsets = array("Q", [0])
+        postings = array("I")
+        for gram in grams:
+            postings.extend(self._postings[gram])
+            posting_offsets.append(len(postings))
+        return {
+            "search.haystacks.offsets": haystack_offsets,
+            "search.haystacks.blob": haystack_blob,
+            "search.grams.offsets": gram_offsets,
+            "search.grams.blob": gram_blob,
+            "search.grams.table": build_hash_table(grams, range(len(grams))),
+            "search.postings.offsets": posting_offsets,
+            "search.postings": postings,
+        }
+
+    def close(self) -> None:
+        """
+        Drop the index contents; the index is empty afterwards.
+
+        A mapped index shares its mapping with the ``CardStore`` opened from the same
+        file, which unmaps it when closed.
+        """
+        self._haystacks = ()
+        self._postings = {}
+
+    def __len__(self) -> int:
+        return len(self._haystacks)
+
+    @property
+    def gram_count(self) -> int:
+        """Number of distinct grams in the index."""
+        return len(self._postings)
+
+    def haystack(self, position: int) -> str:
+        return self._haystacks[position]
+
+    def search(self, query: str, candidates: Iterable[int] | None = None) -> list[int]:
+        """
+        Return the ascending positions of cards whose text contains ``query``.
+
+        Args:
+            query: Case-insensitive substring to look for
+            candidates: Optional ascending positions to restrict the search to
+
+        Returns:
+            Sorted list of matching card positions
+        """
+        needle = (query or "").strip().lower()
+        haystacks = self._haystacks
+        pool: Iterable[int] | None = candidates
+        if pool is None and len(needle) >= NGRAM_SIZE:
+            pool = self._gram_candidates(needle)
+        if not needle:
+            return list(range(len(haystacks)) if pool is None else pool)
+        # Mapped haystacks can match raw bytes without decoding every candidate.
+        matcher = getattr(haystacks, "positions_containing", None)
+        if matcher is not None:
+            return matcher(needle, pool)
+        if pool is None:
+            pool = range(len(haystacks))
+        return [position for position in pool if needle in haystacks[position]]
+
+    def _gram_candidates(self, needle: str) -> Sequence[int]:
+        """Intersect the posting lists of every gram in ``needle``."""
+        postings: list[Sequence[int]] = []
+        for gram in {needle[i : i + NGRAM_SIZE] for i in range(len(needle) - NGRAM_SIZE + 1)}:
+            posting = self._postings.get(gram)
+            if not posting:
+                return ()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates: Sequence[int] = postings[0]
+        if len(candidates) <= VERIFY_THRESHOLD or len(postings) == 1:
+            return candidates
+        narrowed = set(candidates)
+        for posting in postings[1:]:
+            narrowed.intersection_update(posting)
+            if len(narrowed) <= VERIFY_THRESHOLD:
+                break
+        return sorted(narrowed)
+
+
+class _MappedPostings:
+    """Posting lists read from a mapped index file, keyed through its gram hash table."""
+
+    def __init__(self, mapped: MappedIndexFile):
+        self._grams = MappedStrings(mapped, "search.grams")
+        self._table = MappedHashTable(mapped.section("search.grams.table"), self._grams)
+        self._offsets = mapped.section("search.postings.offsets")
+        self._postings = mapped.section("search.postings")
+
+    def get(self, gram: str) -> Sequence[int] | None:
+        gram_index = self._table.get(gram)
+        if gram_index is None:
+            return None
+        return self._postings[self._offsets[gram_index] : self._offsets[gram_index + 1]]
+
+    def items(self) -> Iterator[tuple[str, Sequence[int]]]:
+        offsets, postings = self._offsets, self._postings
+        for gram_index, gram in enumerate(self._grams):
+            yield gram, postings[offsets[gram_index] : offsets[gram_index + 1]]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+__all__ = ["CardSearchIndex", "build_haystack"]
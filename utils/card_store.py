@@ -0,0 +1,552 @@
+"""Columnar, array-backed storage for the simplified MTGJSON card index.
+
+Holding ~30k cards as individual dictionaries (each with a nested legalities dict and
+colour lists) costs hundreds of megabytes and gives the garbage collector hundreds of
+thousands of containers to traverse. ``CardStore`` keeps the same data column by column:
+
+- text fields are ids into an interned string table (``array('I')``)
+- mana value is an ``array('d')`` column (NaN for missing values)
+- colours and colour identity are 5-bit WUBRG masks (``array('B')``)
+- legalities are a cards x formats matrix of interned legality states (``array('B')``)
+
+Card dictionaries are only materialized when a caller asks for a specific card, and a
+small LRU keeps recently displayed cards around. The columns can be written to a binary
+index file and reopened as zero-copy views over a memory mapping (:meth:`to_sections`,
+:meth:`from_mapped`).
+
+Every card also carries a 64-bit content digest, so a refreshed store can be diffed
+against the previous one card by card (:meth:`CardStore.diff`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from utils.binary_index import (
+    MappedHashTable,
+    MappedIndexFile,
+    MappedStrings,
+    build_hash_table,
+    pack_strings,
+)
+from utils.card_search_index import build_haystack
+from utils.lru_cache import SizedLRUCache
+
+COLOR_ORDER = "WUBRG"
+COLOR_BITS = {color: 1 << bit for bit, color in enumerate(COLOR_ORDER)}
+# Number of materialized card dictionaries kept alive for repeated lookups.
+MATERIALIZED_CACHE_SIZE = 2048
+TEXT_FIELDS = ("name", "mana_cost", "type_line", "oracle_text", "power", "toughness", "loyalty")
+
+
+def color_mask(colors: Iterable[str] | None) -> int:
+    """Return the WUBRG bitmask for a list of colour letters (unknown letters ignored)."""
+    mask = 0
+    for color in colors or ():
+        mask |= COLOR_BITS.get(str(color).upper(), 0)
+    return mask
+
+
+def mask_colors(mask: int) -> list[str]:
+    """Return the colour letters of a WUBRG bitmask in WUBRG order."""
+    return [color for color in COLOR_ORDER if mask & COLOR_BITS[color]]
+
+
+def card_digest(card: Mapping[str, Any]) -> int:
+    """Return a 64-bit digest of everything a simplified card stores."""
+    legalities = card.get("legalities") or {}
+    payload = [
+        [card.get(name) for name in TEXT_FIELDS],
+        _coerce_mana_value(card.get("mana_value")),
+        color_mask(card.get("colors")),
+        color_mask(card.get("color_identity")),
+        sorted((fmt, state) for fmt, state in legalities.items() if isinstance(state, str)),
+        [alias for alias in card.get("aliases") or [card.get("name")] if alias],
+    ]
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "little")
+
+
+@dataclass
+class CardStoreDelta:
+    """Card-level differences between two stores (see :meth:`CardStore.diff`)."""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+    # Position in the previous store of every card in the new one, or -1 for cards that
+    # were added or changed.
+    carried: Sequence[int]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed"
+
+
+class StringTable:
+    """Interned strings addressed by integer id; id 0 is reserved for ``None``."""
+
+    def __init__(self, strings: Sequence[str | None] | None = None):
+        self._strings: Sequence[str | None] = strings if strings is not None else [None]
+        self._ids: dict[str, int] = {}
+
+    def intern(self, value: Any) -> int:
+        if not isinstance(value, str):
+            return 0
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._ids[value] = string_id
+            self._strings.append(value)  # type: ignore[attr-defined]
+        return string_id
+
+    def freeze(self) -> None:
+        """Drop the build-time reverse lookup once no more strings will be added."""
+        self._ids = {}
+
+    def __getitem__(self, string_id: int) -> str | None:
+        return self._strings[string_id] if string_id else None
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __iter__(self) -> Iterator[str | None]:
+        return iter(self._strings)
+
+
+class CardStore:
+    """Read-only, position-addressed collection of simplified card records."""
+
+    def __init__(
+        self,
+        *,
+        strings: StringTable,
+        text_columns: Mapping[str, Sequence[int]],
+        mana_values: Sequence[float],
+        colors: Sequence[int],
+        color_identity: Sequence[int],
+        formats: Sequence[str],
+        legality_states: Sequence[str],
+        legalities: Sequence[int],
+        alias_offsets: Sequence[int],
+        alias_ids: Sequence[int],
+        positions_by_name: Mapping[str, int] | MappedHashTable,
+        available_formats: Sequence[str] | None = None,
+        digests: Sequence[int] | None = None,
+        mapped: MappedIndexFile | None = None,
+    ):
+        self._strings = strings
+        self._text = dict(text_columns)
+        self._mana_values = mana_values
+        self._colors = colors
+        self._color_identity = color_identity
+        self._formats = list(formats)
+        self._format_columns = {fmt: column for column, fmt in enumerate(self._formats)}
+        self._legality_states = list(legality_states)
+        self._legal_state = (
+            self._legality_states.index("Legal") + 1 if "Legal" in self._legality_states else -1
+        )
+        self._legalities = legalities
+        self._alias_offsets = alias_offsets
+        self._alias_ids = alias_ids
+        self._positions_by_name = positions_by_name
+        self._available_formats = list(available_formats) if available_formats else None
+        self._digests = digests
+        self._mapped = mapped
+        self._size = len(mana_values)
+        # Shared by the UI thread and the search executor, hence the thread-safe cache.
+        self._materialized: SizedLRUCache[int, dict[str, Any]] = SizedLRUCache(
+            MATERIALIZED_CACHE_SIZE
+        )
+
+    # ============= Construction =============
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[dict[str, Any]]) -> CardStore:
+        """Build a store from simplified card dictionaries (see ``CardDataManager``)."""
+        strings = StringTable()
+        text_columns = {field: array("I") for field in TEXT_FIELDS}
+        mana_values = array("d")
+        colors = array("B")
+        color_identity = array("B")
+        formats: list[str] = []
+        format_columns: dict[str, int] = {}
+        legality_states: list[str] = []
+        rows: list[dict[int, int]] = []
+        alias_offsets = array("I", [0])
+        alias_ids = array("I")
+        positions_by_name: dict[str, int] = {}
+        digests = array("Q")
+
+        for position, card in enumerate(cards):
+            digests.append(card_digest(card))
+            for field in TEXT_FIELDS:
+                text_columns[field].append(strings.intern(card.get(field)))
+            mana_values.append(_coerce_mana_value(card.get("mana_value")))
+            colors.append(color_mask(card.get("colors")))
+            color_identity.append(color_mask(card.get("color_identity")))
+
+            row: dict[int, int] = {}
+            for fmt, state in (card.get("legalities") or {}).items():
+                if not isinstance(state, str):
+                    continue
+                column = format_columns.get(fmt)
+                if column is None:
+                    column = format_columns[fmt] = len(formats)
+                    formats.append(fmt)
+                if state not in legality_states:
+                    legality_states.append(state)
+                row[column] = legality_states.index(state) + 1
+            rows.append(row)
+
+            aliases = card.get("aliases") or [card.get("name")]
+            for alias in aliases:
+                if not alias:
+                    continue
+                alias_ids.append(strings.intern(alias))
+                positions_by_name.setdefault(alias.lower(), position)
+            alias_offsets.append(len(alias_ids))
+
+        legalities = array("B", bytes(len(rows) * len(formats)))
+        width = len(formats)
+        for position, row in enumerate(rows):
+            for column, state_id in row.items():
+                legalities[position * width + column] = state_id
+
+        strings.freeze()
+        return cls(
+            strings=strings,
+            text_columns=text_columns,
+            mana_values=mana_values,
+            colors=colors,
+            color_identity=color_identity,
+            formats=formats,
+            legality_states=legality_states,
+            legalities=legalities,
+            alias_offsets=alias_offsets,
+            alias_ids=alias_ids,
+            positions_by_name=positions_by_name,
+            digests=digests,
+        )
+
+    @classmethod
+    def from_mapped(cls, mapped: MappedIndexFile) -> CardStore:
+        """Open a store whose columns were written by :meth:`to_sections`."""
+        meta = mapped.meta
+        return cls(
+            strings=StringTable(MappedStrings(mapped, "strings")),
+            text_columns={field: mapped.section(f"text.{field}") for field in TEXT_FIELDS},
+            mana_values=mapped.section("mana_values"),
+            colors=mapped.section("colors"),
+            color_identity=mapped.section("color_identity"),
+            formats=meta["formats"],
+            legality_states=meta["legality_states"],
+            legalities=mapped.section("legalities"),
+            alias_offsets=mapped.section("aliases.offsets"),
+            alias_ids=mapped.section("aliases.ids"),
+            positions_by_name=MappedHashTable(
+                mapped.section("names.table"), MappedStrings(mapped, "names")
+            ),
+            available_formats=meta.get("available_formats"),
+            # Indexes written before digests existed can still be read, just not diffed.
+            digests=mapped.section("digests") if mapped.has_section("digests") else None,
+            mapped=mapped,
+        )
+
+    def to_sections(self) -> tuple[dict[str, array | bytes], dict[str, Any]]:
+        """Serialize the columns into named sections plus JSON metadata."""
+        string_offsets, string_blob = pack_strings(self._strings)
+        names: list[str] = []
+        name_positions: list[int] = []
+        for position in range(self._size):
+            for alias in self.aliases(position):
+                key = (alias or "").lower()
+                if key and self.position_of(key) == position:
+                    names.append(key)
+                    name_positions.append(position)
+        name_offsets, name_blob = pack_strings(names)
+        sections: dict[str, array | bytes] = {
+            "strings.offsets": string_offsets,
+            "strings.blob": string_blob,
+        }
+        for field in TEXT_FIELDS:
+            sections[f"text.{field}"] = _as_array("I", self._text[field])
+        sections.update(
+            {
+                "mana_values": _as_array("d", self._mana_values),
+                "colors": _as_array("B", self._colors),
+                "color_identity": _as_array("B", self._color_identity),
+                "legalities": _as_array("B", self._legalities),
+                "aliases.offsets": _as_array("I", self._alias_offsets),
+                "aliases.ids": _as_array("I", self._alias_ids),
+                "names.offsets": name_offsets,
+                "names.blob": name_blob,
+                "names.table": build_hash_table(names, name_positions),
+            }
+        )
+        if self._digests is not None:
+            sections["digests"] = _as_array("Q", self._digests)
+        meta = {
+            "cards": self._size,
+            "formats": self._formats,
+            "legality_states": self._legality_states,
+            "available_formats": self.available_formats(),
+        }
+        return sections, meta
+
+    def diff(self, previous: CardStore) -> CardStoreDelta | None:
+        """
+        Compare this store with an earlier version of it, card by card.
+
+        Returns:
+            The added, removed and changed card names, plus where each unchanged card sat
+            in ``previous``; None if either store has no digests to compare
+        """
+        if self._digests is None or previous._digests is None:
+            return None
+        old_positions = {
+            (previous.text("name", position) or "").lower(): position
+            for position in range(len(previous))
+        }
+        added: list[str] = []
+        changed: list[str] = []
+        carried = array("i", [-1]) * self._size
+        for position in range(self._size):
+            name = self.text("name", position) or ""
+            old_position = old_positions.pop(name.lower(), None)
+            if old_position is None:
+                added.append(name)
+            elif previous._digests[old_position] != self._digests[position]:
+                changed.append(name)
+            else:
+                carried[position] = old_position
+        removed = sorted(
+            previous.text("name", position) or "" for position in old_positions.values()
+        )
+        return CardStoreDelta(added=added, removed=removed, changed=changed, carried=carried)
+
+    def close(self) -> None:
+        """Release the backing memory mapping, if any; a mapped store is empty afterwards."""
+        self._materialized.clear()
+        mapped, self._mapped = self._mapped, None
+        if mapped is None:
+            return
+        # Drop every column that points into the mapping before unmapping it.
+        self._size = 0
+        self._strings = StringTable()
+        self._text = dict.fromkeys(TEXT_FIELDS, ())
+        self._mana_values = self._colors = self._color_identity = ()
+        self._legalities = self._alias_offsets = self._alias_ids = ()
+        self._positions_by_name = {}
+        self._digests = None
+        mapped.close()
+
+    # ============= Record Access =============
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, position: int) -> dict[str, Any]:
+        """Return the materialized card dictionary at ``position``."""
+        if position < 0:
+            position += self._size
+        if not 0 <= position < self._size:
+            raise IndexError("card position out of range")
+        cached = self._materialized.get(position)
+        if cached is not None:
+            return cached
+        record = self._materialize(position)
+        self._materialized.put(position, record)
+        return record
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for position in range(self._size):
+            yield self._materialize(position)
+
+    def records(self, positions: Sequence[int]) -> CardRecordList:
+        """Return a lazily materialized view of the cards at ``positions``."""
+        return CardRecordList(self, positions)
+
+    def position_of(self, name: str) -> int | None:
+        """Return the position of a card by (case-insensitive) name or alias."""
+        return self._positions_by_name.get((name or "").lower())
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        position = self.position_of(name)
+        return None if position is None else self[position]
+
+    # ============= Column Access =============
+
+    def text(self, field: str, position: int) -> str | None:
+        return self._strings[self._text[field][position]]
+
+    def text_ids(self, field: str) -> Sequence[int]:
+        """Return the string id column of a text field (equal ids mean equal text)."""
+        return self._text[field]
+
+    def string(self, string_id: int) -> str | None:
+        return self._strings[string_id]
+
+    def mana_value_column(self) -> Sequence[float]:
+        """Return the raw mana value column (NaN where a card has none)."""
+        return self._mana_values
+
+    def color_identity_column(self) -> Sequence[int]:
+        return self._color_identity
+
+    def mana_value(self, position: int) -> float | None:
+        value = self._mana_values[position]
+        return None if math.isnan(value) else value
+
+    def colors_mask(self, position: int) -> int:
+        return self._colors[position]
+
+    def color_identity_mask(self, position: int) -> int:
+        return self._color_identity[position]
+
+    @property
+    def formats(self) -> list[str]:
+        return list(self._formats)
+
+    def legality(self, position: int, fmt: str) -> str | None:
+        column = self._format_columns.get(fmt)
+        if column is None:
+            return None
+        state_id = self._legalities[position * len(self._formats) + column]
+        return self._legality_states[state_id - 1] if state_id else None
+
+    def is_legal(self, position: int, fmt: str) -> bool:
+        column = self._format_columns.get(fmt)
+        if column is None:
+            return False
+        return self._legalities[position * len(self._formats) + column] == self._legal_state
+
+    def legal_positions(self, fmt: str) -> list[int]:
+        """Return the ascending positions of cards that are legal in ``fmt``."""
+        column = self._format_columns.get(fmt)
+        if column is None:
+            return []
+        states = self._legalities[column :: len(self._formats)]
+        legal = self._legal_state
+        return [position for position, state in enumerate(states) if state == legal]
+
+    def available_formats(self) -> list[str]:
+        """Return formats in which at least one card is legal, sorted by name."""
+        if self._available_formats is not None:
+            return list(self._available_formats)
+        width = len(self._formats)
+        legal = self._legal_state
+        available = set()
+        for column, fmt in enumerate(self._formats):
+            if legal in self._legalities[column::width]:
+                available.add(fmt)
+        self._available_formats = sorted(available)
+        return list(self._available_formats)
+
+    def aliases(self, position: int) -> list[str]:
+        start = self._alias_offsets[position]
+        end = self._alias_offsets[position + 1]
+        return [self._strings[alias_id] for alias_id in self._alias_ids[start:end]]
+
+    def haystacks(self) -> list[str]:
+        """Return the lowercased search text of every card (see ``CardSearchIndex``)."""
+        name, type_line, oracle = (self._text[f] for f in ("name", "type_line", "oracle_text"))
+        strings = self._strings
+        return [
+            build_haystack(strings[name[p]], strings[type_line[p]], strings[oracle[p]])
+            for p in range(self._size)
+        ]
+
+    def _materialize(self, position: int) -> dict[str, Any]:
+        name = self.text("name", position) or ""
+        legalities: dict[str, str] = {}
+        width = len(self._formats)
+        row = self._legalities[position * width : (position + 1) * width]
+        for column, state_id in enumerate(row):
+            if state_id:
+                legalities[self._formats[column]] = self._legality_states[state_id - 1]
+        return {
+            "name": name,
+            "name_lower": name.lower(),
+            "mana_cost": self.text("mana_cost", position),
+            "mana_value": self.mana_value(position),
+            "type_line": self.text("type_line", position),
+            "oracle_text": self.text("oracle_text", position),
+            "power": self.text("power", position),
+            "toughness": self.text("toughness", position),
+            "loyalty": self.text("loyalty", position),
+            "colors": mask_colors(self._colors[position]),
+            "color_identity": mask_colors(self._color_identity[position]),
+            "legalities": legalities,
+            "aliases": self.aliases(position),
+        }
+
+
+class CardRecordList(Sequence[dict[str, Any]]):
+    """Read-only list of card records that materializes each card on first access.
+
+    Search results are handed to virtual list controls that only ever render the visible
+    rows, so there is no point building thousands of dictionaries up front.
+    """
+
+    def __init__(self, store: CardStore, positions: Sequence[int]):
+        self._store = store
+        self._positions = positions
+
+    @property
+    def positions(self) -> Sequence[int]:
+        return self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return CardRecordList(self._store, self._positions[index])
+        return self._store[self._positions[index]]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        store = self._store
+        for position in self._positions:
+            yield store[position]
+
+    def __repr__(self) -> str:
+        return f"CardRecordList({len(self._positions)} cards)"
+
+
+def _as_array(typecode: str, column: Sequence[Any]) -> array:
+    if isinstance(column, array) and column.typecode == typecode:
+        return column
+    if isinstance(column, memoryview):
+        return array(typecode, column.tobytes())
+    return array(typecode, column)
+
+
+def _coerce_mana_value(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return math.nan
+
+
+__all__ = [
+    "CardRecordList",
+    "CardStore",
+    "CardStoreDelta",
+    "StringTable",
+    "card_digest",
+    "color_mask",
+    "mask_colors",
+]
@@ -128,6 +128,47 @@ def sanitize_zone_cards(entries: list) -> list[dict[str, int | float | str]]:
     return sanitized
 
 
+def parse_deck_zones(deck_text: str) -> dict[str, dict[str, int | float]]:
+    """
+    Sum the card quantities of a deck list per zone.
+
+    A blank line or a "Sideboard" header starts the sideboard. Quantities may be
+    fractional (average decks); repeated cards are summed and first-seen order is kept.
+
+    Args:
+        deck_text: Deck list as text (format: "quantity card_name")
+
+    Returns:
+        ``{"main": {card_name: qty}, "side": {card_name: qty}}`` with whole quantities
+        as ints
+    """
+    zones: dict[str, dict[str, float]] = {"main": {}, "side": {}}
+    target = zones["main"]
+
+    for line in deck_text.strip().split("\n"):
+        line = line.strip()
+
+        # Empty line or "Sideboard" header marks the sideboard
+        if not line or line.lower() == "sideboard":
+            target = zones["side"]
+            continue
+
+        parts = line.split(" ", 1)
+        if len(parts) < 2:
+            continue
+        try:
+            qty = float(parts[0])
+        except ValueError:
+            continue
+        card_name = parts[1].strip()
+        target[card_name] = target.get(card_name, 0.0) + qty
+
+    return {
+        zone: {name: int(qty) if qty.is_integer() else qty for name, qty in cards.items()}
+        for zone, cards in zones.items()
+    }
+
+
 def read_curr_deck_file() -> str:
     curr_deck_file = constants.CURR_DECK_FILE
     candidates = [curr_deck_file, LEGACY_CURR_DECK_CACHE, LEGACY_CURR_DECK_ROOT]
@@ -4,19 +4,154 @@ SQLite-based deck text cache for scalable, high-performance caching.
 This module provides a robust caching layer for MTGGoldfish deck texts using SQLite,
 eliminating the performance issues of large JSON files and providing instant lookups
 even with millions of cached decks.
+
+Each thread keeps one persistent connection (see ``utils.sqlite_pool``). Lookups only
+read: the access statistics they update are queued and committed in batches by a
+background writer, so reads never wait on the database write lock.
+
+Deck texts can optionally be stored compressed (see ``utils.deck_text_codec``): card
+names become ids from the ``deck_card_names`` table and the result is deflated with a
+preset dictionary trained on cached decks. :meth:`DeckTextCache.compress_storage`
+switches a database over; from then on new decks are stored compressed as well. Rows are
+only decompressed when they are read, and plain and compressed rows can be mixed.
+
+Every stored deck is also broken down into ``deck_cards`` rows (deck, card id, zone,
+quantity), so statistics over many decks, such as archetype card frequencies and
+average decks, are one indexed aggregate query (:meth:`DeckTextCache.card_aggregates`)
+instead of one text parse per deck.
+
+Those rows also feed a persistent per-archetype store: when a deck is added to an
+archetype (:meth:`DeckTextCache.add_archetype_decks`), its card quantities are added to
+that archetype's partial aggregate for the deck's day. Archetype statistics over any
+date window (:meth:`DeckTextCache.archetype_aggregates`) then merge a few per-day rows
+instead of touching individual decks, and survive eviction of the deck texts.
 """
 
+from __future__ import annotations
+
 import json
 import sqlite3
+import threading
 import time
+import zlib
+from collections import ChainMap
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TypeVar
 
 from loguru import logger
 
 from utils.constants import CACHE_DIR
+from utils.deck import parse_deck_zones
+from utils.deck_text_codec import (
+    card_names_in,
+    compress,
+    decode_deck,
+    decompress,
+    encode_deck,
+    train_dictionary,
+)
+from utils.sqlite_pool import BatchedWriter, SQLiteConnectionPool
 
 # SQLite database location
 DECK_CACHE_DB = CACHE_DIR / "deck_cache.db"
+# Bound on host parameters per IN (...) query (SQLite's historical default limit is 999).
+IN_QUERY_CHUNK_SIZE = 900
+# Seconds access-stat updates may wait in memory before they are committed.
+ACCESS_FLUSH_INTERVAL = 2.0
+# Compressed rows store ``codec = CODEC_PREFIX + <dictionary id>``; NULL means plain text.
+CODEC_PREFIX = "zlib:"
+# Decks sampled to train a compression dictionary.
+DICTIONARY_SAMPLE_SIZE = 2000
+# Rows converted per transaction by compress_storage/decompress_storage.
+CONVERT_BATCH_SIZE = 500
+
+_TOUCH_SQL = """
+    UPDATE deck_cache
+    SET access_count = access_count + 1,
+        last_accessed = ?
+    WHERE deck_number = ?
+"""
+
+_UPSERT_SQL = """
+    INSERT OR REPLACE INTO deck_cache
+    (deck_number, deck_text, deck_blob, codec, source, cached_at, access_count, last_accessed)
+    VALUES (?, ?, ?, ?, ?, ?, COALESCE((SELECT access_count FROM deck_cache WHERE deck_number = ?), 0), ?)
+"""
+
+_STORE_SQL = "UPDATE deck_cache SET deck_text = ?, deck_blob = ?, codec = ? WHERE deck_number = ?"
+
+_INSERT_CARD_SQL = "INSERT INTO deck_cards (deck_number, card_id, zone, qty) VALUES (?, ?, ?, ?)"
+
+_NOT_INDEXED = (
+    "NOT EXISTS (SELECT 1 FROM deck_cards WHERE deck_cards.deck_number = deck_cache.deck_number)"
+)
+
+_ADD_ARCHETYPE_STATS_SQL = """
+    INSERT INTO archetype_card_stats (archetype_key, day, zone, card_id, qty, decks)
+    SELECT ?, m.day, c.zone, c.card_id, c.qty, COUNT(*)
+    FROM temp.new_members m
+    CROSS JOIN deck_cards c ON c.deck_number = m.deck_number
+    WHERE true
+    GROUP BY m.day, c.zone, c.card_id, c.qty
+    ON CONFLICT (archetype_key, day, zone, card_id, qty) DO UPDATE
+    SET decks = decks + excluded.decks
+"""
+
+# (deck_text, deck_blob, codec) as stored in a row
+_StoredDeck = tuple[str, bytes | None, str | None]
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class CardAggregate:
+    """Copies of one card in one zone across a set of decks."""
+
+    card_name: str
+    zone: str  # "main" or "side"
+    # Quantity -> number of decks running exactly that many copies
+    copy_distribution: dict[int | float, int] = field(default_factory=dict)
+
+    @property
+    def appearances(self) -> int:
+        return sum(self.copy_distribution.values())
+
+    @property
+    def total_copies(self) -> int | float:
+        return sum(qty * decks for qty, decks in self.copy_distribution.items())
+
+    @property
+    def max_copies(self) -> int | float:
+        return max(self.copy_distribution, default=0)
+
+
+@dataclass
+class DeckCardAggregates:
+    """Result of :meth:`DeckTextCache.card_aggregates`."""
+
+    deck_numbers: list[str]  # Cached decks the aggregates cover
+    cards: list[CardAggregate]
+
+    def zone(self, zone: str) -> list[CardAggregate]:
+        return [card for card in self.cards if card.zone == zone]
+
+
+def archetype_key(source: str, archetype: str, mtg_format: str = "") -> str:
+    """Key under which the decks of ``archetype`` from ``source`` are aggregated."""
+    return ":".join((source, mtg_format.strip().lower(), archetype.strip().lower()))
+
+
+def _build_card_aggregates(rows: Iterable[tuple[str, str, float, int]]) -> list[CardAggregate]:
+    """Group ``(zone, name, qty, decks)`` rows into one ``CardAggregate`` per card and zone."""
+    cards: dict[tuple[str, str], CardAggregate] = {}
+    for zone, name, qty, decks in rows:
+        card = cards.get((zone, name))
+        if card is None:
+            card = cards[(zone, name)] = CardAggregate(name, zone)
+        card.copy_distribution[int(qty) if float(qty).is_integer() else qty] = decks
+    return list(cards.values())
 
 
 class DeckTextCache:
@@ -30,19 +165,29 @@ class DeckTextCache:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._pool = SQLiteConnectionPool(self.db_path)
+        self._access_writer: BatchedWriter | None = None
+        self._writer_lock = threading.Lock()
+        # Compression state shared by all threads
+        self._codec_lock = threading.Lock()
+        self._dictionaries: dict[int, bytes] = {}
+        self._card_ids: dict[str, int] = {}
+        self._card_names: dict[int, str] = {}
+        self._write_dictionary: int | None = None
         self._ensure_schema()
+        self._load_codec_state()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's persistent connection to the cache database."""
+        return self._pool.connection()
 
     def _ensure_schema(self) -> None:
         """Create the cache table and indexes if they don't exist."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+        with self.connection() as conn:
             cursor = conn.cursor()
 
-            # Enable WAL mode for better concurrent access
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA busy_timeout=30000")  # 30 second timeout
-
             # Create main cache table
             cursor.execute(
                 """
@@ -68,6 +213,93 @@ class DeckTextCache:
                 # Column already exists
                 pass
 
+            # Add compressed storage columns (migration)
+            for column in ("deck_blob BLOB", "codec TEXT"):
+                try:
+                    cursor.execute(f"ALTER TABLE deck_cache ADD COLUMN {column}")
+                    conn.commit()
+                except sqlite3.OperationalError:
+                    # Column already exists
+                    pass
+
+            # Compression dictionaries and the card name ids compressed decks refer to
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS deck_dictionaries (
+                    dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dictionary BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS deck_card_names (
+                    card_id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                )
+            """
+            )
+
+            # Normalized deck contents for aggregate queries
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS deck_cards (
+                    deck_number TEXT NOT NULL,
+                    card_id INTEGER NOT NULL,
+                    zone TEXT NOT NULL,
+                    qty REAL NOT NULL,
+                    PRIMARY KEY (deck_number, zone, card_id)
+                ) WITHOUT ROWID
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_deck_cards_card
+                ON deck_cards(card_id, zone)
+            """
+            )
+            cursor.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS deck_cache_delete_cards
+                AFTER DELETE ON deck_cache
+                BEGIN
+                    DELETE FROM deck_cards WHERE deck_number = OLD.deck_number;
+                END
+            """
+            )
+
+            # Per-archetype card statistics, one partial aggregate per day
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archetype_decks (
+                    archetype_key TEXT NOT NULL,
+                    deck_number TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    PRIMARY KEY (archetype_key, deck_number)
+                ) WITHOUT ROWID
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_archetype_decks_day
+                ON archetype_decks(archetype_key, day)
+            """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS archetype_card_stats (
+                    archetype_key TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    zone TEXT NOT NULL,
+                    card_id INTEGER NOT NULL,
+                    qty REAL NOT NULL,
+                    decks INTEGER NOT NULL,
+                    PRIMARY KEY (archetype_key, day, zone, card_id, qty)
+                ) WITHOUT ROWID
+            """
+            )
+
             # Create index on last_accessed for efficient LRU operations
             cursor.execute(
                 """
@@ -99,53 +331,82 @@ class DeckTextCache:
             Deck text if found, None otherwise
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                cursor = conn.cursor()
-
-                # Get deck text and update access statistics
-                if source:
-                    cursor.execute(
-                        """
-                        SELECT deck_text FROM deck_cache
-                        WHERE deck_number = ? AND source = ?
-                        """,
-                        (deck_number, source),
-                    )
-                else:
-                    cursor.execute(
-                        """
-                        SELECT deck_text FROM deck_cache
-                        WHERE deck_number = ?
-                        """,
-                        (deck_number,),
-                    )
-
-                row = cursor.fetchone()
+            conn = self.connection()
+            if source:
+                row = conn.execute(
+                    """
+                    SELECT deck_text, deck_blob, codec FROM deck_cache
+                    WHERE deck_number = ? AND source = ?
+                    """,
+                    (deck_number, source),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    """
+                    SELECT deck_text, deck_blob, codec FROM deck_cache
+                    WHERE deck_number = ?
+                    """,
+                    (deck_number,),
+                ).fetchone()
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.error(f"Error reading from deck cache: {exc}")
+            return None
 
-                if row:
-                    deck_text = row[0]
+        deck_text = self._decode(deck_number, row) if row else None
+        if deck_text is not None:
+            self._record_access([deck_number])
+            logger.debug(f"Cache HIT for deck {deck_number}")
+            return deck_text
 
-                    # Update access statistics
-                    cursor.execute(
-                        """
-                        UPDATE deck_cache
-                        SET access_count = access_count + 1,
-                            last_accessed = ?
-                        WHERE deck_number = ?
-                        """,
-                        (time.time(), deck_number),
-                    )
-                    conn.commit()
+        logger.debug(f"Cache MISS for deck {deck_number}")
+        return None
 
-                    logger.debug(f"Cache HIT for deck {deck_number}")
-                    return deck_text
+    def get_many(self, deck_numbers: Iterable[str], source: str | None = None) -> dict[str, str]:
+        """
+        Get the cached texts of several decks in one read transaction.
 
-                logger.debug(f"Cache MISS for deck {deck_number}")
-                return None
+        Args:
+            deck_numbers: Deck numbers/IDs to look up
+            source: Optional source filter ('mtggoldfish' or 'mtgo')
 
-        except sqlite3.Error as exc:
+        Returns:
+            Mapping of deck number to deck text for the decks found in the cache
+        """
+        numbers = list(dict.fromkeys(str(number) for number in deck_numbers if number))
+        rows: list[tuple[str, str, bytes | None, str | None]] = []
+        if not numbers:
+            return {}
+        source_clause = " AND source = ?" if source else ""
+        try:
+            conn = self.connection()
+            # One read transaction, so all chunks see the same snapshot.
+            conn.execute("BEGIN")
+            try:
+                for start in range(0, len(numbers), IN_QUERY_CHUNK_SIZE):
+                    chunk = numbers[start : start + IN_QUERY_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    params = [*chunk, source] if source else chunk
+                    rows.extend(
+                        conn.execute(
+                            f"SELECT deck_number, deck_text, deck_blob, codec FROM deck_cache "
+                            f"WHERE deck_number IN ({placeholders}){source_clause}",
+                            params,
+                        ).fetchall()
+                    )
+            finally:
+                conn.rollback()
+        except (sqlite3.Error, RuntimeError) as exc:
             logger.error(f"Error reading from deck cache: {exc}")
-            return None
+            return {}
+        # Decompress outside the read transaction
+        found: dict[str, str] = {}
+        for number, *stored in rows:
+            deck_text = self._decode(number, stored)
+            if deck_text is not None:
+                found[number] = deck_text
+        self._record_access(found)
+        logger.debug(f"Cache batch lookup: {len(found)} of {len(numbers)} decks found")
+        return found
 
     def set(self, deck_number: str, deck_text: str, source: str = "mtggoldfish") -> bool:
         """
@@ -159,29 +420,53 @@ class DeckTextCache:
         Returns:
             True if successful, False otherwise
         """
+        return self.set_many([(deck_number, deck_text)], source=source) == 1
+
+    def set_many(
+        self,
+        items: Mapping[str, str] | Iterable[tuple[str, str]],
+        source: str = "mtggoldfish",
+    ) -> int:
+        """
+        Store several deck texts in one transaction, retrying on database locks.
+
+        Args:
+            items: Mapping or ``(deck_number, deck_text)`` pairs
+            source: Data source ('mtggoldfish' or 'mtgo')
+
+        Returns:
+            Number of decks stored (0 if the transaction failed)
+        """
+        pairs = items.items() if isinstance(items, Mapping) else items
+        rows = [(str(number), text) for number, text in pairs]
+        if not rows:
+            return 0
+
+        def write(conn: sqlite3.Connection) -> int:
+            now = time.time()
+            with conn:
+                stored, new_ids = self._encode(conn, [text for _number, text in rows])
+                conn.executemany(
+                    _UPSERT_SQL,
+                    [
+                        (number, *deck, source, now, number, now)
+                        for (number, _text), deck in zip(rows, stored)
+                    ],
+                )
+                new_ids.update(self._index_cards(conn, rows))
+            self._remember_card_ids(new_ids)
+            return len(rows)
+
+        return self._write_with_retry(write, default=0)
+
+    def _write_with_retry(self, write: Callable[[sqlite3.Connection], _T], default: _T) -> _T:
+        """Run ``write`` on this thread's connection, backing off while the database is locked."""
         max_retries = 3
         retry_delay = 0.1  # Start with 100ms
 
         for attempt in range(max_retries):
             try:
-                with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                    cursor = conn.cursor()
-
-                    now = time.time()
-
-                    # Insert or replace deck text
-                    cursor.execute(
-                        """
-                        INSERT OR REPLACE INTO deck_cache
-                        (deck_number, deck_text, source, cached_at, access_count, last_accessed)
-                        VALUES (?, ?, ?, ?, COALESCE((SELECT access_count FROM deck_cache WHERE deck_number = ?), 0), ?)
-                        """,
-                        (deck_number, deck_text, source, now, deck_number, now),
-                    )
-
-                    conn.commit()
-                    return True
-
+                return write(self.connection())
             except sqlite3.OperationalError as exc:
                 if "database is locked" in str(exc) and attempt < max_retries - 1:
                     logger.warning(
@@ -192,27 +477,577 @@ class DeckTextCache:
                     continue
                 else:
                     logger.error(f"Error writing to deck cache after {attempt + 1} attempts: {exc}")
-                    return False
-            except sqlite3.Error as exc:
+                    return default
+            except (sqlite3.Error, RuntimeError) as exc:
                 logger.error(f"Error writing to deck cache: {exc}")
-                return False
+                return default
+
+        return default
+
+    def _record_access(self, deck_numbers: Iterable[str]) -> None:
+        """Queue access-stat updates for the background writer."""
+        now = time.time()
+        rows = [(now, number) for number in deck_numbers]
+        if not rows:
+            return
+        with self._writer_lock:
+            if self._access_writer is None:
+                self._access_writer = BatchedWriter(
+                    self._pool,
+                    _TOUCH_SQL,
+                    flush_interval=ACCESS_FLUSH_INTERVAL,
+                    name="deck-cache-access-writer",
+                )
+            writer = self._access_writer
+        try:
+            writer.submit_many(rows)
+        except RuntimeError:
+            # Closed concurrently; access statistics are best effort.
+            pass
+
+    def flush(self, timeout: float | None = 10.0) -> None:
+        """Wait until queued access-stat updates are committed."""
+        writer = self._access_writer
+        if writer is not None:
+            writer.flush(timeout)
+
+    def close(self) -> None:
+        """Commit queued access-stat updates and close all database connections."""
+        with self._writer_lock:
+            writer, self._access_writer = self._access_writer, None
+        if writer is not None:
+            writer.close()
+        self._pool.close()
+
+    # ============= Compressed Storage =============
+
+    @property
+    def compressed(self) -> bool:
+        """Whether new decks are stored compressed."""
+        return self._write_dictionary is not None
+
+    def compress_storage(
+        self,
+        sample_size: int = DICTIONARY_SAMPLE_SIZE,
+        batch_size: int = CONVERT_BATCH_SIZE,
+        retrain: bool = False,
+    ) -> int:
+        """
+        Switch the cache to compressed storage and convert the stored decks.
+
+        A dictionary is trained on a random sample of cached decks unless one exists
+        already (or ``retrain`` is set). Rows are converted in batches of ``batch_size``,
+        each in its own transaction, so the cache stays usable meanwhile. Run
+        :meth:`vacuum` afterwards to return the freed pages to the file system.
+
+        Returns:
+            Number of decks converted
+        """
+        self.flush()
+        try:
+            if self._write_dictionary is None or retrain:
+                if not self._train_dictionary(sample_size):
+                    return 0
+            codec = f"{CODEC_PREFIX}{self._write_dictionary}"
+            converted = self._rewrite_rows(
+                "codec IS NULL OR codec != ?", (codec,), batch_size, self._restore_decks
+            )
+            with self.connection() as conn:
+                # Drop dictionaries no row refers to any more
+                conn.execute(
+                    "DELETE FROM deck_dictionaries WHERE dict_id != ? AND NOT EXISTS "
+                    "(SELECT 1 FROM deck_cache WHERE codec = ? || dict_id)",
+                    (self._write_dictionary, CODEC_PREFIX),
+                )
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.error(f"Error compressing deck cache: {exc}")
+            return 0
+        logger.info(f"Compressed {converted} cached decks")
+        return converted
+
+    def decompress_storage(self, batch_size: int = CONVERT_BATCH_SIZE) -> int:
+        """
+        Store every deck as plain text again and stop compressing new ones.
+
+        Returns:
+            Number of decks converted
+        """
+        self.flush()
+        with self._codec_lock:
+            self._write_dictionary = None
+
+        try:
+            converted = self._rewrite_rows("codec IS NOT NULL", (), batch_size, self._restore_decks)
+            with self.connection() as conn:
+                conn.execute("DELETE FROM deck_dictionaries")
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.error(f"Error decompressing deck cache: {exc}")
+            return 0
+        logger.info(f"Decompressed {converted} cached decks")
+        return converted
+
+    def _train_dictionary(self, sample_size: int) -> bool:
+        """Train and store a new dictionary; returns False if there is nothing to train on."""
+        conn = self.connection()
+        sample = conn.execute(
+            """
+            SELECT deck_number, deck_text, deck_blob, codec FROM deck_cache
+            ORDER BY RANDOM() LIMIT ?
+            """,
+            (sample_size,),
+        ).fetchall()
+        texts = [text for text in (self._decode(row[0], row[1:]) for row in sample) if text]
+        if not texts:
+            logger.info("Deck cache is empty, no compression dictionary trained")
+            return False
+        with conn:
+            new_ids = self._assign_card_ids(conn, set().union(*map(card_names_in, texts)))
+            card_ids = ChainMap(new_ids, self._card_ids)
+            dictionary = train_dictionary(encode_deck(text, card_ids.__getitem__) for text in texts)
+            dict_id = conn.execute(
+                "INSERT INTO deck_dictionaries (dictionary, created_at) VALUES (?, ?)",
+                (dictionary, time.time()),
+            ).lastrowid
+        self._remember_card_ids(new_ids)
+        with self._codec_lock:
+            self._dictionaries[dict_id] = dictionary
+            self._write_dictionary = dict_id
+        logger.info(
+            f"Trained deck compression dictionary {dict_id} "
+            f"({len(dictionary)} bytes from {len(texts)} decks)"
+        )
+        return True
+
+    def _rewrite_rows(
+        self,
+        where: str,
+        params: tuple,
+        batch_size: int,
+        apply: Callable[[sqlite3.Connection, list[tuple[str, str]]], dict[str, int]],
+    ) -> int:
+        """
+        Call ``apply`` on the decks matching ``where``, one batch per write transaction.
+
+        ``apply`` receives ``(deck_number, deck_text)`` pairs and returns the card ids it
+        assigned.
+        """
+        conn = self.connection()
+        rewritten = 0
+        last_number = ""
+        while True:
+            batch = conn.execute(
+                f"""
+                SELECT deck_number, deck_text, deck_blob, codec FROM deck_cache
+                WHERE ({where}) AND deck_number > ?
+                ORDER BY deck_number LIMIT ?
+                """,
+                (*params, last_number, batch_size),
+            ).fetchall()
+            if not batch:
+                return rewritten
+            last_number = batch[-1][0]
+            decoded = [(row[0], self._decode(row[0], row[1:])) for row in batch]
+            decoded = [(number, text) for number, text in decoded if text is not None]
+
+            def write(conn: sqlite3.Connection, decoded: list = decoded) -> int:
+                with conn:
+                    new_ids = apply(conn, decoded)
+                self._remember_card_ids(new_ids)
+                return len(decoded)
+
+            written = self._write_with_retry(write, default=None)
+            if written is None:
+                raise RuntimeError("Could not rewrite deck cache rows")
+            rewritten += written
+
+    def _restore_decks(
+        self, conn: sqlite3.Connection, decks: list[tuple[str, str]]
+    ) -> dict[str, int]:
+        """Store ``decks`` again in the current storage format."""
+        stored, new_ids = self._encode(conn, [text for _number, text in decks])
+        conn.executemany(
+            _STORE_SQL, [(*deck, number) for (number, _text), deck in zip(decks, stored)]
+        )
+        return new_ids
+
+    def _encode(
+        self, conn: sqlite3.Connection, texts: list[str]
+    ) -> tuple[list[_StoredDeck], dict[str, int]]:
+        """
+        Encode deck texts for storage inside the caller's write transaction.
+
+        Returns:
+            ``(deck_text, deck_blob, codec)`` per text, and the card ids assigned in this
+            transaction (to be remembered once it commits)
+        """
+        dict_id = self._write_dictionary
+        if dict_id is None:
+            return [(text, None, None) for text in texts], {}
+        dictionary = self._dictionary(dict_id)
+        new_ids = self._assign_card_ids(conn, set().union(*map(card_names_in, texts)))
+        card_ids = ChainMap(new_ids, self._card_ids)
+        codec = f"{CODEC_PREFIX}{dict_id}"
+        stored: list[_StoredDeck] = [
+            ("", compress(encode_deck(text, card_ids.__getitem__), dictionary), codec)
+            for text in texts
+        ]
+        return stored, new_ids
+
+    def _decode(self, deck_number: str, stored: Iterable) -> str | None:
+        """Return the text of a stored ``(deck_text, deck_blob, codec)`` row, or None."""
+        deck_text, deck_blob, codec = stored
+        if codec is None:
+            return deck_text
+        try:
+            if not codec.startswith(CODEC_PREFIX):
+                raise ValueError(f"unknown codec {codec!r}")
+            dictionary = self._dictionary(int(codec[len(CODEC_PREFIX) :]))
+            return decode_deck(decompress(deck_blob, dictionary), self._card_name)
+        except (KeyError, ValueError, zlib.error, sqlite3.Error) as exc:
+            logger.error(f"Could not decode cached deck {deck_number}: {exc}")
+            return None
+
+    def _assign_card_ids(self, conn: sqlite3.Connection, names: Iterable[str]) -> dict[str, int]:
+        """Insert ids for the card ``names`` that have none yet."""
+        unknown = sorted(name for name in names if name not in self._card_ids)
+        if not unknown:
+            return {}
+        conn.executemany(
+            "INSERT OR IGNORE INTO deck_card_names (name) VALUES (?)",
+            [(name,) for name in unknown],
+        )
+        assigned: dict[str, int] = {}
+        for start in range(0, len(unknown), IN_QUERY_CHUNK_SIZE):
+            chunk = unknown[start : start + IN_QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            assigned.update(
+                conn.execute(
+                    f"SELECT name, card_id FROM deck_card_names WHERE name IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            )
+        return assigned
+
+    def _remember_card_ids(self, card_ids: Mapping[str, int]) -> None:
+        if not card_ids:
+            return
+        with self._codec_lock:
+            self._card_ids.update(card_ids)
+            self._card_names.update((card_id, name) for name, card_id in card_ids.items())
+
+    def _card_name(self, card_id: int) -> str:
+        name = self._card_names.get(card_id)
+        if name is None:
+            # Assigned by another process since the names were loaded
+            self._load_card_names()
+            name = self._card_names[card_id]
+        return name
+
+    def _dictionary(self, dict_id: int) -> bytes:
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            row = (
+                self.connection()
+                .execute("SELECT dictionary FROM deck_dictionaries WHERE dict_id = ?", (dict_id,))
+                .fetchone()
+            )
+            if row is None:
+                raise KeyError(f"compression dictionary {dict_id} is missing")
+            dictionary = self._dictionaries[dict_id] = row[0]
+        return dictionary
+
+    def _load_card_names(self) -> None:
+        rows = self.connection().execute("SELECT name, card_id FROM deck_card_names").fetchall()
+        self._remember_card_ids(dict(rows))
+
+    def _load_codec_state(self) -> None:
+        """Load the card ids and the dictionary new decks are compressed with, if any."""
+        try:
+            (dict_id,) = (
+                self.connection().execute("SELECT MAX(dict_id) FROM deck_dictionaries").fetchone()
+            )
+            self._load_card_names()
+        except sqlite3.Error as exc:
+            logger.error(f"Error loading deck cache compression state: {exc}")
+            return
+        self._write_dictionary = dict_id
+
+    # ============= Card Aggregates =============
+
+    def card_aggregates(
+        self, deck_numbers: Iterable[str], source: str | None = None
+    ) -> DeckCardAggregates:
+        """
+        Aggregate the card quantities of several cached decks with one SQL query.
 
-        return False
+        Decks cached before ``deck_cards`` existed are broken down on first use.
+
+        Args:
+            deck_numbers: Deck numbers/IDs to aggregate; uncached ones are ignored
+            source: Optional source filter ('mtggoldfish' or 'mtgo')
+
+        Returns:
+            The decks covered and, per card and zone, how many decks run each quantity
+        """
+        numbers = list(dict.fromkeys(str(number) for number in deck_numbers if number))
+        if not numbers:
+            return DeckCardAggregates([], [])
+        self._index_missing_cards(numbers)
+        source_clause = " WHERE d.source = ?" if source else ""
+        source_params = (source,) if source else ()
+        try:
+            conn = self.connection()
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS selected_decks "
+                    "(deck_number TEXT PRIMARY KEY)"
+                )
+                conn.execute("DELETE FROM temp.selected_decks")
+                conn.executemany(
+                    "INSERT INTO temp.selected_decks VALUES (?)", [(n,) for n in numbers]
+                )
+                found = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT d.deck_number FROM temp.selected_decks s "
+                        f"JOIN deck_cache d ON d.deck_number = s.deck_number{source_clause}",
+                        source_params,
+                    )
+                ]
+                # CROSS JOIN pins the join order: walk the selected decks and look up
+                # their cards by primary key rather than scanning every deck's cards.
+                rows = conn.execute(
+                    f"""
+                    SELECT c.zone, n.name, c.qty, COUNT(*)
+                    FROM temp.selected_decks s
+                    CROSS JOIN deck_cache d ON d.deck_number = s.deck_number
+                    CROSS JOIN deck_cards c ON c.deck_number = s.deck_number
+                    JOIN deck_card_names n ON n.card_id = c.card_id{source_clause}
+                    GROUP BY c.zone, c.card_id, c.qty
+                    ORDER BY c.zone, n.name, c.qty
+                    """,
+                    source_params,
+                ).fetchall()
+            finally:
+                conn.rollback()
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.error(f"Error aggregating deck cards: {exc}")
+            return DeckCardAggregates([], [])
+
+        self._record_access(found)
+        return DeckCardAggregates(found, _build_card_aggregates(rows))
+
+    def index_deck_cards(self, batch_size: int = CONVERT_BATCH_SIZE) -> int:
+        """
+        Break down every cached deck that has no ``deck_cards`` rows yet.
+
+        Returns:
+            Number of decks indexed
+        """
+        try:
+            indexed = self._rewrite_rows(_NOT_INDEXED, (), batch_size, self._index_cards)
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.error(f"Error indexing deck cards: {exc}")
+            return 0
+        if indexed:
+            logger.info(f"Indexed the cards of {indexed} cached decks")
+        return indexed
+
+    def _index_missing_cards(self, numbers: list[str]) -> None:
+        """Index the cards of those of ``numbers`` that are cached but not broken down."""
+        try:
+            conn = self.connection()
+            missing: list[tuple[str, str]] = []
+            for start in range(0, len(numbers), IN_QUERY_CHUNK_SIZE):
+                chunk = numbers[start : start + IN_QUERY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                for number, *stored in conn.execute(
+                    f"SELECT deck_number, deck_text, deck_blob, codec FROM deck_cache "
+                    f"WHERE deck_number IN ({placeholders}) AND {_NOT_INDEXED}",
+                    chunk,
+                ):
+                    deck_text = self._decode(number, stored)
+                    if deck_text is not None:
+                        missing.append((number, deck_text))
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.error(f"Error reading from deck cache: {exc}")
+            return
+        if not missing:
+            return
+
+        def write(conn: sqlite3.Connection) -> int:
+            with conn:
+                new_ids = self._index_cards(conn, missing)
+            self._remember_card_ids(new_ids)
+            return len(missing)
+
+        self._write_with_retry(write, default=0)
+
+    def _index_cards(
+        self, conn: sqlite3.Connection, decks: list[tuple[str, str]]
+    ) -> dict[str, int]:
+        """Replace the ``deck_cards`` rows of ``decks`` inside the caller's transaction."""
+        zones = [(number, parse_deck_zones(text)) for number, text in decks]
+        names = {name for _number, deck in zones for cards in deck.values() for name in cards}
+        new_ids = self._assign_card_ids(conn, names)
+        card_ids = ChainMap(new_ids, self._card_ids)
+        conn.executemany(
+            "DELETE FROM deck_cards WHERE deck_number = ?", [(number,) for number, _ in decks]
+        )
+        conn.executemany(
+            _INSERT_CARD_SQL,
+            [
+                (number, card_ids[name], zone, qty)
+                for number, deck in zones
+                for zone, cards in deck.items()
+                for name, qty in cards.items()
+            ],
+        )
+        return new_ids
+
+    # ============= Archetype Aggregates =============
+
+    def add_archetype_decks(self, archetype_key: str, decks: Iterable[tuple[str, str]]) -> set[str]:
+        """
+        Add cached decks to the per-day card statistics of an archetype.
+
+        Adding is idempotent: a deck counts once per archetype, on the day it was first
+        added with. Decks that are not cached are skipped, so they can be added once
+        their text has been downloaded.
+
+        Args:
+            archetype_key: Archetype to add to (see :func:`archetype_key`)
+            decks: ``(deck_number, day)`` pairs with days as ``YYYY-MM-DD``
+
+        Returns:
+            Deck numbers among ``decks`` that the archetype's statistics include
+        """
+        members: dict[str, str] = {}
+        for number, day in decks:
+            if number and day:
+                members.setdefault(str(number), day)
+        if not members:
+            return set()
+        self._index_missing_cards(list(members))
+
+        def write(conn: sqlite3.Connection) -> set[str]:
+            for table in ("incoming_decks", "new_members"):
+                conn.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {table} "
+                    "(deck_number TEXT PRIMARY KEY, day TEXT NOT NULL)"
+                )
+            with conn:
+                conn.execute("DELETE FROM temp.incoming_decks")
+                conn.execute("DELETE FROM temp.new_members")
+                conn.executemany("INSERT INTO temp.incoming_decks VALUES (?, ?)", members.items())
+                conn.execute(
+                    """
+                    INSERT INTO temp.new_members
+                    SELECT i.deck_number, i.day FROM temp.incoming_decks i
+                    WHERE EXISTS (SELECT 1 FROM deck_cards c WHERE c.deck_number = i.deck_number)
+                    AND NOT EXISTS (
+                        SELECT 1 FROM archetype_decks a
+                        WHERE a.archetype_key = ? AND a.deck_number = i.deck_number
+                    )
+                    """,
+                    (archetype_key,),
+                )
+                added = conn.execute(
+                    "INSERT INTO archetype_decks SELECT ?, deck_number, day FROM temp.new_members",
+                    (archetype_key,),
+                ).rowcount
+                conn.execute(_ADD_ARCHETYPE_STATS_SQL, (archetype_key,))
+                included = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT i.deck_number FROM temp.incoming_decks i "
+                        "JOIN archetype_decks a ON a.deck_number = i.deck_number "
+                        "WHERE a.archetype_key = ?",
+                        (archetype_key,),
+                    )
+                }
+            if added:
+                logger.debug(f"Added {added} decks to archetype statistics {archetype_key}")
+            return included
+
+        return self._write_with_retry(write, default=set())
+
+    def archetype_aggregates(
+        self,
+        archetype_keys: Iterable[str],
+        since: str | None = None,
+        until: str | None = None,
+    ) -> DeckCardAggregates:
+        """
+        Merge the per-day card statistics of one or more archetypes over a date window.
+
+        Args:
+            archetype_keys: Archetypes to merge (see :func:`archetype_key`)
+            since: First day included (``YYYY-MM-DD``), None for no lower bound
+            until: Last day included (``YYYY-MM-DD``), None for no upper bound
+
+        Returns:
+            The decks in the window and, per card and zone, how many run each quantity
+        """
+        keys = list(dict.fromkeys(archetype_keys))
+        if not keys:
+            return DeckCardAggregates([], [])
+        clauses = [f"archetype_key IN ({','.join('?' * len(keys))})"]
+        params: list[str] = list(keys)
+        if since:
+            clauses.append("day >= ?")
+            params.append(since)
+        if until:
+            clauses.append("day <= ?")
+            params.append(until)
+        where = " AND ".join(clauses)
+        try:
+            conn = self.connection()
+            conn.execute("BEGIN")
+            try:
+                numbers = [
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT deck_number FROM archetype_decks WHERE {where}", params
+                    )
+                ]
+                rows = conn.execute(
+                    f"""
+                    SELECT s.zone, n.name, s.qty, SUM(s.decks)
+                    FROM archetype_card_stats s
+                    JOIN deck_card_names n ON n.card_id = s.card_id
+                    WHERE {where}
+                    GROUP BY s.zone, s.card_id, s.qty
+                    ORDER BY s.zone, n.name, s.qty
+                    """,
+                    params,
+                ).fetchall()
+            finally:
+                conn.rollback()
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.error(f"Error reading archetype statistics: {exc}")
+            return DeckCardAggregates([], [])
+        return DeckCardAggregates(numbers, _build_card_aggregates(rows))
 
     def get_stats(self) -> dict:
         """
         Get cache statistics.
 
         Returns:
-            Dictionary with cache stats (total_decks, db_size_mb, oldest_entry, newest_entry)
+            Dictionary with cache stats (total_decks, compressed_decks, db_size_mb,
+            oldest_entry, newest_entry)
         """
+        self.flush()
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.connection() as conn:
                 cursor = conn.cursor()
 
                 # Get total count
                 cursor.execute("SELECT COUNT(*) FROM deck_cache")
                 total_decks = cursor.fetchone()[0]
+                cursor.execute("SELECT COUNT(*) FROM deck_cache WHERE codec IS NOT NULL")
+                compressed_decks = cursor.fetchone()[0]
 
                 # Get oldest and newest entries
                 cursor.execute("SELECT MIN(cached_at), MAX(cached_at) FROM deck_cache")
@@ -235,6 +1070,7 @@ class DeckTextCache:
 
                 return {
                     "total_decks": total_decks,
+                    "compressed_decks": compressed_decks,
                     "db_size_mb": round(db_size_mb, 2),
                     "oldest_entry": oldest,
                     "newest_entry": newest,
@@ -258,7 +1094,7 @@ class DeckTextCache:
         cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
 
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.connection() as conn:
                 cursor = conn.cursor()
 
                 cursor.execute(
@@ -288,8 +1124,10 @@ class DeckTextCache:
         Returns:
             Number of entries deleted
         """
+        # Evict by up-to-date access times.
+        self.flush()
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.connection() as conn:
                 cursor = conn.cursor()
 
                 # Count current entries
@@ -348,7 +1186,7 @@ class DeckTextCache:
                 return 0
 
             migrated = 0
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.connection() as conn:
                 cursor = conn.cursor()
                 now = time.time()
 
@@ -380,7 +1218,7 @@ class DeckTextCache:
     def vacuum(self) -> None:
         """Optimize database and reclaim space after deletions."""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.connection() as conn:
                 conn.execute("VACUUM")
                 logger.info("Database vacuumed successfully")
         except sqlite3.Error as exc:
@@ -394,8 +1232,10 @@ class DeckTextCache:
             True if successful
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with self.connection() as conn:
                 conn.execute("DELETE FROM deck_cache")
+                conn.execute("DELETE FROM archetype_decks")
+                conn.execute("DELETE FROM archetype_card_stats")
                 conn.commit()
             logger.info("Deck cache cleared")
             return True
@@ -419,4 +1259,6 @@ def get_deck_cache() -> DeckTextCache:
 def reset_deck_cache() -> None:
     """Reset the global cache instance (useful for testing)."""
     global _cache_instance
+    if _cache_instance is not None:
+        _cache_instance.close()
     _cache_instance = None
@@ -0,0 +1,153 @@
+"""Compact encoding of cached deck lists.
+
+Deck lists are extremely repetitive: the same few hundred card names and the same
+``4 Name`` lines appear in thousands of decks. A stored deck is encoded in two steps:
+
+1. :func:`encode_deck` replaces every ``<count> <card name>`` line with the count and a
+   numeric card id (ids are assigned by the caller, see ``DeckTextCache``), shrinking a
+   75-card list to a few bytes per line. Other lines (``Sideboard`` headers, blank lines)
+   are kept verbatim, so decoding reproduces the original text exactly.
+2. :func:`compress` deflates the encoded payload with a preset dictionary built by
+   :func:`train_dictionary` from a sample of encoded decks, so most of a deck becomes a
+   few back-references into a similar deck of the same archetype.
+
+Only the standard library is needed: zlib accepts a preset dictionary (``zdict``) of up
+to its 32 KiB window.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections import Counter
+from collections.abc import Callable, Iterable
+
+__all__ = [
+    "MAX_DICTIONARY_SIZE",
+    "card_names_in",
+    "compress",
+    "decode_deck",
+    "decompress",
+    "encode_deck",
+    "train_dictionary",
+]
+
+# zlib only looks back 32 KiB, so a larger preset dictionary would never be referenced.
+MAX_DICTIONARY_SIZE = 32 * 1024
+COMPRESSION_LEVEL = 9
+# Raw deflate: the zlib header and checksum would add 6 bytes to every ~20-byte deck.
+_WBITS = -zlib.MAX_WBITS
+
+# Payload kinds, stored as the first byte of the encoded deck.
+_CARD_IDS = b"I"
+_RAW_TEXT = b"T"
+# Separates the count from the card id; never part of a decklist.
+_ID_SEPARATOR = "\x1f"
+
+_CARD_LINE = re.compile(r"(\d+) (\S.*)")
+
+
+def card_names_in(text: str) -> set[str]:
+    """Card names of the ``<count> <name>`` lines of ``text``."""
+    names = set()
+    for line in text.split("\n"):
+        match = _CARD_LINE.fullmatch(line)
+        if match:
+            names.add(match.group(2))
+    return names
+
+
+def encode_deck(text: str, card_id: Callable[[str], int]) -> bytes:
+    """
+    Encode ``text`` with card names replaced by ``card_id(name)``.
+
+    Text that already contains the separator is stored verbatim instead.
+    """
+    if _ID_SEPARATOR in text:
+        return _RAW_TEXT + text.encode("utf-8")
+    lines = []
+    for line in text.split("\n"):
+        match = _CARD_LINE.fullmatch(line)
+        if match:
+            line = f"{match.group(1)}{_ID_SEPARATOR}{card_id(match.group(2))}"
+        lines.append(line)
+    return _CARD_IDS + "\n".join(lines).encode("utf-8")
+
+
+def decode_deck(payload: bytes, card_name: Callable[[int], str]) -> str:
+    """
+    Invert :func:`encode_deck`.
+
+    Raises:
+        KeyError: If ``card_name`` does not know an id used by the payload
+        ValueError: If the payload is not an encoded deck
+    """
+    kind, body = payload[:1], payload[1:].decode("utf-8")
+    if kind == _RAW_TEXT:
+        return body
+    if kind != _CARD_IDS:
+        raise ValueError(f"Unknown deck payload kind {kind!r}")
+    lines = []
+    for line in body.split("\n"):
+        count, separator, card = line.partition(_ID_SEPARATOR)
+        if separator:
+            line = f"{count} {card_name(int(card))}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def train_dictionary(payloads: Iterable[bytes], size: int = MAX_DICTIONARY_SIZE) -> bytes:
+    """
+    Build a zlib preset dictionary from sample encoded decks.
+
+    Whole decks make the best dictionary content, since deflate then finds entire runs of
+    an archetype's lines at once. Decks are picked greedily by how many bytes of commonly
+    seen lines they add per byte of dictionary, so every popular archetype gets a
+    representative before near-duplicates do. The most valuable decks go last, where
+    back-references to them are shortest.
+    """
+    frequency: Counter[bytes] = Counter()
+    candidates: list[tuple[bytes, frozenset[bytes]]] = []
+    for payload in set(payloads):
+        body = payload[1:]
+        lines = frozenset(body.split(b"\n")) - {b""}
+        candidates.append((body, lines))
+        frequency.update(lines)
+
+    def gain(lines: Iterable[bytes]) -> int:
+        return sum(frequency[line] * len(line) for line in lines)
+
+    chosen: list[bytes] = []
+    covered: set[bytes] = set()
+    total = 0
+    while candidates:
+        best = max(
+            range(len(candidates)),
+            key=lambda index: gain(candidates[index][1] - covered)
+            / (len(candidates[index][0]) + 1),
+        )
+        body, lines = candidates.pop(best)
+        if total + len(body) + 1 > size:
+            break
+        new_lines = lines - covered
+        # Lines seen only once save nothing over storing them inline.
+        if sum(frequency[line] for line in new_lines) <= len(new_lines):
+            continue
+        chosen.append(body + b"\n")
+        covered |= new_lines
+        total += len(body) + 1
+    return b"".join(reversed(chosen))
+
+
+def compress(payload: bytes, dictionary: bytes) -> bytes:
+    """Deflate ``payload`` against the preset ``dictionary`` (which may be empty)."""
+    options = {"zdict": dictionary} if dictionary else {}
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, _WBITS, **options)
+    return compressor.compress(payload) + compressor.flush()
+
+
+def decompress(blob: bytes, dictionary: bytes) -> bytes:
+    """Inflate a blob produced by :func:`compress` with the same ``dictionary``."""
+    options = {"zdict": dictionary} if dictionary else {}
+    decompressor = zlib.decompressobj(_WBITS, **options)
+    return decompressor.decompress(blob) + decompressor.flush()
@@ -0,0 +1,87 @@
+"""Precomputed alpha masks for compositing card images.
+
+Card images are clipped to rounded corners by zeroing the alpha of every pixel outside
+the rounded rectangle. Testing each pixel in Python costs tens of milliseconds per image,
+yet the mask only depends on the image size and corner radius, and every card scaled to a
+display comes out the same size. The mask is therefore built once per
+``(width, height, radius)`` as one alpha byte per pixel (0 outside, 255 inside) and
+applied to an image's alpha channel with a single big-integer AND.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+OPAQUE = 0xFF
+TRANSPARENT = 0x00
+
+
+def _inside_rounded_rect(px: int, py: int, width: int, height: int, radius: int) -> bool:
+    """Return whether pixel ``(px, py)`` lies inside the rounded rectangle."""
+    if px < radius and py < radius:
+        dx = radius - px
+        dy = radius - py
+    elif px >= width - radius and py < radius:
+        dx = px - (width - radius - 1)
+        dy = radius - py
+    elif px < radius and py >= height - radius:
+        dx = radius - px
+        dy = py - (height - radius - 1)
+    elif px >= width - radius and py >= height - radius:
+        dx = px - (width - radius - 1)
+        dy = py - (height - radius - 1)
+    else:
+        return True
+    return dx * dx + dy * dy <= radius * radius
+
+
+@lru_cache(maxsize=16)
+def rounded_corner_mask(width: int, height: int, radius: int) -> bytes:
+    """
+    Return the alpha mask clipping a ``width`` x ``height`` image to rounded corners.
+
+    Only the ``radius`` rows at the top and bottom contain transparent pixels, so just
+    their corner columns are tested; every other row is a copy of a fully opaque row.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        radius: Corner radius in pixels
+
+    Returns:
+        ``width * height`` bytes, row-major, 255 inside the rounded rectangle and 0 outside
+    """
+    if width <= 0 or height <= 0:
+        return b""
+    mask = bytearray([OPAQUE]) * (width * height)
+    if radius <= 0:
+        return bytes(mask)
+    corner_columns = sorted(
+        set(range(min(radius, width))) | set(range(max(width - radius, 0), width))
+    )
+    corner_rows = set(range(min(radius, height))) | set(range(max(height - radius, 0), height))
+    for py in corner_rows:
+        row = py * width
+        for px in corner_columns:
+            if not _inside_rounded_rect(px, py, width, height, radius):
+                mask[row + px] = TRANSPARENT
+    return bytes(mask)
+
+
+def apply_alpha_mask(alpha: bytes, mask: bytes) -> bytes:
+    """
+    Return ``alpha`` with every byte ANDed with ``mask``.
+
+    Since mask bytes are either 0 or 255, this zeroes the alpha outside the mask and
+    keeps it unchanged inside.
+
+    Raises:
+        ValueError: If the buffers differ in length
+    """
+    if len(alpha) != len(mask):
+        raise ValueError(f"Alpha has {len(alpha)} bytes but the mask has {len(mask)}")
+    combined = int.from_bytes(alpha, "little") & int.from_bytes(mask, "little")
+    return combined.to_bytes(len(alpha), "little")
+
+
+__all__ = ["apply_alpha_mask", "rounded_corner_mask"]
@@ -0,0 +1,175 @@
+"""Warm card images in the background before the user hovers them.
+
+Views that show a list of cards (deck tables, search results) hand the prefetcher the
+names they display, split into the rows currently visible and the ones likely to be shown
+next. A small pool of daemon workers loads them in that order through a caller-supplied
+``load`` function, which typically decodes the image and fills a bitmap cache.
+
+Each view is a separate *context*. Scheduling a context again bumps its generation, so
+entries queued for the previous contents of that view are dropped when they reach the
+front of the queue, and a running load can poll its ``cancelled`` callable to stop early.
+Other contexts are unaffected, so the mainboard and sideboard tables can warm up side by
+side.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from collections.abc import Callable, Sequence
+
+from loguru import logger
+
+__all__ = ["ImagePrefetcher", "PRIORITY_UPCOMING", "PRIORITY_VISIBLE"]
+
+PRIORITY_VISIBLE = 0
+PRIORITY_UPCOMING = 1
+
+_Load = Callable[[str, Callable[[], bool]], None]
+# (priority, sequence, context, generation, name, load)
+_Entry = tuple[int, int, str, int, str, _Load]
+
+
+class ImagePrefetcher:
+    """Priority queue of card names to warm, dropping entries of superseded views."""
+
+    def __init__(
+        self,
+        load: _Load,
+        workers: int = 1,
+        name: str = "image-prefetch",
+    ):
+        """
+        Args:
+            load: Called on a worker with a card name and a ``cancelled()`` callable, unless
+                ``schedule`` is given another one
+            workers: Number of worker threads, kept small so prefetching never competes
+                with the work the user is waiting for
+            name: Thread name prefix
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._load = load
+        self._workers = workers
+        self._name = name
+        self._condition = threading.Condition()
+        self._queue: list[_Entry] = []
+        self._sequence = itertools.count()
+        self._generations: dict[str, int] = {}
+        self._threads: list[threading.Thread] = []
+        self._stopped = False
+        self._stats = {"scheduled": 0, "loaded": 0, "dropped": 0, "failed": 0}
+
+    def schedule(
+        self,
+        context: str,
+        visible: Sequence[str],
+        upcoming: Sequence[str] = (),
+        load: _Load | None = None,
+    ) -> int:
+        """
+        Replace the queued names of ``context`` with ``visible`` followed by ``upcoming``.
+
+        Args:
+            context: Identifies the view, e.g. ``"deck:main"`` or ``"search"``
+            visible: Names currently on screen, loaded first in the given order
+            upcoming: Names likely to be shown next, loaded once the visible ones are done
+            load: Loads these names instead of the prefetcher's ``load``, e.g. one bound to
+                state captured by the scheduling thread
+
+        Returns:
+            The new generation of ``context``
+        """
+        with self._condition:
+            if self._stopped:
+                return self._generations.get(context, 0)
+            generation = self._generations.get(context, 0) + 1
+            load = load or self._load
+            self._generations[context] = generation
+            seen: set[str] = set()
+            for priority, names in ((PRIORITY_VISIBLE, visible), (PRIORITY_UPCOMING, upcoming)):
+                for name in names:
+                    key = (name or "").lower()
+                    if not key or key in seen:
+                        continue
+                    seen.add(key)
+                    heapq.heappush(
+                        self._queue,
+                        (priority, next(self._sequence), context, generation, name, load),
+                    )
+            self._stats["scheduled"] += len(seen)
+            self._start_workers()
+            self._condition.notify_all()
+            return generation
+
+    def cancel(self, context: str | None = None) -> None:
+        """Drop the queued names of ``context``, or of every context if None."""
+        with self._condition:
+            contexts = list(self._generations) if context is None else [context]
+            for name in contexts:
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def pending(self) -> int:
+        """Number of queued entries that are still current."""
+        with self._condition:
+            return sum(1 for entry in self._queue if self._is_current(entry[2], entry[3]))
+
+    def stats(self) -> dict[str, int]:
+        with self._condition:
+            return dict(self._stats)
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Stop the workers; a running load is cancelled at its next check."""
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._condition.notify_all()
+            threads = list(self._threads)
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=timeout)
+
+    def _is_current(self, context: str, generation: int) -> bool:
+        return not self._stopped and self._generations.get(context) == generation
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self._workers:
+            thread = threading.Thread(
+                target=self._run, name=f"{self._name}-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_entry(self) -> _Entry | None:
+        with self._condition:
+            while True:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return None
+                entry = heapq.heappop(self._queue)
+                if self._is_current(entry[2], entry[3]):
+                    return entry
+                self._stats["dropped"] += 1
+
+    def _run(self) -> None:
+        while True:
+            entry = self._next_entry()
+            if entry is None:
+                return
+            _priority, _sequence, context, generation, name, load = entry
+
+            def cancelled(context: str = context, generation: int = generation) -> bool:
+                with self._condition:
+                    return not self._is_current(context, generation)
+
+            try:
+                load(name, cancelled)
+            except Exception as exc:
+                logger.debug(f"Prefetching image for {name} failed: {exc}")
+                outcome = "failed"
+            else:
+                outcome = "loaded"
+            with self._condition:
+                self._stats[outcome] += 1
@@ -0,0 +1,202 @@
+"""Incremental reading of large JSON documents.
+
+``json.load`` on Scryfall's bulk data (~500 MB) materializes every card at once and peaks at
+several GB. :func:`iter_json_array` reads the file in chunks and decodes one array element
+at a time with the C-accelerated ``json`` scanner, so memory stays bounded by the chunk size
+plus the largest single element. :func:`iter_json_object` does the same for the members of
+an object, such as the ``data`` mapping of MTGJSON's AtomicCards.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Sequence
+from os import PathLike
+from typing import IO, Any
+
+__all__ = ["iter_json_array", "iter_json_object"]
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # characters per read
+_WHITESPACE = " \t\n\r"
+
+
+class _ChunkReader:
+    """Sliding text buffer over a file object."""
+
+    def __init__(self, fh: IO[str], chunk_size: int):
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping what was already consumed. False at EOF."""
+        if self.eof:
+            return False
+        chunk = self._fh.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def next_significant(self) -> str:
+        """Skip whitespace and return the next character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+def _decode_value(reader: _ChunkReader, decoder: json.JSONDecoder, delimiters: str) -> Any:
+    """Decode the value at the reader position, which must be followed by a delimiter."""
+    while True:
+        try:
+            value, end = decoder.raw_decode(reader.buffer, reader.pos)
+        except json.JSONDecodeError:
+            # Most likely the value continues in the next chunk.
+            if not reader.fill():
+                raise
+            continue
+        # Only trust the value once the delimiter after it is buffered: a number cut
+        # at the chunk edge ("-0" of "-0.5") also decodes successfully.
+        following = end
+        while following < len(reader.buffer) and reader.buffer[following] in _WHITESPACE:
+            following += 1
+        if (following == len(reader.buffer) or reader.buffer[following] not in delimiters) and (
+            reader.fill()
+        ):
+            continue
+        reader.pos = end
+        return value
+
+
+def _consume_separator(reader: _ChunkReader, closer: str) -> bool:
+    """Consume ',' (True: more items follow) or ``closer`` (False)."""
+    separator = reader.next_significant()
+    reader.pos += 1
+    if separator == closer:
+        return False
+    if separator != ",":
+        reader.pos -= 1
+        raise reader.error(f"Expected ',' or '{closer}' after value")
+    return True
+
+
+def _iter_elements(reader: _ChunkReader, decoder: json.JSONDecoder) -> Iterator[Any]:
+    if reader.next_significant() != "[":
+        raise reader.error("Expected a JSON array")
+    reader.pos += 1
+    if reader.next_significant() == "]":
+        reader.pos += 1
+        return
+
+    while True:
+        if not reader.next_significant():
+            raise reader.error("Unterminated JSON array")
+        yield _decode_value(reader, decoder, ",]")
+        if not _consume_separator(reader, "]"):
+            return
+
+
+def _iter_keys(reader: _ChunkReader, decoder: json.JSONDecoder) -> Iterator[str]:
+    """
+    Yield an object's keys, leaving the reader at the start of each value.
+
+    The consumer must read (or skip) the value before asking for the next key.
+    """
+    if reader.next_significant() != "{":
+        raise reader.error("Expected a JSON object")
+    reader.pos += 1
+    if reader.next_significant() == "}":
+        reader.pos += 1
+        return
+
+    while True:
+        if reader.next_significant() != '"':
+            raise reader.error("Expected a property name")
+        key = _decode_value(reader, decoder, ":")
+        if reader.next_significant() != ":":
+            raise reader.error("Expected ':' after property name")
+        reader.pos += 1
+        if not reader.next_significant():
+            raise reader.error("Unterminated JSON object")
+        yield key
+        if not _consume_separator(reader, "}"):
+            return
+
+
+def _iter_members(
+    reader: _ChunkReader, decoder: json.JSONDecoder, path: Sequence[str]
+) -> Iterator[tuple[str, Any]]:
+    for key in _iter_keys(reader, decoder):
+        if not path:
+            yield key, _decode_value(reader, decoder, ",}")
+        elif key == path[0]:
+            # Nothing after the requested object is needed; stop reading there.
+            yield from _iter_members(reader, decoder, path[1:])
+            return
+        else:
+            _decode_value(reader, decoder, ",}")
+
+
+def iter_json_array(
+    source: str | PathLike[str] | IO[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Args:
+        source: Path to a UTF-8 JSON file, or an open text file object
+        chunk_size: Characters read per chunk
+
+    Yields:
+        Each decoded array element, in order
+
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed array
+    """
+    decoder = json.JSONDecoder()
+    if hasattr(source, "read"):
+        yield from _iter_elements(_ChunkReader(source, chunk_size), decoder)
+        return
+    with open(source, encoding="utf-8") as fh:
+        yield from _iter_elements(_ChunkReader(fh, chunk_size), decoder)
+
+
+def iter_json_object(
+    source: str | PathLike[str] | IO[str],
+    path: Sequence[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Yield the members of a JSON object one at a time.
+
+    Args:
+        source: Path to a UTF-8 JSON file, or an open text file object
+        path: Keys leading from the top-level object to the object to iterate, e.g.
+            ``("data",)``; sibling values along the way are decoded and discarded
+        chunk_size: Characters read per chunk
+
+    Yields:
+        ``(key, value)`` pairs in document order; nothing if ``path`` is not present
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed or ``path`` leads to a value
+            that is not an object
+    """
+    decoder = json.JSONDecoder()
+    if hasattr(source, "read"):
+        yield from _iter_members(_ChunkReader(source, chunk_size), decoder, tuple(path))
+        return
+    with open(source, encoding="utf-8") as fh:
+        yield from _iter_members(_ChunkReader(fh, chunk_size), decoder, tuple(path))
@@ -0,0 +1,114 @@
+"""Thread-safe LRU cache bounded by entry count and by approximate memory use."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+__all__ = ["SizedLRUCache"]
+
+
+class SizedLRUCache(Generic[K, V]):
+    """
+    Least-recently-used mapping evicting once either bound is exceeded.
+
+    ``sizeof`` estimates the memory held by a value (``sys.getsizeof`` by default); pass
+    ``max_bytes=None`` to bound by entry count only. ``hits`` and ``misses`` count the
+    outcomes of :meth:`get`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int | None = None,
+        sizeof: Callable[[V], int] = sys.getsizeof,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def pop(self, key: K, default: Any = None) -> V | Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def items(self) -> list[tuple[K, V]]:
+        """Snapshot of the entries, least recently used first."""
+        with self._lock:
+            return [(key, value) for key, (value, _size) in self._entries.items()]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> list[K]:
+        """Snapshot of the keys, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _key, (_value, size) = self._entries.popitem(last=False)
+            self._bytes -= size
@@ -313,6 +313,21 @@ def _convert_cards(cards: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
     return converted
 
 
+def count_card_inclusions(
+    decks: Iterable[dict[str, Any]],
+    fmt: str | None = None,
+    days: int | None = None,
+) -> Counter:
+    """Count how many decks play each card (main deck or sideboard)."""
+    filtered = _filter_decks(decks, fmt=fmt, days=days)
+    counter = Counter()
+    for deck in filtered:
+        names = {card["name"] for card in deck.get("mainboard") or [] if card.get("name")}
+        names.update(card["name"] for card in deck.get("sideboard") or [] if card.get("name"))
+        counter.update(names)
+    return counter
+
+
 def aggregate_archetypes_for_window(
     decks: Iterable[dict[str, Any]],
     fmt: str | None = None,
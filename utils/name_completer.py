@@ -0,0 +1,156 @@
+"""Card name completion over sorted alias arrays.
+
+Every card name and alias (including individual faces) is lowercased into a sorted
+array, so a prefix lookup is two ``bisect`` calls plus a slice. A second array holds the
+tails of names starting at each later word ("bolt" finds "Lightning Bolt"). Suggestions
+are ranked:
+
+1. names starting with the query, most played first (see :meth:`NameCompleter.set_popularity`)
+2. remaining names starting with the query, alphabetically
+3. names with a later word starting with the query
+4. a fuzzy fallback for typos, comparing the query with name prefixes by edit distance
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Mapping
+
+# Shorter queries never fall back to fuzzy matching (too many near misses).
+FUZZY_MIN_LENGTH = 3
+# Queries at least this long tolerate two typos instead of one.
+FUZZY_LONG_QUERY = 6
+
+
+def normalize_name(name: str) -> str:
+    return " ".join((name or "").lower().split())
+
+
+def _prefix_range(keys: list[str], prefix: str) -> tuple[int, int]:
+    start = bisect.bisect_left(keys, prefix)
+    end = bisect.bisect_left(keys, prefix + "\U0010ffff", start)
+    return start, end
+
+
+def _prefix_distance(query: str, candidate: str, max_distance: int) -> int | None:
+    """
+    Smallest edit distance between ``query`` and a prefix of ``candidate``.
+
+    Returns None as soon as the distance is known to exceed ``max_distance``.
+    """
+    previous = list(range(len(candidate) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        best = i
+        for j, candidate_char in enumerate(candidate, 1):
+            cost = previous[j - 1] + (query_char != candidate_char)
+            value = min(previous[j] + 1, current[j - 1] + 1, cost)
+            current.append(value)
+            best = min(best, value)
+        if best > max_distance:
+            return None
+        previous = current
+    distance = min(previous)
+    return distance if distance <= max_distance else None
+
+
+class NameCompleter:
+    """Prefix and typo-tolerant completion for card names."""
+
+    def __init__(self, names: Iterable[str]):
+        display: dict[str, str] = {}
+        for name in names:
+            key = normalize_name(name)
+            if key:
+                display.setdefault(key, name.strip())
+        self._keys = sorted(display)
+        self._names = [display[key] for key in self._keys]
+
+        word_entries: list[tuple[str, int]] = []
+        for index, key in enumerate(self._keys):
+            position = key.find(" ")
+            while position != -1:
+                word_entries.append((key[position + 1 :], index))
+                position = key.find(" ", position + 1)
+        word_entries.sort()
+        self._word_keys = [tail for tail, _index in word_entries]
+        self._word_targets = [index for _tail, index in word_entries]
+
+        self._popularity: dict[int, float] = {}
+        self._popular_keys: list[str] = []
+        self._popular_targets: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set_popularity(self, popularity: Mapping[str, float]) -> None:
+        """Rank names by ``popularity`` (e.g. metagame play counts keyed by card name)."""
+        ranked: dict[int, float] = {}
+        for name, score in popularity.items():
+            key = normalize_name(name)
+            start, end = _prefix_range(self._keys, key)
+            if start < end and self._keys[start] == key and score > 0:
+                ranked[start] = max(ranked.get(start, 0.0), float(score))
+        self._popularity = ranked
+        self._popular_targets = sorted(ranked, key=lambda index: self._keys[index])
+        self._popular_keys = [self._keys[index] for index in self._popular_targets]
+
+    def complete(self, query: str, limit: int = 10) -> list[str]:
+        """Return up to ``limit`` card names for a partially typed ``query``."""
+        needle = normalize_name(query)
+        if not needle or limit <= 0:
+            return []
+        picked: list[int] = []
+        seen: set[int] = set()
+
+        def take(indices: Iterable[int]) -> bool:
+            for index in indices:
+                if index not in seen:
+                    seen.add(index)
+                    picked.append(index)
+                    if len(picked) >= limit:
+                        return True
+            return False
+
+        start, end = _prefix_range(self._popular_keys, needle)
+        popular = sorted(
+            self._popular_targets[start:end], key=lambda index: -self._popularity[index]
+        )
+        if take(popular):
+            return self._resolve(picked)
+
+        start, end = _prefix_range(self._keys, needle)
+        if take(range(start, min(end, start + limit + len(popular)))):
+            return self._resolve(picked)
+
+        start, end = _prefix_range(self._word_keys, needle)
+        word_matches = sorted(
+            set(self._word_targets[start:end]),
+            key=lambda index: (-self._popularity.get(index, 0.0), self._keys[index]),
+        )
+        if take(word_matches) or len(needle) < FUZZY_MIN_LENGTH:
+            return self._resolve(picked)
+
+        take(index for _distance, _rank, index in self._fuzzy(needle))
+        return self._resolve(picked)
+
+    def _fuzzy(self, needle: str) -> list[tuple[int, float, int]]:
+        max_distance = 2 if len(needle) >= FUZZY_LONG_QUERY else 1
+        # Typos rarely hit the first letter, and it keeps the candidate pool small.
+        start, end = _prefix_range(self._keys, needle[0])
+        matches = []
+        for index in range(start, end):
+            key = self._keys[index]
+            if len(key) < len(needle) - max_distance:
+                continue
+            distance = _prefix_distance(needle, key[: len(needle) + max_distance], max_distance)
+            if distance is not None:
+                matches.append((distance, -self._popularity.get(index, 0.0), index))
+        matches.sort()
+        return matches
+
+    def _resolve(self, indices: list[int]) -> list[str]:
+        return [self._names[index] for index in indices]
+
+
+__all__ = ["NameCompleter", "normalize_name"]
@@ -0,0 +1,280 @@
+"""Memory-mapped index of card printings, keyed by card and face name.
+
+The card inspector lists every printing of the hovered card. Holding all of Scryfall's
+printings as dictionaries costs hundreds of megabytes and a multi-second JSON load at
+startup. This index is written once from the bulk data into a binary file (see
+``utils.binary_index``) laid out as:
+
+- fixed-width printing records (``_RECORD``): the 16-byte Scryfall id, the release date as
+  a sortable ``YYYYMMDD`` integer, an interned set id and an interned collector number id
+- per name, a range of record numbers ordered newest first (face aliases of multi-faced
+  cards point at the same records)
+- an open-addressing hash table from lowercased names to their range
+
+Opening the file only maps it, and a lookup decodes just the records of the requested
+name, so nothing has to be loaded up front and resident memory stays small.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import uuid
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from utils.binary_index import (
+    IndexFormatError,
+    MappedHashTable,
+    MappedIndexFile,
+    MappedStrings,
+    build_hash_table,
+    pack_strings,
+    write_index_file,
+)
+
+PRINTING_INDEX_MAGIC = b"MTGPRINT"
+PRINTING_INDEX_FORMAT = 1
+
+# Scryfall id, release date (YYYYMMDD, 0 if unknown), set id, collector number id.
+_RECORD = struct.Struct("<16sIII")
+# PrintingIndex attributes that hold views of the mapping.
+_MAPPED_ATTRIBUTES = (
+    "_records",
+    "_names",
+    "_table",
+    "_ranges",
+    "_refs",
+    "_set_codes",
+    "_set_names",
+    "_numbers",
+)
+
+
+def _release_key(released_at: str | None) -> int:
+    digits = (released_at or "").replace("-", "")
+    return int(digits) if len(digits) == 8 and digits.isdigit() else 0
+
+
+def _release_date(key: int) -> str:
+    if not key:
+        return ""
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+class _Interner:
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+
+def write_printing_index(
+    path: Path,
+    printings: Iterable[tuple[dict[str, Any], Iterable[str]]],
+    meta: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Write a printings index to ``path`` (atomically).
+
+    Args:
+        path: Destination file
+        printings: ``(card, names)`` pairs, where ``card`` is a Scryfall card object and
+            ``names`` every name the printing should be listed under
+        meta: Extra JSON-serializable metadata stored in the file
+
+    Returns:
+        The metadata written, including ``unique_names`` and ``total_printings``
+    """
+    records = bytearray()
+    release_keys: list[int] = []
+    set_ids = _Interner()
+    set_names: list[str] = []
+    collector_numbers = _Interner()
+    by_name: dict[str, list[int]] = {}
+    for card, names in printings:
+        try:
+            card_id = uuid.UUID(str(card.get("id"))).bytes
+        except ValueError:
+            logger.debug(f"Skipping printing with malformed id {card.get('id')!r}")
+            continue
+        set_code = (card.get("set") or "").upper()
+        set_id = set_ids.intern(set_code)
+        if set_id == len(set_names):
+            set_names.append(card.get("set_name") or "")
+        release_key = _release_key(card.get("released_at"))
+        record_number = len(release_keys)
+        records += _RECORD.pack(
+            card_id,
+            release_key,
+            set_id,
+            collector_numbers.intern(card.get("collector_number") or ""),
+        )
+        release_keys.append(release_key)
+        for name in names:
+            record_numbers = by_name.setdefault(name.lower(), [])
+            if not record_numbers or record_numbers[-1] != record_number:
+                record_numbers.append(record_number)
+
+    keys = sorted(by_name)
+    ranges = array("I", [0])
+    refs = array("I")
+    for key in keys:
+        # Stable sort: printings released on the same day keep their bulk data order.
+        refs.extend(sorted(by_name[key], key=lambda number: -release_keys[number]))
+        ranges.append(len(refs))
+
+    name_offsets, name_blob = pack_strings(keys)
+    set_offsets, set_blob = pack_strings(set_ids.values)
+    set_name_offsets, set_name_blob = pack_strings(set_names)
+    number_offsets, number_blob = pack_strings(collector_numbers.values)
+    stored_meta = dict(meta or {})
+    stored_meta.update(unique_names=len(keys), total_printings=len(release_keys))
+    write_index_file(
+        path,
+        PRINTING_INDEX_MAGIC,
+        PRINTING_INDEX_FORMAT,
+        {
+            "records": bytes(records),
+            "names.offsets": name_offsets,
+            "names.blob": name_blob,
+            "names.table": build_hash_table(keys, range(len(keys))),
+            "names.ranges": ranges,
+            "names.refs": refs,
+            "sets.offsets": set_offsets,
+            "sets.blob": set_blob,
+            "set_names.offsets": set_name_offsets,
+            "set_names.blob": set_name_blob,
+            "numbers.offsets": number_offsets,
+            "numbers.blob": number_blob,
+        },
+        stored_meta,
+    )
+    return stored_meta
+
+
+class PrintingIndex:
+    """
+    Read-only, memory-mapped lookup of printings by card or face name.
+
+    Behaves like the ``{name_lower: [printing, ...]}`` mapping it replaces: ``get`` returns
+    dictionaries with ``id``, ``set``, ``set_name``, ``collector_number`` and
+    ``released_at``, newest first.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        # Lookups may run on worker threads while the index is closed or remapped.
+        self._lock = threading.RLock()
+        self._closed = True
+        self._map()
+
+    def _map(self) -> None:
+        mapped = MappedIndexFile(self.path, PRINTING_INDEX_MAGIC, PRINTING_INDEX_FORMAT)
+        try:
+            self._records = mapped.section("records")
+            self._names = MappedStrings(mapped, "names")
+            self._table = MappedHashTable(mapped.section("names.table"), self._names)
+            self._ranges = mapped.section("names.ranges")
+            self._refs = mapped.section("names.refs")
+            self._set_codes = MappedStrings(mapped, "sets")
+            self._set_names = MappedStrings(mapped, "set_names")
+            self._numbers = MappedStrings(mapped, "numbers")
+        except IndexFormatError:
+            self._unmap(mapped)
+            raise
+        self._mapped = mapped
+        self.meta = mapped.meta
+        self._closed = False
+
+    def _unmap(self, mapped: MappedIndexFile) -> None:
+        # Drop the section views before unmapping, so nothing can use them afterwards.
+        for name in _MAPPED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+        mapped.close()
+
+    @property
+    def unique_names(self) -> int:
+        with self._lock:
+            return 0 if self._closed else len(self._ranges) - 1
+
+    @property
+    def total_printings(self) -> int:
+        with self._lock:
+            return 0 if self._closed else len(self._records) // _RECORD.size
+
+    def get(self, name: str, default: Any = None) -> list[dict[str, Any]] | Any:
+        """Return the printings listed under ``name`` (case-insensitive), newest first."""
+        with self._lock:
+            if self._closed:
+                return default
+            key_index = self._table.get((name or "").lower())
+            if key_index is None:
+                return default
+            start, end = self._ranges[key_index], self._ranges[key_index + 1]
+            return [self._record(self._refs[ref]) for ref in range(start, end)]
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return isinstance(name, str) and not self._closed and name.lower() in self._table
+
+    def __len__(self) -> int:
+        return self.unique_names
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(()) if self._closed else iter(list(self._names))
+
+    def replace_file(self, source: Path) -> None:
+        """
+        Replace the file behind this index with ``source`` and map the new file.
+
+        Holders of this index see the new printings without reopening it. The old
+        mapping is released first, since Windows cannot replace a mapped file.
+
+        Raises:
+            IndexFormatError: If ``source`` is not a printings index (the index is then
+                closed)
+        """
+        with self._lock:
+            self.close()
+            os.replace(source, self.path)
+            self._map()
+
+    def close(self) -> None:
+        """Release the mapping; later lookups find nothing."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._unmap(self._mapped)
+
+    def _record(self, number: int) -> dict[str, Any]:
+        card_id, release_key, set_id, number_id = _RECORD.unpack_from(
+            self._records, number * _RECORD.size
+        )
+        return {
+            "id": str(uuid.UUID(bytes=card_id)),
+            "set": self._set_codes[set_id],
+            "set_name": self._set_names[set_id],
+            "collector_number": self._numbers[number_id],
+            "released_at": _release_date(release_key),
+        }
+
+
+__all__ = [
+    "PRINTING_INDEX_FORMAT",
+    "PRINTING_INDEX_MAGIC",
+    "PrintingIndex",
+    "write_printing_index",
+]
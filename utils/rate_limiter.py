@@ -0,0 +1,55 @@
+"""Per-host request spacing shared by concurrent fetch workers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from urllib.parse import urlparse
+
+__all__ = ["HostRateLimiter"]
+
+
+class HostRateLimiter:
+    """
+    Space requests to the same host at least ``min_interval`` seconds apart.
+
+    Workers reserve the next free slot for a host under a lock and sleep outside it, so
+    requests to one host are spread out while different hosts do not wait on each other.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if min_interval < 0:
+            raise ValueError("min_interval must not be negative")
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Return the lowercased host of ``url`` (or ``url`` itself if it has none)."""
+        return (urlparse(url).hostname or url).lower()
+
+    def acquire(self, url_or_host: str) -> float:
+        """
+        Block until a request to the host of ``url_or_host`` may start.
+
+        Returns:
+            Seconds spent waiting
+        """
+        host = self.host_of(url_or_host)
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = start + self.min_interval
+        delay = start - now
+        if delay > 0:
+            self._sleep(delay)
+        return delay
@@ -0,0 +1,235 @@
+"""Resumable, verified downloads of large files.
+
+Bodies are streamed into ``<dest>.part`` next to a small ``<dest>.part.json`` state file
+(URL, validator and transfer encoding). An interrupted transfer resumes with an HTTP
+``Range`` request guarded by ``If-Range``, so a file that changed on the server restarts
+from zero instead of being spliced. Once complete the size (and ETag, when known) is checked
+against the expected metadata and the file is moved into place with an atomic rename, so
+readers never see a truncated ``dest``.
+
+Works with both ``requests`` and ``curl_cffi`` style ``get`` callables. Gzip transfer
+encoding is kept on the wire when the client exposes the raw stream (``requests``): the
+encoded bytes are what ``Range`` offsets refer to, and they are decoded only once complete.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+__all__ = [
+    "DownloadVerificationError",
+    "ResumableDownload",
+    "chunk_size_for",
+    "download_resumable",
+]
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# Aim for roughly this many reads over a transfer of known size.
+TARGET_CHUNKS = 512
+
+
+class DownloadVerificationError(Exception):
+    """The completed download does not match the expected size or ETag."""
+
+
+@dataclass
+class ResumableDownload:
+    """Outcome of :func:`download_resumable`."""
+
+    path: Path
+    size: int
+    resumed_from: int = 0
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str | None:
+        return _normalize_etag(self.headers.get("etag"))
+
+
+def chunk_size_for(total: int | None) -> int:
+    """Read size scaled to the transfer: large files use large buffers, within bounds."""
+    if not total:
+        return 1024 * 1024
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, total // TARGET_CHUNKS))
+
+
+def _normalize_etag(value: str | None) -> str | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    return value.strip('"') or None
+
+
+def _lower_headers(response: Any) -> dict[str, str]:
+    return {str(key).lower(): str(value) for key, value in response.headers.items()}
+
+
+def _iter_body(response: Any, chunk_size: int, encoded: bool) -> Iterator[bytes]:
+    if encoded:
+        yield from response.raw.stream(chunk_size, decode_content=False)
+    else:
+        yield from response.iter_content(chunk_size=chunk_size)
+
+
+def _read_state(state_path: Path) -> dict[str, Any]:
+    try:
+        return json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _discard(*paths: Path) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _finalize(partial: Path, dest: Path, encoding: str | None, expected_size: int | None) -> int:
+    """Verify the completed partial file and move it (decoded) into place; returns its size."""
+    transferred = partial.stat().st_size
+    source, size = partial, transferred
+    if encoding in ("gzip", "x-gzip"):
+        source = dest.with_name(dest.name + ".tmp")
+        chunk_size = chunk_size_for(transferred)
+        decompressor = zlib.decompressobj(wbits=31)
+        size = 0
+        try:
+            with partial.open("rb") as encoded, source.open("wb") as target:
+                while chunk := encoded.read(chunk_size):
+                    data = decompressor.decompress(chunk)
+                    target.write(data)
+                    size += len(data)
+                data = decompressor.flush()
+                target.write(data)
+                size += len(data)
+        except BaseException:
+            _discard(source)
+            raise
+    if expected_size is not None and expected_size not in (size, transferred):
+        _discard(source, partial)
+        raise DownloadVerificationError(f"{dest.name}: got {size} bytes, expected {expected_size}")
+    os.replace(source, dest)
+    _discard(partial)
+    return size
+
+
+def download_resumable(
+    get: Callable[..., Any],
+    url: str,
+    dest: Path,
+    *,
+    expected_size: int | None = None,
+    expected_etag: str | None = None,
+    timeout: float = 300,
+    **request_kwargs: Any,
+) -> ResumableDownload:
+    """
+    Download ``url`` to ``dest``, resuming an earlier partial transfer when possible.
+
+    Args:
+        get: ``requests.get``-compatible callable (e.g. a session's ``get``)
+        url: File to download
+        dest: Final path; replaced atomically once the download is verified
+        expected_size: Size of the file, as transferred or after decoding its gzip
+            transfer encoding; checked after download when given
+        expected_etag: ETag the metadata advertised; partial data for another ETag is
+            discarded, and a mismatching response fails verification
+        timeout: Request timeout in seconds
+        **request_kwargs: Extra arguments for ``get`` (e.g. ``impersonate``)
+
+    Returns:
+        Where the file ended up, its size, and the response headers
+
+    Raises:
+        DownloadVerificationError: If the finished file fails the size or ETag check
+        Exception: Whatever ``get`` raises for network/HTTP errors; the partial file is
+            kept so the next attempt resumes
+    """
+    dest = Path(dest)
+    partial = dest.with_name(dest.name + ".part")
+    state_path = dest.with_name(dest.name + ".part.json")
+    expected_etag = _normalize_etag(expected_etag)
+
+    state = _read_state(state_path)
+    offset = partial.stat().st_size if partial.exists() else 0
+    if offset and (
+        state.get("url") != url
+        or not state.get("resumable", False)
+        or (expected_etag and state.get("etag") and state["etag"] != expected_etag)
+    ):
+        logger.info(f"Discarding stale partial download of {dest.name}")
+        _discard(partial, state_path)
+        offset = 0
+
+    headers = {"Accept-Encoding": "gzip"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        validator = state.get("etag") or state.get("last_modified")
+        if validator:
+            headers["If-Range"] = f'"{validator}"' if state.get("etag") else validator
+
+    response = get(url, headers=headers, stream=True, timeout=timeout, **request_kwargs)
+    try:
+        status = getattr(response, "status_code", 200)
+        if status == 416 and offset:
+            # Nothing left to fetch; the partial file is complete or unusable.
+            response_headers = _lower_headers(response)
+        else:
+            response.raise_for_status()
+            response_headers = _lower_headers(response)
+            encoding = response_headers.get("content-encoding", "").lower() or None
+            raw = getattr(response, "raw", None)
+            encoded = encoding is not None and hasattr(raw, "stream")
+            resuming = status == 206 and offset > 0
+            if resuming and not response_headers.get("content-range", "").startswith(
+                f"bytes {offset}-"
+            ):
+                resuming = False
+            if offset and not resuming:
+                logger.info(f"Server sent {dest.name} from the start; restarting download")
+                offset = 0
+            if not resuming:
+                state = {
+                    "url": url,
+                    "etag": _normalize_etag(response_headers.get("etag")),
+                    "last_modified": response_headers.get("last-modified"),
+                    "encoding": encoding if encoded else None,
+                    # Decoded-on-the-fly bodies have no stable byte offsets to resume from.
+                    "resumable": encoding is None or encoded,
+                }
+                state_path.write_text(json.dumps(state), encoding="utf-8")
+
+            total = expected_size
+            length = response_headers.get("content-length")
+            if length and length.isdigit():
+                total = offset + int(length)
+            chunk_size = chunk_size_for(total)
+            with partial.open("ab" if resuming else "wb", buffering=chunk_size) as fh:
+                for chunk in _iter_body(response, chunk_size, encoded):
+                    fh.write(chunk)
+    finally:
+        close = getattr(response, "close", None)
+        if close:
+            close()
+
+    received_etag = _normalize_etag(response_headers.get("etag")) or state.get("etag")
+    if expected_etag and received_etag and received_etag != expected_etag:
+        _discard(partial, state_path)
+        raise DownloadVerificationError(
+            f"{dest.name}: ETag {received_etag} does not match expected {expected_etag}"
+        )
+    try:
+        size = _finalize(partial, dest, state.get("encoding"), expected_size)
+    finally:
+        _discard(state_path)
+    return ResumableDownload(path=dest, size=size, resumed_from=offset, headers=response_headers)
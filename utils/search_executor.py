@@ -0,0 +1,155 @@
+"""Run interactive searches off the UI thread, keeping only the latest query.
+
+Every submission bumps a generation counter. The worker thread only ever runs the newest
+pending query (older pending ones are replaced, not queued), a running query sees its
+:class:`CancellationToken` flip as soon as a newer one arrives, and results are delivered
+on the UI thread only if their generation is still the latest when they get there.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+
+__all__ = ["CancellationToken", "SearchCancelled", "SearchExecutor"]
+
+# (generation, search, on_result, on_error)
+_Query = tuple[
+    int,
+    Callable[["CancellationToken"], Any],
+    Callable[[Any], None],
+    Callable[[Exception], None] | None,
+]
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search when a newer query has superseded it."""
+
+
+class CancellationToken:
+    """Lets a running search check whether its result is still wanted."""
+
+    def __init__(self, executor: SearchExecutor, generation: int):
+        self._executor = executor
+        self.generation = generation
+
+    @property
+    def cancelled(self) -> bool:
+        return not self._executor.is_current(self.generation)
+
+    def raise_if_cancelled(self) -> None:
+        """Abort the search cooperatively if a newer query was submitted."""
+        if self.cancelled:
+            raise SearchCancelled(f"search generation {self.generation} superseded")
+
+
+def _call_after(callback: Callable[..., Any], *args: Any) -> None:
+    """Marshal callback to UI thread if wx is available, otherwise call directly."""
+    try:
+        import wx
+
+        wx.CallAfter(callback, *args)
+    except ImportError:
+        callback(*args)
+
+
+class SearchExecutor:
+    """Single-worker executor that drops stale queries and stale results."""
+
+    def __init__(
+        self,
+        name: str = "search-executor",
+        call_after: Callable[..., None] = _call_after,
+    ) -> None:
+        self._name = name
+        self._call_after = call_after
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._pending: _Query | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def is_current(self, generation: int) -> bool:
+        return not self._stopped and generation == self._generation
+
+    def submit(
+        self,
+        func: Callable[[CancellationToken], Any],
+        on_result: Callable[[Any], None],
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> int:
+        """
+        Queue ``func`` as the newest query, superseding any pending or running one.
+
+        Args:
+            func: Search to run on the worker; receives a :class:`CancellationToken`
+            on_result: Called on the UI thread with the result, if still the latest
+            on_error: Optional callback on the UI thread for failures of the latest query
+
+        Returns:
+            The generation number assigned to this query
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("SearchExecutor has been shut down")
+            self._generation += 1
+            self._pending = (self._generation, func, on_result, on_error)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """Invalidate the pending and running queries without submitting a new one."""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Stop the worker; a running query is cancelled at its next checkpoint."""
+        with self._condition:
+            self._stopped = True
+            self._pending = None
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, func, on_result, on_error = self._pending
+                self._pending = None
+
+            token = CancellationToken(self, generation)
+            try:
+                result = func(token)
+            except SearchCancelled:
+                logger.debug(f"Dropped superseded search (generation {generation})")
+                continue
+            except Exception as exc:
+                if token.cancelled:
+                    continue
+                logger.exception(f"Search failed: {exc}")
+                if on_error:
+                    self._call_after(self._deliver, generation, on_error, exc)
+                continue
+            if not token.cancelled:
+                self._call_after(self._deliver, generation, on_result, result)
+
+    def _deliver(self, generation: int, callback: Callable[[Any], None], value: Any) -> None:
+        # Re-checked on the UI thread: a newer query may have arrived in the meantime.
+        if self.is_current(generation):
+            callback(value)
@@ -4,13 +4,18 @@ from typing import Any
 from utils.mana_icon_factory import tokenize_mana_symbols
 
 
+def mana_symbol_counts(cost: str | None) -> Counter[str]:
+    return Counter(tokenize_mana_symbols(cost or ""))
+
+
 def matches_mana_cost(card_cost: str, query: str, mode: str) -> bool:
-    query_tokens = tokenize_mana_symbols(query)
-    if not query_tokens:
+    query_counts = mana_symbol_counts(query)
+    if not query_counts:
         return True
-    card_tokens = tokenize_mana_symbols(card_cost)
-    card_counts = Counter(card_tokens)
-    query_counts = Counter(query_tokens)
+    return matches_mana_counts(mana_symbol_counts(card_cost), query_counts, mode)
+
+
+def matches_mana_counts(card_counts: Counter[str], query_counts: Counter[str], mode: str) -> bool:
     if mode == "exact":
         return card_counts == query_counts
     for symbol, needed in query_counts.items():
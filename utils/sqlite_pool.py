@@ -0,0 +1,179 @@
+"""Reusable SQLite connections and batched writes.
+
+Opening a connection per query costs a file open, schema parse and statement compile on
+every call. :class:`SQLiteConnectionPool` keeps one connection per thread for the life of
+the pool instead, so the ``sqlite3`` statement cache stays warm and repeated queries run as
+prepared statements. :class:`BatchedWriter` funnels rows from many producer threads into a
+single writer thread that commits them in large transactions.
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+__all__ = ["BatchedWriter", "SQLiteConnectionPool"]
+
+# Prepared statements kept per connection (sqlite3 default is 128).
+STATEMENT_CACHE_SIZE = 256
+
+# (sql, params) rows, flush markers, and None to stop the writer.
+_QueueItem = tuple[str, Sequence[Any]] | threading.Event | None
+
+
+class SQLiteConnectionPool:
+    """Thread-local SQLite connections opened in WAL mode."""
+
+    def __init__(self, db_path: Path, timeout: float = 30.0):
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict[threading.Thread, sqlite3.Connection] = {}
+        self._closed = False
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+            self._close_dead_threads()
+            # check_same_thread is off only so close() can run from the owning object's
+            # thread; each connection is still used by a single thread.
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._connections[threading.current_thread()] = conn
+        self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close every connection; later calls to :meth:`connection` raise."""
+        with self._lock:
+            self._closed = True
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _close_dead_threads(self) -> None:
+        # Worker pools come and go; drop the connections their finished threads left behind.
+        for thread in [thread for thread in self._connections if not thread.is_alive()]:
+            self._connections.pop(thread).close()
+
+
+class BatchedWriter:
+    """
+    Background writer committing queued rows in transactions of up to ``batch_size``.
+
+    Rows are parameter tuples for ``sql`` unless submitted with a statement of their own;
+    consecutive rows for the same statement run as one ``executemany``. A batch is committed
+    when it is full, when ``flush_interval`` seconds have passed since its first row, or
+    when :meth:`flush` is called.
+    """
+
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        sql: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        name: str = "sqlite-writer",
+    ):
+        self._pool = pool
+        self._sql = sql
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[_QueueItem] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def submit(self, params: Sequence[Any], sql: str | None = None) -> None:
+        """Queue one row for writing, with the default statement unless ``sql`` is given."""
+        if self._closed:
+            raise RuntimeError("BatchedWriter has been closed")
+        self._queue.put((sql or self._sql, params))
+
+    def submit_many(self, rows: Iterable[Sequence[Any]], sql: str | None = None) -> None:
+        for params in rows:
+            self.submit(params, sql)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until every row queued so far has been committed.
+
+        Returns:
+            False if ``timeout`` expired first
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Commit the remaining rows and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: list[tuple[str, Sequence[Any]]] = []
+            waiters: list[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write(self, batch: list[tuple[str, Sequence[Any]]]) -> None:
+        try:
+            conn = self._pool.connection()
+            with conn:
+                for sql, rows in groupby(batch, key=lambda item: item[0]):
+                    conn.executemany(sql, [params for _sql, params in rows])
+        except (sqlite3.Error, RuntimeError) as exc:
+            logger.warning(f"Failed to write batch of {len(batch)} rows: {exc}")
@@ -0,0 +1,305 @@
+"""Packed thumbnail atlases for rendering many small card images at once.
+
+A deck table of 60-75 card thumbnails would otherwise open one JPEG per card from
+``card_images/<size>/``. An atlas packs the encoded thumbnails of one deck into a single
+binary index file (see ``utils.binary_index``) laid out as:
+
+- the encoded images back to back (``images.blob``) with their byte offsets
+  (``images.offsets``), so a thumbnail is a zero-copy slice of the mapping
+- the entry keys with an open-addressing hash table from key to entry number
+
+Deck atlases are keyed by lowercased card name. Images are stored as downloaded rather
+than decoded into one big bitmap: that keeps atlases small and needs no imaging library,
+and decoding a thumbnail from memory is cheap next to the file opens it saves.
+
+Each atlas records a signature of its source files (path, size and modification time).
+:meth:`ThumbnailAtlasBuilder.ensure_atlas` rebuilds an atlas lazily whenever the images
+behind it have changed, e.g. after new images were downloaded, so no background refresh
+job is needed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from utils.binary_index import (
+    IndexFormatError,
+    MappedHashTable,
+    MappedIndexFile,
+    MappedStrings,
+    build_hash_table,
+    pack_strings,
+    write_index_file,
+)
+
+if TYPE_CHECKING:
+    from utils.card_images import CardImageCache
+
+ATLAS_MAGIC = b"MTGATLAS"
+ATLAS_FORMAT = 1
+ATLAS_SUFFIX = ".atlas"
+DEFAULT_THUMBNAIL_SIZE = "small"
+# Deck atlases are keyed by their card list, so old ones are pruned beyond this many.
+MAX_DECK_ATLASES = 32
+
+_UNSAFE_ID_CHARS = re.compile(r"[^a-z0-9_-]+")
+# ThumbnailAtlas attributes that hold views of the mapping.
+_MAPPED_ATTRIBUTES = ("_keys", "_table", "_offsets", "_images")
+
+
+def atlas_signature(members: Sequence[tuple[str, Path]]) -> str:
+    """
+    Fingerprint the source images of an atlas.
+
+    Raises:
+        OSError: If a source image cannot be stat'ed
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for key, path in members:
+        stat = path.stat()
+        digest.update(f"{key}\0{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def write_atlas(
+    path: Path, members: Iterable[tuple[str, Path]], meta: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """
+    Pack the images of ``members`` into an atlas at ``path`` (atomically).
+
+    Args:
+        path: Destination file
+        members: ``(key, image_path)`` pairs; later duplicates of a key and unreadable
+            images are skipped
+        meta: Extra JSON-serializable metadata stored in the file
+
+    Returns:
+        The metadata written, including ``entries`` and ``image_bytes``
+    """
+    keys: list[str] = []
+    seen: set[str] = set()
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for key, image_path in members:
+        if key in seen:
+            continue
+        try:
+            blob += image_path.read_bytes()
+        except OSError as exc:
+            logger.debug(f"Skipping unreadable thumbnail {image_path}: {exc}")
+            continue
+        seen.add(key)
+        keys.append(key)
+        offsets.append(len(blob))
+
+    key_offsets, key_blob = pack_strings(keys)
+    stored_meta = dict(meta or {})
+    stored_meta.update(entries=len(keys), image_bytes=len(blob))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_index_file(
+        path,
+        ATLAS_MAGIC,
+        ATLAS_FORMAT,
+        {
+            "keys.offsets": key_offsets,
+            "keys.blob": key_blob,
+            "keys.table": build_hash_table(keys, range(len(keys))),
+            "images.offsets": offsets,
+            "images.blob": bytes(blob),
+        },
+        stored_meta,
+    )
+    return stored_meta
+
+
+class ThumbnailAtlas:
+    """Read-only, memory-mapped atlas of encoded thumbnails."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        # Closing must not race a lookup that is slicing the mapping.
+        self._lock = threading.Lock()
+        self._mapped = MappedIndexFile(self.path, ATLAS_MAGIC, ATLAS_FORMAT)
+        try:
+            self._keys = MappedStrings(self._mapped, "keys")
+            self._table = MappedHashTable(self._mapped.section("keys.table"), self._keys)
+            self._offsets = self._mapped.section("images.offsets")
+            self._images = self._mapped.section("images.blob")
+        except IndexFormatError:
+            self._unmap()
+            raise
+        self.meta = self._mapped.meta
+        self._closed = False
+
+    @property
+    def signature(self) -> str | None:
+        return self.meta.get("signature")
+
+    def get(self, key: str) -> bytes | None:
+        """Return the encoded image stored under ``key``, or None."""
+        with self._lock:
+            if self._closed:
+                return None
+            index = self._table.get(key)
+            if index is None:
+                return None
+            return bytes(self._images[self._offsets[index] : self._offsets[index + 1]])
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return isinstance(key, str) and not self._closed and key in self._table
+
+    def __len__(self) -> int:
+        with self._lock:
+            return 0 if self._closed else len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(()) if self._closed else iter(list(self._keys))
+
+    def close(self) -> None:
+        """Release the mapping; later lookups find nothing."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._unmap()
+
+    def _unmap(self) -> None:
+        # Drop the section views first; the file can then be replaced or deleted.
+        for name in _MAPPED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+        self._mapped.close()
+
+
+class ThumbnailAtlasBuilder:
+    """Builds, caches and lazily refreshes thumbnail atlases over a ``CardImageCache``."""
+
+    def __init__(
+        self,
+        cache: CardImageCache,
+        atlas_dir: Path | None = None,
+        size: str = DEFAULT_THUMBNAIL_SIZE,
+    ):
+        """
+        Args:
+            cache: Image cache the thumbnails are taken from
+            atlas_dir: Where atlases are stored (``<cache_dir>/atlases/<size>`` by default)
+            size: Image size packed into the atlases
+        """
+        self.cache = cache
+        self.size = size
+        self.atlas_dir = Path(atlas_dir or cache.cache_dir / "atlases" / size)
+        self._open: dict[str, ThumbnailAtlas] = {}
+        self._lock = threading.RLock()
+
+    def atlas_path(self, atlas_id: str) -> Path:
+        safe_id = _UNSAFE_ID_CHARS.sub("_", atlas_id.lower())
+        return self.atlas_dir / f"{safe_id}{ATLAS_SUFFIX}"
+
+    def ensure_atlas(self, atlas_id: str, members: Sequence[tuple[str, Path]]) -> ThumbnailAtlas:
+        """
+        Return the atlas ``atlas_id`` packing ``members``, rebuilding it if they changed.
+
+        Args:
+            atlas_id: Name of the atlas, e.g. ``"deck-<hash>"``
+            members: ``(key, image_path)`` pairs the atlas should contain
+        """
+        return self._ensure_atlas(atlas_id, members)[0]
+
+    def _ensure_atlas(
+        self, atlas_id: str, members: Sequence[tuple[str, Path]]
+    ) -> tuple[ThumbnailAtlas, bool]:
+        atlas_id = self.atlas_path(atlas_id).stem
+        try:
+            signature = atlas_signature(members)
+        except OSError:
+            # An image vanished between the lookup and now; pack what is still there.
+            members = [(key, path) for key, path in members if path.exists()]
+            signature = atlas_signature(members)
+        with self._lock:
+            atlas = self._open.get(atlas_id) or self._open_atlas(atlas_id)
+            if atlas is not None and atlas.signature == signature:
+                return atlas, False
+            if atlas is not None:
+                # Windows cannot replace a file that is still mapped.
+                atlas.close()
+                self._open.pop(atlas_id, None)
+            path = self.atlas_path(atlas_id)
+            meta = write_atlas(path, members, {"atlas_id": atlas_id, "signature": signature})
+            logger.debug(f"Built thumbnail atlas {atlas_id}: {meta['entries']} images")
+            atlas = self._open[atlas_id] = ThumbnailAtlas(path)
+            return atlas, True
+
+    def ensure_deck_atlas(self, card_names: Iterable[str]) -> ThumbnailAtlas:
+        """Return an atlas of the cached thumbnails of ``card_names``, keyed by lowercased name."""
+        names = sorted({name.lower() for name in card_names if name})
+        members: list[tuple[str, Path]] = []
+        for name in names:
+            path = self.cache.get_image_path(name, self.size)
+            if path is not None:
+                members.append((name, path))
+        deck_id = hashlib.blake2b("\n".join(names).encode(), digest_size=8).hexdigest()
+        atlas, rebuilt = self._ensure_atlas(f"deck-{deck_id}", members)
+        if rebuilt:
+            self._prune_deck_atlases(keep=atlas.path)
+        else:
+            # Mark the atlas as recently used so pruning keeps it.
+            try:
+                os.utime(atlas.path)
+            except OSError:
+                pass
+        return atlas
+
+    def close(self) -> None:
+        with self._lock:
+            for atlas in self._open.values():
+                atlas.close()
+            self._open.clear()
+
+    def _open_atlas(self, atlas_id: str) -> ThumbnailAtlas | None:
+        path = self.atlas_path(atlas_id)
+        if not path.exists():
+            return None
+        try:
+            atlas = ThumbnailAtlas(path)
+        except IndexFormatError as exc:
+            logger.debug(f"Discarding unreadable thumbnail atlas {path}: {exc}")
+            return None
+        self._open[atlas_id] = atlas
+        return atlas
+
+    def _prune_deck_atlases(self, keep: Path) -> None:
+        deck_atlases = sorted(
+            (path for path in self.atlas_dir.glob(f"deck-*{ATLAS_SUFFIX}") if path != keep),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for path in deck_atlases[MAX_DECK_ATLASES - 1 :]:
+            atlas_id = path.stem
+            with self._lock:
+                atlas = self._open.pop(atlas_id, None)
+                if atlas is not None:
+                    atlas.close()
+            try:
+                path.unlink()
+            except OSError as exc:
+                logger.debug(f"Could not prune thumbnail atlas {path}: {exc}")
+
+
+__all__ = [
+    "ATLAS_FORMAT",
+    "ATLAS_MAGIC",
+    "ThumbnailAtlas",
+    "ThumbnailAtlasBuilder",
+    "atlas_signature",
+    "write_atlas",
+]
@@ -18,6 +18,7 @@ from utils.constants import (
     SUBDUED_TEXT,
 )
 from utils.mana_icon_factory import ManaIconFactory
+from utils.search_executor import SearchExecutor
 from utils.stylize import stylize_listbox, stylize_textctrl
 from widgets.buttons.deck_action_buttons import DeckActionButtons
 from widgets.buttons.toolbar_buttons import ToolbarButtons
@@ -54,6 +55,7 @@ class AppFrame(AppEventHandlers, SideboardGuideHandlers, CardTablePanelHandler,
         self.controller: AppController = controller
         self.card_data_dialogs_disabled = False
         self._builder_search_pending = False
+        self._builder_search_executor = SearchExecutor(name="builder-search")
 
         self.sideboard_guide_entries: list[dict[str, str]] = []
         self.sideboard_exclusions: list[str] = []
@@ -139,6 +141,7 @@ class AppFrame(AppEventHandlers, SideboardGuideHandlers, CardTablePanelHandler,
             on_clear=self._on_builder_clear,
             on_result_selected=self._on_builder_result_selected,
             on_open_radar_dialog=self._open_radar_dialog,
+            on_results_shown=self._handle_cards_shown,
         )
         self.left_stack.AddPage(self.builder_panel, "Builder")
         self._show_left_panel(self.left_mode, force=True)
@@ -366,6 +369,8 @@ class AppFrame(AppEventHandlers, SideboardGuideHandlers, CardTablePanelHandler,
             self._handle_zone_add,
             self._handle_card_focus,
             self._handle_card_hover,
+            on_cards_shown=self._handle_cards_shown,
+            load_thumbnails=self._load_zone_thumbnails,
         )
         self.zone_notebook.AddPage(table, tab_name)
         return table
@@ -4,6 +4,7 @@ Features:
 - Display MTG card images with rounded corners
 - Toggle between multiple faces with an overlay button
 - Smooth fade transition animations between images
+- Composited bitmaps kept in a memory-bounded LRU shared by every display
 """
 
 from __future__ import annotations
@@ -13,6 +14,30 @@ from pathlib import Path
 import wx
 from loguru import logger
 
+from utils.image_masks import apply_alpha_mask, rounded_corner_mask
+from utils.lru_cache import SizedLRUCache
+
+BITMAP_CACHE_MAX_ENTRIES = 256
+BITMAP_CACHE_MAX_BYTES = 96 * 1024 * 1024
+
+# (path, mtime_ns, (width, height), face index, flip icon shown) -> composited bitmap
+BitmapCacheKey = tuple[str, int, tuple[int, int], int, bool]
+
+
+def _bitmap_nbytes(bitmap: wx.Bitmap) -> int:
+    """Approximate memory held by a 32-bit bitmap."""
+    return bitmap.GetWidth() * bitmap.GetHeight() * 4
+
+
+_bitmap_cache: SizedLRUCache[BitmapCacheKey, wx.Bitmap] = SizedLRUCache(
+    BITMAP_CACHE_MAX_ENTRIES, BITMAP_CACHE_MAX_BYTES, sizeof=_bitmap_nbytes
+)
+
+
+def get_bitmap_cache() -> SizedLRUCache[BitmapCacheKey, wx.Bitmap]:
+    """Return the composited card bitmap cache (e.g. to read its hit/miss stats)."""
+    return _bitmap_cache
+
 
 class CardImageDisplay(wx.Panel):
     """A panel that displays MTG card images with navigation and animations."""
@@ -111,6 +136,8 @@ class CardImageDisplay(wx.Panel):
 
         self.image_paths = valid_paths
         self.current_index = min(start_index, len(valid_paths) - 1)
+        # Settle the flip icon first so the image is composited (and cached) only once
+        self.show_flip_icon_overlay = len(valid_paths) > 1
 
         # Load first image without animation
         success = self._load_image_at_index(self.current_index, animate=False)
@@ -145,28 +172,10 @@ class CardImageDisplay(wx.Panel):
         image_path = self.image_paths[index]
 
         try:
-            # Load the image
-            img = wx.Image(str(image_path), wx.BITMAP_TYPE_ANY)
-            if not img.IsOk():
-                logger.debug(f"Failed to load image: {image_path}")
+            bitmap = self._get_card_bitmap(image_path, index)
+            if bitmap is None:
                 return False
 
-            # Scale to fit while maintaining aspect ratio
-            img_width = img.GetWidth()
-            img_height = img.GetHeight()
-
-            scale_w = self.image_width / img_width
-            scale_h = self.image_height / img_height
-            scale = min(scale_w, scale_h)
-
-            new_width = int(img_width * scale)
-            new_height = int(img_height * scale)
-
-            img = img.Scale(new_width, new_height, wx.IMAGE_QUALITY_HIGH)
-
-            # Create bitmap with rounded corners
-            bitmap = self._create_rounded_bitmap(img)
-
             # Display with or without animation
             if animate and self.bitmap_ctrl.GetBitmap().IsOk():
                 self._start_fade_animation(bitmap)
@@ -180,6 +189,105 @@ class CardImageDisplay(wx.Panel):
             logger.exception(f"Error loading image {image_path}: {exc}")
             return False
 
+    def _bitmap_cache_key(
+        self, image_path: Path, face: int, flip_icon: bool | None = None
+    ) -> BitmapCacheKey:
+        """Build the cache key for ``image_path`` as composited by this display.
+
+        The file's modification time is part of the key so a re-downloaded image is
+        decoded again instead of serving the stale bitmap.
+        """
+        return (
+            str(image_path),
+            image_path.stat().st_mtime_ns,
+            (self.image_width, self.image_height),
+            face,
+            self.show_flip_icon_overlay if flip_icon is None else flip_icon,
+        )
+
+    def has_cached_bitmap(self, image_path: Path, face: int, flip_icon: bool) -> bool:
+        """Return whether the composited bitmap for ``image_path`` is cached.
+
+        Safe to call from worker threads.
+        """
+        try:
+            return self._bitmap_cache_key(image_path, face, flip_icon) in _bitmap_cache
+        except OSError:
+            return False
+
+    def decode_scaled_image(self, image_path: Path) -> wx.Image | None:
+        """Decode ``image_path`` and scale it to fit the display, keeping its aspect ratio.
+
+        Only touches ``wx.Image``, so it is safe to call from worker threads.
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            The scaled image, or None if it failed to load
+        """
+        img = wx.Image(str(image_path), wx.BITMAP_TYPE_ANY)
+        if not img.IsOk():
+            logger.debug(f"Failed to load image: {image_path}")
+            return None
+
+        # Scale to fit while maintaining aspect ratio
+        img_width = img.GetWidth()
+        img_height = img.GetHeight()
+
+        scale_w = self.image_width / img_width
+        scale_h = self.image_height / img_height
+        scale = min(scale_w, scale_h)
+
+        new_width = int(img_width * scale)
+        new_height = int(img_height * scale)
+
+        return img.Scale(new_width, new_height, wx.IMAGE_QUALITY_HIGH)
+
+    def cache_decoded_image(
+        self, image_path: Path, face: int, flip_icon: bool, image: wx.Image
+    ) -> None:
+        """Composite an image decoded by :meth:`decode_scaled_image` into the bitmap cache.
+
+        Must run on the UI thread (e.g. via ``wx.CallAfter``).
+
+        Args:
+            image_path: Path the image was decoded from
+            face: Index of the face within its card
+            flip_icon: Whether the card shows the flip icon (it has several faces)
+            image: The scaled image
+        """
+        try:
+            key = self._bitmap_cache_key(image_path, face, flip_icon)
+        except OSError:
+            return
+        if key not in _bitmap_cache:
+            _bitmap_cache.put(key, self._create_rounded_bitmap(image, flip_icon))
+
+    def _get_card_bitmap(self, image_path: Path, face: int) -> wx.Bitmap | None:
+        """Return the composited bitmap for ``image_path``, decoding it on a cache miss.
+
+        Args:
+            image_path: Path to the image file
+            face: Index of the face within the current card
+
+        Returns:
+            The scaled bitmap with rounded corners, or None if the image failed to load
+        """
+        key = self._bitmap_cache_key(image_path, face)
+        bitmap = _bitmap_cache.get(key)
+        if bitmap is not None:
+            return bitmap
+
+        img = self.decode_scaled_image(image_path)
+        if img is None:
+            return None
+
+        # Create bitmap with rounded corners
+        bitmap = self._create_rounded_bitmap(img)
+        _bitmap_cache.put(key, bitmap)
+        return bitmap
+
     def _start_fade_animation(self, target_bitmap: wx.Bitmap) -> None:
         """Start a fade transition animation to the target bitmap.
 
@@ -310,17 +418,21 @@ class CardImageDisplay(wx.Panel):
         self._load_image_at_index(self.current_index, animate=True)
         self._update_navigation()
 
-    def _create_rounded_bitmap(self, image: wx.Image) -> wx.Bitmap:
+    def _create_rounded_bitmap(self, image: wx.Image, flip_icon: bool | None = None) -> wx.Bitmap:
         """Create a bitmap with the image centered and rounded corners.
 
         Uses alpha channel manipulation for proper rounded corner clipping.
 
         Args:
             image: The wx.Image to display
+            flip_icon: Whether to draw the flip icon (defaults to the current overlay state)
 
         Returns:
             A wx.Bitmap with rounded corners
         """
+        if flip_icon is None:
+            flip_icon = self.show_flip_icon_overlay
+
         # Create a bitmap canvas
         bitmap = wx.Bitmap(self.image_width, self.image_height)
         dc = wx.MemoryDC(bitmap)
@@ -359,7 +471,7 @@ class CardImageDisplay(wx.Panel):
             gc.DrawPath(path)
 
             # Draw flip icon overlay if enabled
-            if self.show_flip_icon_overlay:
+            if flip_icon:
                 self._draw_flip_icon_on_gc(gc)
         else:
             # Fallback border without antialiasing
@@ -435,6 +547,9 @@ class CardImageDisplay(wx.Panel):
     def _apply_rounded_corners_to_image(self, image: wx.Image, radius: int) -> wx.Image:
         """Apply rounded corners to an image using alpha channel manipulation.
 
+        The corner mask is precomputed once per image size and radius (see
+        ``utils.image_masks``) and merged into the alpha channel in one operation.
+
         Args:
             image: The wx.Image to process
             radius: Corner radius in pixels
@@ -445,52 +560,14 @@ class CardImageDisplay(wx.Panel):
         # Make a copy to avoid modifying the original
         img = image.Copy()
 
-        # Ensure image has alpha channel
-        if not img.HasAlpha():
-            img.InitAlpha()
-
-        width = img.GetWidth()
-        height = img.GetHeight()
-
-        # Get alpha data as bytearray for modification
-        alpha_data = bytearray(img.GetAlpha())
-
-        # Helper function to check if a point is inside the rounded rectangle
-        def is_inside_rounded_rect(px, py):
-            # Check if point is in corner regions
-            # Top-left corner
-            if px < radius and py < radius:
-                dx = radius - px
-                dy = radius - py
-                return (dx * dx + dy * dy) <= (radius * radius)
-            # Top-right corner
-            elif px >= width - radius and py < radius:
-                dx = px - (width - radius - 1)
-                dy = radius - py
-                return (dx * dx + dy * dy) <= (radius * radius)
-            # Bottom-left corner
-            elif px < radius and py >= height - radius:
-                dx = radius - px
-                dy = py - (height - radius - 1)
-                return (dx * dx + dy * dy) <= (radius * radius)
-            # Bottom-right corner
-            elif px >= width - radius and py >= height - radius:
-                dx = px - (width - radius - 1)
-                dy = py - (height - radius - 1)
-                return (dx * dx + dy * dy) <= (radius * radius)
-            # Not in any corner region - always inside
-            return True
+        mask = rounded_corner_mask(img.GetWidth(), img.GetHeight(), radius)
 
-        # Apply rounded corner mask to alpha channel
-        for y in range(height):
-            for x in range(width):
-                idx = y * width + x
-                if not is_inside_rounded_rect(x, y):
-                    alpha_data[idx] = 0  # Make transparent
-                # else: keep existing alpha value
-
-        # Set the modified alpha data
-        img.SetAlpha(bytes(alpha_data))
+        # An image without alpha is fully opaque, so the mask is the alpha channel
+        if img.HasAlpha():
+            img.SetAlpha(apply_alpha_mask(bytes(img.GetAlpha()), mask))
+        else:
+            img.InitAlpha()
+            img.SetAlpha(mask)
 
         return img
 
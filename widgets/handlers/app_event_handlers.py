@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import threading
+from collections.abc import Sequence
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -15,6 +16,7 @@ from widgets.metagame_analysis import MetagameAnalysisFrame
 from widgets.timer_alert import TimerAlertFrame
 
 if TYPE_CHECKING:
+    from utils.printing_index import PrintingIndex
     from widgets.app_frame import AppFrame
 
 
@@ -209,6 +211,8 @@ class AppEventHandlers:
         if self.mana_keyboard_window and self.mana_keyboard_window.IsShown():
             self.mana_keyboard_window.Destroy()
             self.mana_keyboard_window = None
+        self._builder_search_executor.shutdown()
+        self.card_inspector_panel.stop_prefetching()
         self.controller.shutdown()
         event.Skip()
 
@@ -314,9 +318,7 @@ class AppEventHandlers:
         self.collection_status_label.SetLabel(f"Collection fetch failed: {error_msg}")
         logger.warning(f"Collection fetch failed: {error_msg}")
 
-    def _on_bulk_data_loaded(
-        self: AppFrame, by_name: dict[str, list[dict[str, Any]]], stats: dict[str, Any]
-    ) -> None:
+    def _on_bulk_data_loaded(self: AppFrame, by_name: PrintingIndex, stats: dict[str, Any]) -> None:
         self.controller.image_service.clear_printing_index_loading()
         self.controller.image_service.set_bulk_data(by_name)
         self.card_inspector_panel.set_bulk_data(by_name)
@@ -376,8 +378,24 @@ class AppEventHandlers:
                     self.builder_panel.status_label.SetLabel("Mana value must be numeric.")
                 return
 
-        results = self.controller.search_service.search_with_builder_filters(filters, card_manager)
-        self.builder_panel.update_results(results)
+        search_service = self.controller.search_service
+        if self.builder_panel and self.builder_panel.status_label:
+            self.builder_panel.status_label.SetLabel("Searching…")
+        self._builder_search_executor.submit(
+            lambda token: search_service.search_with_builder_filters(
+                filters, card_manager, cancel_token=token
+            ),
+            on_result=self._on_builder_results,
+            on_error=self._on_builder_search_failed,
+        )
+
+    def _on_builder_results(self: AppFrame, results: Sequence[dict[str, Any]]) -> None:
+        if self.builder_panel:
+            self.builder_panel.update_results(results)
+
+    def _on_builder_search_failed(self: AppFrame, error: Exception) -> None:
+        if self.builder_panel and self.builder_panel.status_label:
+            self.builder_panel.status_label.SetLabel(f"Search failed: {error}")
 
     def _on_builder_clear(self: AppFrame) -> None:
         self.builder_panel.clear_filters()
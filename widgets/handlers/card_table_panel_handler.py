@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 import wx
@@ -237,6 +238,20 @@ class CardTablePanelHandler:
         # Debounce inspector updates to avoid thrashing while the mouse moves quickly.
         self._inspector_hover_timer.StartOnce(120)
 
+    def _handle_cards_shown(
+        self: AppFrame, context: str, visible: list[str], upcoming: list[str]
+    ) -> None:
+        inspector = getattr(self, "card_inspector_panel", None)
+        if inspector:
+            inspector.prefetch_cards(context, visible, upcoming)
+
+    def _load_zone_thumbnails(
+        self: AppFrame, names: list[str], on_loaded: Callable[[dict[str, bytes]], None]
+    ) -> None:
+        self.controller.image_service.load_deck_thumbnails_async(
+            names, lambda thumbnails: wx.CallAfter(on_loaded, thumbnails)
+        )
+
     def _flush_hover_preview(self: AppFrame, _event: wx.TimerEvent) -> None:
         if not self._pending_hover:
             return
@@ -1,3 +1,4 @@
+import io
 from collections.abc import Callable
 from typing import Any
 
@@ -6,6 +7,8 @@ import wx
 from utils.constants import DARK_ACCENT, DARK_ALT, LIGHT_TEXT
 from utils.mana_icon_factory import ManaIconFactory
 
+THUMBNAIL_HEIGHT = 30
+
 
 class CardBoxPanel(wx.Panel):
     def __init__(
@@ -31,6 +34,7 @@ class CardBoxPanel(wx.Panel):
         self._on_select = on_select
         self._on_hover = on_hover
         self._active = False
+        self.thumbnail: wx.StaticBitmap | None = None
 
         self.SetBackgroundColour(DARK_ALT)
         row = wx.BoxSizer(wx.HORIZONTAL)
@@ -98,6 +102,22 @@ class CardBoxPanel(wx.Panel):
         self.name_label.SetForegroundColour(wx.Colour(*owned_colour))
         self.Layout()
 
+    def set_thumbnail(self, data: bytes) -> None:
+        """Show the card's encoded thumbnail (e.g. read from a thumbnail atlas) in front of it."""
+        image = wx.Image(io.BytesIO(data), wx.BITMAP_TYPE_ANY)
+        if not image.IsOk():
+            return
+        width = max(1, round(image.GetWidth() * THUMBNAIL_HEIGHT / image.GetHeight()))
+        bitmap = wx.Bitmap(image.Scale(width, THUMBNAIL_HEIGHT, wx.IMAGE_QUALITY_HIGH))
+        if self.thumbnail is not None:
+            self.thumbnail.SetBitmap(bitmap)
+            return
+        self.thumbnail = wx.StaticBitmap(self, bitmap=bitmap)
+        self.GetSizer().Insert(0, self.thumbnail, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 6)
+        self._bind_click_targets([self.thumbnail])
+        self._bind_hover_targets([self.thumbnail])
+        self.Layout()
+
     def set_active(self, active: bool) -> None:
         if self._active == active:
             return
@@ -2,8 +2,13 @@
 Card Inspector Panel - Displays detailed card information.
 
 Shows card image, metadata, oracle text, and allows navigation through different printings.
+Images of cards listed elsewhere in the UI can be prefetched into the image display's
+bitmap cache so hovering them later is instant.
 """
 
+from collections.abc import Callable, Sequence
+from functools import partial
+from pathlib import Path
 from typing import Any
 
 import wx
@@ -12,7 +17,9 @@ from loguru import logger
 from utils.card_data import CardDataManager
 from utils.card_images import BULK_DATA_CACHE, get_cache, get_card_image
 from utils.constants import DARK_PANEL, LIGHT_TEXT, SUBDUED_TEXT, ZONE_TITLES
+from utils.image_prefetcher import ImagePrefetcher
 from utils.mana_icon_factory import ManaIconFactory
+from utils.printing_index import PrintingIndex
 from utils.stylize import stylize_button, stylize_textctrl
 from widgets.card_image_display import CardImageDisplay
 
@@ -47,8 +54,9 @@ class CardInspectorPanel(wx.Panel):
         self.inspector_current_card_name: str | None = None
         self.printing_label_width: int = 0
         self.image_cache = get_cache()
-        self.bulk_data_by_name: dict[str, list[dict[str, Any]]] | None = None
+        self.bulk_data_by_name: PrintingIndex | None = None
         self._image_available = False
+        self.image_prefetcher = ImagePrefetcher(self._prefetch_card_image)
 
         self._build_ui()
         self.reset()
@@ -225,10 +233,29 @@ class CardInspectorPanel(wx.Panel):
         """Set the card data manager for metadata lookups."""
         self.card_manager = card_manager
 
-    def set_bulk_data(self, bulk_data_by_name: dict[str, list[dict[str, Any]]]) -> None:
+    def set_bulk_data(self, bulk_data_by_name: PrintingIndex) -> None:
         """Set the bulk data index for fast printing lookups."""
         self.bulk_data_by_name = bulk_data_by_name
 
+    def prefetch_cards(
+        self, context: str, visible: Sequence[str], upcoming: Sequence[str] = ()
+    ) -> None:
+        """
+        Decode the images of cards shown in another view ahead of the user hovering them.
+
+        Args:
+            context: The view listing the cards; replaces what it queued before
+            visible: Card names currently on screen, prefetched first
+            upcoming: Card names likely to be shown next
+        """
+        # The worker gets the index current now; set_bulk_data may swap it meanwhile.
+        load = partial(self._prefetch_card_image, printings_index=self.bulk_data_by_name)
+        self.image_prefetcher.schedule(context, visible, upcoming, load)
+
+    def stop_prefetching(self) -> None:
+        """Stop the prefetch workers (on shutdown)."""
+        self.image_prefetcher.shutdown()
+
     # ============= Private Methods =============
 
     def _render_mana_cost(self, mana_cost: str) -> None:
@@ -243,6 +270,39 @@ class CardInspectorPanel(wx.Panel):
         self.cost_sizer.Add(panel, 0)
         self.cost_container.Layout()
 
+    def _image_paths_for(self, card_name: str, printings_index: PrintingIndex | None) -> list[Path]:
+        """Resolve the face images shown first when ``card_name`` is inspected."""
+        printings = printings_index.get(card_name.lower(), []) if printings_index else []
+        if printings:
+            return self.image_cache.get_image_paths_by_uuid(printings[0].get("id"), "normal")
+        image_path = get_card_image(card_name, "normal")
+        return [image_path] if image_path and image_path.exists() else []
+
+    def _prefetch_card_image(
+        self,
+        card_name: str,
+        cancelled: Callable[[], bool],
+        printings_index: PrintingIndex | None = None,
+    ) -> None:
+        """Decode ``card_name``'s images on a prefetch worker (see ``ImagePrefetcher``)."""
+        display = self.card_image_display
+        image_paths = self._image_paths_for(card_name, printings_index)
+        flip_icon = len(image_paths) > 1
+        for face, image_path in enumerate(image_paths):
+            if cancelled():
+                return
+            if display.has_cached_bitmap(image_path, face, flip_icon):
+                continue
+            image = display.decode_scaled_image(image_path)
+            if image is not None:
+                wx.CallAfter(self._store_prefetched_image, image_path, face, flip_icon, image)
+
+    def _store_prefetched_image(
+        self, image_path: Path, face: int, flip_icon: bool, image: wx.Image
+    ) -> None:
+        if self and self.card_image_display:
+            self.card_image_display.cache_decoded_image(image_path, face, flip_icon, image)
+
     def _load_card_image_and_printings(self, card_name: str) -> None:
         """Load card image and populate printings list."""
         self.inspector_current_card_name = card_name
@@ -10,6 +10,9 @@ from widgets.panels.card_box_panel import CardBoxPanel
 
 
 class CardTablePanel(wx.Panel):
+    # Scrolling and resizing only re-prefetch once the view settles.
+    _VIEW_CHANGE_DEBOUNCE_MS = 120
+
     def __init__(
         self,
         parent: wx.Window,
@@ -22,6 +25,10 @@ class CardTablePanel(wx.Panel):
         on_add: Callable[[str], None],
         on_select: Callable[[str, dict[str, Any] | None], None],
         on_hover: Callable[[str, dict[str, Any]], None] | None = None,
+        on_cards_shown: Callable[[str, list[str], list[str]], None] | None = None,
+        load_thumbnails: (
+            Callable[[list[str], Callable[[dict[str, bytes]], None]], None] | None
+        ) = None,
     ) -> None:
         super().__init__(parent)
         self.zone = zone
@@ -33,6 +40,8 @@ class CardTablePanel(wx.Panel):
         self._on_add = on_add
         self._on_select = on_select
         self._on_hover = on_hover
+        self._on_cards_shown = on_cards_shown
+        self._load_thumbnails = load_thumbnails
         self.cards: list[dict[str, Any]] = []
         self.card_widgets: list[CardBoxPanel] = []
         self.active_panel: CardBoxPanel | None = None
@@ -55,6 +64,10 @@ class CardTablePanel(wx.Panel):
         self.scroller.SetSizer(self.grid_sizer)
         self.scroller.SetupScrolling(scroll_x=False, scroll_y=True, rate_x=5, rate_y=5)
         outer.Add(self.scroller, 1, wx.EXPAND)
+        self._cards_shown_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_cards_shown_timer, self._cards_shown_timer)
+        for event_type in (wx.EVT_SCROLLWIN, wx.EVT_SIZE):
+            self.scroller.Bind(event_type, self._on_view_changed)
 
     def set_cards(self, cards: list[dict[str, Any]]) -> None:
         if self._try_incremental_update(cards):
@@ -131,6 +144,44 @@ class CardTablePanel(wx.Panel):
             self._restore_selection()
         finally:
             self.scroller.Thaw()
+        self._notify_cards_shown()
+        if self._load_thumbnails and self.card_widgets:
+            names = [widget.card["name"] for widget in self.card_widgets]
+            self._load_thumbnails(names, self.set_thumbnails)
+
+    def set_thumbnails(self, thumbnails: dict[str, bytes]) -> None:
+        """Show encoded thumbnails, keyed by lowercased card name, on the matching cards."""
+        if not self:
+            return
+        for widget in self.card_widgets:
+            data = thumbnails.get(widget.card["name"].lower())
+            if data is not None:
+                widget.set_thumbnail(data)
+
+    def _notify_cards_shown(self) -> None:
+        """Report the card names on screen and below the fold (e.g. for image prefetching)."""
+        if not self._on_cards_shown:
+            return
+        client_height = self.scroller.GetClientSize().height
+        visible: list[str] = []
+        upcoming: list[str] = []
+        for widget in self.card_widgets:
+            top = widget.GetPosition().y
+            on_screen = top + widget.GetSize().height > 0 and top < client_height
+            (visible if on_screen else upcoming).append(widget.card["name"])
+        self._on_cards_shown(f"deck:{self.zone}", visible, upcoming)
+
+    def _on_view_changed(self, event: wx.Event) -> None:
+        """Re-prefetch the cards on screen once scrolling or resizing the table settles."""
+        event.Skip()
+        if not self._on_cards_shown:
+            return
+        if self._cards_shown_timer.IsRunning():
+            self._cards_shown_timer.Stop()
+        self._cards_shown_timer.StartOnce(self._VIEW_CHANGE_DEBOUNCE_MS)
+
+    def _on_cards_shown_timer(self, _event: wx.TimerEvent) -> None:
+        self._notify_cards_shown()
 
     def _handle_card_click(self, zone: str, card: dict[str, Any], panel: CardBoxPanel) -> None:
         if self.active_panel is panel:
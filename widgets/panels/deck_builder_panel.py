@@ -52,6 +52,8 @@ class DeckBuilderPanel(wx.Panel):
     """Panel for searching and filtering MTG cards by various properties."""
 
     _SEARCH_DEBOUNCE_MS = 300
+    # Scrolling and resizing only re-prefetch once the view settles.
+    _VIEW_CHANGE_DEBOUNCE_MS = 120
 
     def __init__(
         self,
@@ -64,6 +66,7 @@ class DeckBuilderPanel(wx.Panel):
         on_clear: Callable[[], None],
         on_result_selected: Callable[[int], None],
         on_open_radar_dialog: Callable[[], RadarData | None] | None = None,
+        on_results_shown: Callable[[str, list[str], list[str]], None] | None = None,
     ) -> None:
         super().__init__(parent)
 
@@ -76,6 +79,7 @@ class DeckBuilderPanel(wx.Panel):
         self._on_clear_callback = on_clear
         self._on_result_selected_callback = on_result_selected
         self._on_open_radar_dialog = on_open_radar_dialog
+        self._on_results_shown = on_results_shown
 
         # State variables
         self.inputs: dict[str, wx.TextCtrl] = {}
@@ -90,6 +94,8 @@ class DeckBuilderPanel(wx.Panel):
         self.results_cache: list[dict[str, Any]] = []
         self._search_timer = wx.Timer(self)
         self.Bind(wx.EVT_TIMER, self._on_search_timer, self._search_timer)
+        self._results_shown_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_results_shown_timer, self._results_shown_timer)
 
         # Radar state
         self.active_radar: RadarData | None = None
@@ -265,6 +271,8 @@ class DeckBuilderPanel(wx.Panel):
         results.SetBackgroundColour(DARK_ALT)
         results.SetForegroundColour(LIGHT_TEXT)
         results.Bind(wx.EVT_LIST_ITEM_SELECTED, self._on_result_item_selected)
+        for event_type in (wx.EVT_SCROLLWIN, wx.EVT_MOUSEWHEEL, wx.EVT_SIZE):
+            results.Bind(event_type, self._on_results_view_changed)
         sizer.Add(results, 1, wx.EXPAND | wx.ALL, 6)
         self.results_ctrl = results
 
@@ -371,6 +379,28 @@ class DeckBuilderPanel(wx.Panel):
         if self.status_label:
             count = len(results)
             self.status_label.SetLabel(f"Showing {count} card{'s' if count != 1 else ''}.")
+        self._notify_results_shown()
+
+    def _notify_results_shown(self) -> None:
+        """Report the result rows on screen and the page after them (for image prefetching)."""
+        if not self._on_results_shown or not self.results_ctrl:
+            return
+        top = max(self.results_ctrl.GetTopItem(), 0)
+        per_page = max(self.results_ctrl.GetCountPerPage(), 1)
+        names = [card.get("name", "") for card in self.results_cache[top : top + 2 * per_page]]
+        self._on_results_shown("search", names[:per_page], names[per_page:])
+
+    def _on_results_view_changed(self, event: wx.Event) -> None:
+        """Re-prefetch the rows on screen once scrolling or resizing the results settles."""
+        event.Skip()
+        if not self._on_results_shown:
+            return
+        if self._results_shown_timer.IsRunning():
+            self._results_shown_timer.Stop()
+        self._results_shown_timer.StartOnce(self._VIEW_CHANGE_DEBOUNCE_MS)
+
+    def _on_results_shown_timer(self, _event: wx.TimerEvent) -> None:
+        self._notify_results_shown()
 
     def get_result_at_index(self, idx: int) -> dict[str, Any] | None:
         """Get the result card data at the given index."""